@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""Bulk trust graph export and import.
+
+Builds a random trust graph edge by edge with ``set_trust`` (the cost of
+one ``POST /api/governance/trust`` per edge, minus HTTP), then exports it
+in each bulk format and imports it into a fresh graph, reporting sizes and
+edges per second.  Run from the repository root:
+
+    python benchmarks/bench_bulk.py [--nodes 100000] [--degree 10]
+"""
+import argparse
+import io
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from bench_reputation import build_graph  # noqa: E402
+from socialchain.social import bulk  # noqa: E402
+from socialchain.social.trust import TrustGraph  # noqa: E402
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--nodes", type=int, default=100000)
+    parser.add_argument("--degree", type=int, default=10)
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    graph = build_graph(args.nodes, args.degree)
+    built = time.perf_counter() - started
+    edges = graph.get_edge_count()
+    print(f"{graph.get_node_count():,} nodes, {edges:,} edges")
+    print(f"{'method':<12}{'size MB':>10}{'export s':>10}{'import s':>10}{'edges/s':>12}")
+    print(f"{'set_trust':<12}{'':>10}{'':>10}{built:>10.2f}{edges / built:>12,.0f}")
+    for fmt in bulk.FORMATS:
+        buf = io.BytesIO()
+        started = time.perf_counter()
+        bulk.dump(graph, buf, fmt)
+        exported = time.perf_counter() - started
+        size = buf.tell()
+        buf.seek(0)
+        started = time.perf_counter()
+        bulk.load(TrustGraph(), buf, fmt)
+        imported = time.perf_counter() - started
+        print(f"{fmt:<12}{size / 1e6:>10.1f}{exported:>10.2f}{imported:>10.2f}"
+              f"{edges / imported:>12,.0f}")
+
+
+if __name__ == "__main__":
+    main()
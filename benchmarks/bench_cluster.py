@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""Block propagation, sync time and bandwidth across a local node cluster.
+
+Starts N SocialChain nodes on localhost, wires them into a topology, mines
+blocks on random nodes and measures how long announcements take to reach
+every node.  Optional faults: per-request latency, a partition of part of
+the cluster during the first half of the workload, and a crashed node that
+is restarted and re-synced.  Run from the repository root:
+
+    python benchmarks/bench_cluster.py --nodes 16 --topology random --blocks 30
+"""
+import argparse
+import json
+import logging
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from socialchain.network.cluster import TOPOLOGIES, LocalCluster  # noqa: E402
+
+
+def fmt_ms(seconds):
+    return "-" if seconds is None else f"{seconds * 1000:.1f}"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--nodes", type=int, default=8)
+    parser.add_argument("--topology", choices=TOPOLOGIES, default="random")
+    parser.add_argument("--degree", type=int, default=3, help="outbound peers per node (random)")
+    parser.add_argument("--blocks", type=int, default=20)
+    parser.add_argument("--txs", type=int, default=5, help="transactions per block")
+    parser.add_argument("--difficulty", type=int, default=2)
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds per peer request")
+    parser.add_argument("--partition", type=int, default=0,
+                        help="isolate this many nodes for the first half of the run")
+    parser.add_argument("--crash", action="store_true",
+                        help="crash the last node for the first half of the run")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--json", action="store_true", help="print the full report as JSON")
+    args = parser.parse_args()
+    # Injected faults make failed announcements expected; keep output readable
+    logging.getLogger("socialchain").setLevel(logging.ERROR)
+
+    with LocalCluster(args.nodes, topology=args.topology, degree=args.degree,
+                      difficulty=args.difficulty, seed=args.seed) as cluster:
+        if args.latency:
+            cluster.set_latency(args.latency)
+        faulted = []
+        if args.partition:
+            faulted = list(range(args.nodes - args.partition, args.nodes))
+            cluster.partition(range(args.nodes - args.partition), faulted)
+        if args.crash:
+            cluster.crash(args.nodes - 1)
+            faulted = sorted(set(faulted) | {args.nodes - 1})
+
+        first = args.blocks // 2 if faulted else args.blocks
+        cluster.run_workload(blocks=first, txs_per_block=args.txs)
+        if faulted:
+            cluster.heal()
+            if args.crash:
+                cluster.restart(args.nodes - 1)
+            for index in faulted:
+                cluster.sync(index)
+            cluster.run_workload(blocks=args.blocks - first, txs_per_block=args.txs)
+
+        cluster.settle()
+        report = cluster.report()
+
+    if args.json:
+        report.pop("per_node")
+        print(json.dumps(report, indent=2))
+        return
+    prop, sync, bw = report["propagation"], report["sync"], report["bandwidth"]
+    print(f"{report['nodes']} nodes, {report['topology']} topology ({report['edges']} links), "
+          f"{report['blocks']} blocks, converged={report['converged']}")
+    print(f"propagation ms  p50={fmt_ms(prop['p50'])} p90={fmt_ms(prop['p90'])} "
+          f"p99={fmt_ms(prop['p99'])} max={fmt_ms(prop['max'])} "
+          f"min coverage={prop['min_coverage']:.0%}")
+    if sync["runs"]:
+        print(f"sync ms         p50={fmt_ms(sync['p50'])} max={fmt_ms(sync['max'])} "
+              f"({sync['runs']} runs)")
+    print(f"bandwidth       {bw['bytes']:,} bytes in {bw['requests']} peer requests, "
+          f"{bw['bytes_per_block']:,.0f} bytes/block")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""Memory held by a large trust graph.
+
+Builds a random trust graph with ``set_trust`` and reports the memory it
+retains (tracemalloc), per edge.  Each call gets freshly decoded DID
+strings, as requests parsed from JSON do, so identical DIDs are separate
+string objects unless the graph interns them.  Run from the repository
+root:
+
+    python benchmarks/bench_memory.py [--nodes 200000] [--degree 5]
+"""
+import argparse
+import gc
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from socialchain.social.trust import TrustGraph  # noqa: E402
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--nodes", type=int, default=200000)
+    parser.add_argument("--degree", type=int, default=5)
+    args = parser.parse_args()
+
+    rng = random.Random(7)
+    dids = [f"did:socialchain:{i:066x}".encode() for i in range(args.nodes)]
+    edges = [
+        (did, trustee, round(rng.uniform(-0.2, 1.0), 3))
+        for did in dids for trustee in rng.sample(dids, args.degree) if trustee != did
+    ]
+    gc.collect()
+    tracemalloc.start()
+    started = time.perf_counter()
+    graph = TrustGraph()
+    for truster, trustee, score in edges:
+        graph.set_trust(truster.decode(), trustee.decode(), score)
+    elapsed = time.perf_counter() - started
+    gc.collect()
+    held, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    count = graph.get_edge_count()
+    print(f"{graph.get_node_count():,} nodes, {count:,} edges")
+    print(f"retained {held / 1e6:,.1f} MB, {held / count:,.0f} B per edge, built in {elapsed:.1f} s")
+    started = time.perf_counter()
+    graph.propagated_trust_from(dids[0].decode())
+    print(f"propagated_trust_from one source: {(time.perf_counter() - started) * 1e3:.1f} ms")
+    started = time.perf_counter()
+    graph.compute_reputation()
+    print(f"compute_reputation: {time.perf_counter() - started:.2f} s")
+
+
+if __name__ == "__main__":
+    main()
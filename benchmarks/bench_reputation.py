@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""Global reputation on a large random trust graph.
+
+"scan" is the old ``get_trusters`` that walks every truster's edge dict;
+one full dict-loop ``compute_reputation`` with it is O(iterations x V x E),
+so its time is extrapolated from a sample of ``get_trusters`` calls.  The
+other rows run ``ReputationEngine`` on each available backend, reporting
+the CSR build and the iterations separately.  Run from the repository root:
+
+    python benchmarks/bench_reputation.py [--nodes 50000] [--degree 5]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from socialchain.blockchain.interner import DIDS  # noqa: E402
+from socialchain.social.reputation import BACKENDS, ReputationEngine, TrustMatrix  # noqa: E402
+from socialchain.social.trust import TrustGraph  # noqa: E402
+
+
+def scan_trusters(graph: TrustGraph, did: str) -> list:
+    node = DIDS.get(did)
+    return [edges[node] for edges in graph.adjacency()[0].values() if node in edges]
+
+
+def build_graph(nodes: int, degree: int, seed: int = 7) -> TrustGraph:
+    rng = random.Random(seed)
+    dids = [f"did:socialchain:{i:066x}" for i in range(nodes)]
+    graph = TrustGraph()
+    for did in dids:
+        for trustee in rng.sample(dids, degree):
+            if trustee != did:
+                graph.set_trust(did, trustee, round(rng.uniform(-0.2, 1.0), 3))
+    return graph
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--nodes", type=int, default=50000)
+    parser.add_argument("--degree", type=int, default=5)
+    parser.add_argument("--sample", type=int, default=20, help="scan calls to time")
+    args = parser.parse_args()
+
+    graph = build_graph(args.nodes, args.degree)
+    nodes = graph.list_nodes()
+    print(f"{graph.get_node_count():,} nodes, {graph.get_edge_count():,} edges, "
+          f"{graph.REPUTATION_ITERATIONS} iterations")
+
+    sample = random.Random(1).sample(nodes, args.sample)
+    started = time.perf_counter()
+    for did in sample:
+        scan_trusters(graph, did)
+    per_call = (time.perf_counter() - started) / len(sample)
+    scan_total = per_call * len(nodes) * graph.REPUTATION_ITERATIONS
+
+    started = time.perf_counter()
+    matrix = TrustMatrix.from_graph(graph)
+    build = time.perf_counter() - started
+
+    print(f"{'engine':<10}{'build s':>10}{'iterate s':>12}{'iterations':>12}")
+    print(f"{'scan':<10}{'':>10}{scan_total:>11.0f}~{graph.REPUTATION_ITERATIONS:>12}")
+    for backend in BACKENDS:
+        engine = ReputationEngine(
+            damping=graph.REPUTATION_DAMPING, max_iterations=graph.REPUTATION_ITERATIONS,
+            tolerance=graph.REPUTATION_TOLERANCE, backend=backend,
+        )
+        started = time.perf_counter()
+        engine.compute_matrix(matrix)
+        elapsed = time.perf_counter() - started
+        print(f"{backend:<10}{build:>10.2f}{elapsed:>12.3f}{engine.iterations:>12}")
+
+
+if __name__ == "__main__":
+    main()
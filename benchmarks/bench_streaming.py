@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""Peak RSS while serving a full-chain JSON download, buffered vs streamed.
+
+"buffered" is the old ``jsonify(blockchain.to_dict())`` path; "streamed" is
+the chunked ``GET /api/chain`` response.  Each mode runs in its own child
+process, which builds the chain and then samples its resident set size
+while the response body is produced and consumed chunk by chunk.  Linux
+only (reads ``/proc/self/statm``).  Run from the repository root:
+
+    python benchmarks/bench_streaming.py [--blocks 2000] [--txs 5]
+"""
+import argparse
+import gc
+import json
+import os
+import subprocess
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from bench_wire import build_state  # noqa: E402
+from flask import jsonify  # noqa: E402
+from socialchain.api.app import create_app  # noqa: E402
+
+_PAGE = os.sysconf("SC_PAGE_SIZE")
+
+
+def rss() -> int:
+    with open("/proc/self/statm") as f:
+        return int(f.read().split()[1]) * _PAGE
+
+
+class PeakSampler:
+    def __init__(self, interval: float = 0.0005):
+        self.interval = interval
+        self.peak = rss()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            self.peak = max(self.peak, rss())
+            time.sleep(self.interval)
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+        self.peak = max(self.peak, rss())
+
+
+def run_child(mode: str, blocks: int, txs: int) -> dict:
+    state = build_state(blocks, txs)
+    app = create_app(state=state)
+    client = app.test_client()
+    gc.collect()
+    baseline = rss()
+    size = 0
+    started = time.perf_counter()
+    with PeakSampler() as sampler:
+        if mode == "buffered":
+            with app.test_request_context():
+                size = len(jsonify(state.blockchain.to_dict()).get_data())
+        else:
+            response = client.get("/api/chain", buffered=False)
+            for chunk in response.response:
+                size += len(chunk)
+            response.close()
+    return {
+        "mode": mode,
+        "bytes": size,
+        "seconds": time.perf_counter() - started,
+        "baseline_rss": baseline,
+        "peak_extra_rss": sampler.peak - baseline,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--blocks", type=int, default=2000)
+    parser.add_argument("--txs", type=int, default=5)
+    parser.add_argument("--child", choices=("buffered", "streamed"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(run_child(args.child, args.blocks, args.txs)))
+        return
+
+    rows = []
+    for mode in ("buffered", "streamed"):
+        out = subprocess.run(
+            [sys.executable, __file__, "--child", mode,
+             "--blocks", str(args.blocks), "--txs", str(args.txs)],
+            check=True, capture_output=True, text=True,
+        ).stdout
+        rows.append(json.loads(out.strip().splitlines()[-1]))
+
+    mib = 1024 * 1024
+    print(f"{args.blocks} blocks, {args.txs} txs/block + reward; "
+          f"response {rows[0]['bytes'] / mib:.1f} MiB")
+    print(f"{'mode':<10}{'chain RSS MiB':>15}{'extra peak MiB':>16}{'seconds':>10}")
+    for row in rows:
+        print(f"{row['mode']:<10}{row['baseline_rss'] / mib:>15.1f}"
+              f"{row['peak_extra_rss'] / mib:>16.1f}{row['seconds']:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""Verification levels under vouch churn.
+
+Accepts random vouches between identities one at a time, then revokes a
+sample of them, reporting the cost per change (levels are kept at their
+fixed point incrementally), the cost of recomputing every level from
+scratch, and of level lookups.  Run from the repository root:
+
+    python benchmarks/bench_verification.py [--identities 20000] [--vouches 100000]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from socialchain.social.sybil import SybilResistance  # noqa: E402
+from socialchain.social.trust import TrustGraph  # noqa: E402
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--identities", type=int, default=20000)
+    parser.add_argument("--vouches", type=int, default=100000)
+    parser.add_argument("--revoke", type=int, default=10000)
+    args = parser.parse_args()
+
+    rng = random.Random(7)
+    dids = [f"did:socialchain:{i:066x}" for i in range(args.identities)]
+    sybil = SybilResistance(TrustGraph())
+    accepted = []
+    started = time.perf_counter()
+    while len(accepted) < args.vouches:
+        voucher, vouchee = rng.sample(dids, 2)
+        try:
+            vouch = sybil.create_vouch(voucher, vouchee)
+        except ValueError:
+            continue
+        accepted.append(sybil.accept_vouch(vouch.vouch_id))
+    elapsed = time.perf_counter() - started
+    print(f"accept: {args.vouches:,} vouches in {elapsed:.2f} s, "
+          f"{elapsed / args.vouches * 1e6:.0f} us each")
+
+    started = time.perf_counter()
+    for vouch in rng.sample(accepted, args.revoke):
+        sybil.revoke_vouch(vouch.vouch_id)
+    elapsed = time.perf_counter() - started
+    print(f"revoke: {args.revoke:,} vouches in {elapsed:.2f} s, "
+          f"{elapsed / args.revoke * 1e6:.0f} us each")
+
+    started = time.perf_counter()
+    sybil.recompute_levels()
+    print(f"recompute all levels: {time.perf_counter() - started:.2f} s")
+
+    started = time.perf_counter()
+    for did in dids:
+        sybil.compute_verification_level(did)
+    elapsed = time.perf_counter() - started
+    print(f"lookup: {elapsed / len(dids) * 1e6:.2f} us each, "
+          f"{sybil.to_dict()['verified_identities']:,} verified")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""Bytes on the wire and decode time for a 1,000-block chain sync.
+
+Compares the JSON ``/api/chain`` response with the binary wire format under
+each supported compression codec.  Run from the repository root:
+
+    python benchmarks/bench_wire.py [--blocks 1000] [--txs 5]
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from socialchain.api.app import AppState, create_app  # noqa: E402
+from socialchain.agents import AIAgent  # noqa: E402
+from socialchain.blockchain import Block, Blockchain, Identity, Transaction  # noqa: E402
+from socialchain.network import wire  # noqa: E402
+
+
+class BenchChain(Blockchain):
+    DIFFICULTY = 1  # sealing cost is irrelevant to the encoding benchmark
+
+
+def build_state(n_blocks: int, txs_per_block: int) -> AppState:
+    state = AppState()
+    state.blockchain = BenchChain()
+    # Keep every status ping so the payload mix matches earlier measurements
+    state.blockchain.coalescing_rules = {}
+    agent = AIAgent(name="Bench", capabilities=["echo"])
+    user = Identity()
+    for i in range(n_blocks):
+        for j in range(txs_per_block):
+            if j % 2:
+                agent.update_status("online", state.blockchain)
+            else:
+                tx = Transaction(
+                    sender=user.did, recipient="NETWORK",
+                    data={"type": "status_update", "status": "online", "timestamp": time.time()},
+                )
+                tx.signature = user.sign(json.dumps(tx.to_dict(), sort_keys=True).encode())
+                state.blockchain.add_transaction(tx)
+        state.blockchain.mine_block(agent.did)
+    return state
+
+
+def timed(fn, repeat=3):
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - started)
+    return best, result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--blocks", type=int, default=1000)
+    parser.add_argument("--txs", type=int, default=5)
+    args = parser.parse_args()
+
+    state = build_state(args.blocks, args.txs)
+    client = create_app(state=state).test_client()
+
+    json_body = client.get("/api/chain").data
+    json_time, _ = timed(lambda: [Block.from_dict(b) for b in json.loads(json_body)["chain"]])
+    rows = [("json (as served)", len(json_body), json_time)]
+
+    for encoding in wire.SUPPORTED_ENCODINGS:
+        resp = client.get("/api/chain", headers=wire.request_headers([encoding]))
+        body, headers = resp.data, resp.headers
+        decode_time, (_, value) = timed(lambda: wire.unpack(body, headers))
+        assert value["length"] == len(state.blockchain.chain)
+        rows.append((f"wire+{encoding}", len(body), decode_time))
+
+    print(f"{len(state.blockchain.chain)} blocks, {args.txs} txs/block + reward")
+    print(f"{'format':<18}{'bytes':>12}{'vs json':>10}{'decode ms':>12}")
+    for name, size, seconds in rows:
+        print(f"{name:<18}{size:>12,}{size / rows[0][1]:>9.1%}{seconds * 1000:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
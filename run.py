@@ -1,7 +1,90 @@
 #!/usr/bin/env python3
-"""Entry point for SocialChain application."""
-from socialchain.api.app import create_app
+"""Entry point for SocialChain application.
+
+Automatic block production is enabled by setting any of
+``SOCIALCHAIN_BLOCK_INTERVAL`` (seconds), ``SOCIALCHAIN_MAX_PENDING``
+(transactions) or ``SOCIALCHAIN_MAX_PENDING_BYTES``.
+
+Proof-of-authority is selected with ``SOCIALCHAIN_CONSENSUS=poa`` and a
+comma-separated ``SOCIALCHAIN_AUTHORITIES`` list of DIDs; an authority node
+loads its signing key from the PEM file named by ``SOCIALCHAIN_NODE_KEY``.
+
+Proof-of-work difficulty is retargeted towards ``SOCIALCHAIN_TARGET_BLOCK_TIME``
+seconds per block when set, every ``SOCIALCHAIN_RETARGET_EVERY`` blocks
+(default 10).
+
+With ``SOCIALCHAIN_SNAPSHOT_DIR`` set, the node boots from the newest state
+snapshot in that directory and writes a new one every
+``SOCIALCHAIN_SNAPSHOT_EVERY`` blocks (default 100).
+
+``SOCIALCHAIN_RETENTION`` enables pruning: transaction bodies of blocks more
+than that many blocks below the tip are discarded.
+
+``SOCIALCHAIN_LANES=1`` routes social, governance, contract and agent
+transactions to separate lane sub-chains.  Each lane gets a block scheduler
+with the triggers above, and root blocks commit to the lane tips.
+
+``SOCIALCHAIN_TRUST_HALF_LIFE`` (seconds) makes trust decay with the age of
+its edge.
+"""
+import os
+
+from socialchain.api.app import AppState, create_app
+from socialchain.api.snapshot import PeriodicSnapshots, SnapshotStore, restore_snapshot
+from socialchain.blockchain import Identity, ProofOfAuthority, ProofOfWork
+
+
+def _env_number(name, cast):
+    value = os.environ.get(name)
+    return cast(value) if value else None
+
+
+def _build_state() -> AppState:
+    identity = None
+    key_path = os.environ.get("SOCIALCHAIN_NODE_KEY")
+    if key_path:
+        with open(key_path, "rb") as f:
+            identity = Identity.from_pem(f.read())
+    consensus = None
+    if os.environ.get("SOCIALCHAIN_CONSENSUS", "pow").lower() == "poa":
+        authorities = [
+            did.strip() for did in os.environ.get("SOCIALCHAIN_AUTHORITIES", "").split(",")
+            if did.strip()
+        ]
+        consensus = ProofOfAuthority(authorities, identity=identity)
+    else:
+        consensus = ProofOfWork(
+            block_interval=_env_number("SOCIALCHAIN_TARGET_BLOCK_TIME", float),
+            retarget_every=_env_number("SOCIALCHAIN_RETARGET_EVERY", int) or 10,
+        )
+    state = AppState(identity=identity, consensus=consensus,
+                     retention=_env_number("SOCIALCHAIN_RETENTION", int),
+                     lanes=os.environ.get("SOCIALCHAIN_LANES", "") in ("1", "true", "yes"))
+    snapshot_dir = os.environ.get("SOCIALCHAIN_SNAPSHOT_DIR")
+    if snapshot_dir:
+        store = SnapshotStore(snapshot_dir)
+        snapshot = store.latest()
+        if snapshot is not None:
+            restore_snapshot(state, snapshot)
+        state.snapshots = PeriodicSnapshots(
+            state, store, every=_env_number("SOCIALCHAIN_SNAPSHOT_EVERY", int) or 100,
+        )
+        state.snapshots.start()
+    half_life = _env_number("SOCIALCHAIN_TRUST_HALF_LIFE", float)
+    if half_life:
+        state.trust_graph.half_life = half_life
+    return state
+
 
 if __name__ == "__main__":
-    app = create_app()
+    app = create_app(state=_build_state())
+    app.app_state.overlay.start()
+    for scheduler in [app.app_state.scheduler, *app.app_state.lane_schedulers.values()]:
+        scheduler.configure(
+            interval=_env_number("SOCIALCHAIN_BLOCK_INTERVAL", float),
+            max_pending=_env_number("SOCIALCHAIN_MAX_PENDING", int),
+            max_pending_bytes=_env_number("SOCIALCHAIN_MAX_PENDING_BYTES", int),
+        )
+        if scheduler.enabled:
+            scheduler.start()
     app.run(host="0.0.0.0", port=5000, debug=False)
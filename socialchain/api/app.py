@@ -1,20 +1,48 @@
+import functools
 import os
 import secrets
+from typing import Optional
 from flask import Flask
 from ..blockchain.blockchain import Blockchain
+from ..blockchain.consensus import ConsensusEngine
+from ..blockchain.identity import Identity
+from ..blockchain.lanes import LaneSet
+from ..blockchain.mining import MiningJobManager
+from ..blockchain.scheduler import BlockScheduler
 from ..network.node import NetworkNode
+from ..network.overlay import OverlayMaintainer
 from ..social.network_map import NetworkMap
 from ..social.request import SocialRequest
 from ..social.trust import TrustGraph
+from ..social.personalized import WalkBank
 from ..social.sybil import SybilResistance
 from ..governance.community import Community
 from .auth import User
 
 
 class AppState:
-    def __init__(self):
-        self.blockchain = Blockchain()
-        self.network_node = NetworkNode()
+    def __init__(self, identity: Optional[Identity] = None,
+                 consensus: Optional[ConsensusEngine] = None,
+                 retention: Optional[int] = None, lanes: bool = False):
+        self.blockchain = Blockchain(consensus=consensus, retention=retention)
+        self.mining = MiningJobManager()
+        self.network_node = NetworkNode(identity=identity)
+        self.overlay = OverlayMaintainer(self.network_node)
+        # Not started by default; see run.py for environment configuration
+        self.scheduler = BlockScheduler(
+            self.blockchain, self.mining, self.network_node.node_id,
+            on_block=self.network_node.broadcast_block,
+        )
+        # Transaction lanes (off by default): lane sub-chains are sealed by
+        # their own schedulers, configured alongside the root one
+        self.lanes = LaneSet(self.blockchain) if lanes else None
+        self.lane_schedulers = {
+            name: BlockScheduler(
+                lane, self.mining, self.network_node.node_id,
+                on_block=functools.partial(self.network_node.broadcast_block, lane=name),
+            )
+            for name, lane in (self.lanes.lanes.items() if self.lanes else ())
+        }
         self.network_map = NetworkMap()
         self.agent_registry = {}  # did -> AIAgent
         self.social_requests = {}  # request_id -> SocialRequest
@@ -23,7 +51,10 @@ class AppState:
         self.contracts = {}  # contract_id -> SmartContract
         self.trust_graph = TrustGraph()
         self.sybil_resistance = SybilResistance(self.trust_graph)
+        self.walk_bank = WalkBank(self.trust_graph)
+        self.context_walk_banks = {}  # context parameter -> WalkBank, made on demand
         self.communities = {}  # community_id -> Community
+        self.snapshots = None  # PeriodicSnapshots; see run.py
 
 
 app_state = AppState()
@@ -1,5 +1,13 @@
-from flask import Blueprint, jsonify, request, current_app
+import math
+
+from flask import Blueprint, Response, jsonify, request, current_app
+from ...blockchain.block import Block
+from ...blockchain.crypto import target_to_difficulty
 from ...blockchain.transaction import Transaction
+from ...network import wire
+from ...network.node import PEER_HEADER
+from ..snapshot import build_snapshot
+from ..streaming import stream_json
 
 chain_bp = Blueprint("chain", __name__)
 
@@ -7,7 +15,127 @@ chain_bp = Blueprint("chain", __name__)
 @chain_bp.route("/api/chain", methods=["GET"])
 def get_chain():
     state = current_app.app_state
-    return jsonify(state.blockchain.to_dict()), 200
+    # ``since`` limits the response to blocks from that height, e.g. for a
+    # node that booted from a snapshot
+    since = request.args.get("since", 0, type=int)
+    if wire.accepts_wire(request.headers.get("Accept")):
+        encoding = wire.choose_encoding(request.headers.get(wire.ENCODING_HEADER))
+        message = wire.encode_chain(state.blockchain.blocks_since(since),
+                                    state.blockchain.pending_transactions)
+        body, headers = wire.pack(message, encoding)
+        response = Response(body, status=200, headers=headers)
+        response.vary.update(("Accept", wire.ENCODING_HEADER))
+        return response
+    blockchain = state.blockchain
+    blocks = blockchain.blocks_since(since)
+    response = stream_json({
+        "chain": (block.to_dict() for block in blocks),
+        "length": blockchain.last_block.index + 1,
+        "pending_transactions": [tx.to_dict() for tx in list(blockchain.pending_transactions)],
+    })
+    response.vary.add("Accept")
+    return response, 200
+
+
+@chain_bp.route("/api/chain/tip", methods=["GET"])
+def get_chain_tip():
+    """Lightweight height probe used by peers to pick a sync source."""
+    state = current_app.app_state
+    tip = state.blockchain.last_block
+    return jsonify({
+        "height": tip.index,
+        "hash": tip.hash,
+        "length": tip.index + 1,
+        "wire": list(wire.SUPPORTED_ENCODINGS),
+        "consensus": state.blockchain.consensus.name,
+    }), 200
+
+
+@chain_bp.route("/api/chain/consensus", methods=["GET"])
+def get_consensus():
+    state = current_app.app_state
+    body = {"consensus": state.blockchain.consensus.to_dict()}
+    tip = state.blockchain.last_block
+    if tip.target is not None:
+        body["target"] = tip.target_hex
+        body["difficulty"] = target_to_difficulty(tip.target)
+    return jsonify(body), 200
+
+
+@chain_bp.route("/api/chain/blocks/<int:height>", methods=["GET"])
+def get_block(height):
+    """Return the main-chain block at *height*.  A block whose transactions
+    were pruned is answered with 410 and its header."""
+    state = current_app.app_state
+    block = state.blockchain.get_block_at(height)
+    if block is None:
+        if 0 <= height < state.blockchain.base_index:
+            return jsonify({
+                "error": "Block is older than this node's snapshot",
+                "pruned": True,
+                "height": height,
+            }), 410
+        return jsonify({"error": "Block not found"}), 404
+    if block.pruned:
+        return jsonify({
+            "error": "Block transactions have been pruned",
+            "pruned": True,
+            "block": block.to_dict(),
+        }), 410
+    return jsonify({"block": block.to_dict(), "pruned": False}), 200
+
+
+@chain_bp.route("/api/snapshot", methods=["GET"])
+def get_snapshot():
+    """Derived state at the current tip, for peers bootstrapping from it."""
+    state = current_app.app_state
+    return jsonify(build_snapshot(state)), 200
+
+
+@chain_bp.route("/api/blocks", methods=["POST"])
+def receive_blocks():
+    """Accept blocks announced by a peer, as JSON or in wire format.
+
+    Blocks that are new to this node are relayed to its outbound peers
+    (except the sender), so announcements flood through the overlay.
+    ``?lane=<name>`` delivers blocks of a transaction lane's sub-chain.
+    """
+    state = current_app.app_state
+    chain, lane = state.blockchain, request.args.get("lane")
+    if lane is not None:
+        if state.lanes is None:
+            return jsonify({"error": "Transaction lanes are not enabled"}), 400
+        chain = state.lanes.get(lane)
+        if chain is None:
+            return jsonify({"error": "Lane not found"}), 404
+    try:
+        decoded = wire.unpack(request.get_data(), request.headers)
+    except (wire.WireError, ValueError) as e:
+        return jsonify({"error": f"Malformed wire message: {e}"}), 400
+    if decoded is not None:
+        kind, value = decoded
+        if kind != wire.MSG_BLOCKS:
+            return jsonify({"error": "Expected a blocks message"}), 400
+        blocks = value
+    else:
+        data = request.get_json(silent=True) or {}
+        if not isinstance(data, dict):
+            return jsonify({"error": "Expected a JSON object"}), 400
+        raw = data.get("blocks") or ([data["block"]] if "block" in data else [])
+        if not raw:
+            return jsonify({"error": "No blocks provided"}), 400
+        if not isinstance(raw, list) or not all(isinstance(b, dict) for b in raw):
+            return jsonify({"error": "Blocks must be a list of block objects"}), 400
+        try:
+            blocks = [Block.from_dict(b) for b in raw]
+        except (KeyError, TypeError, ValueError) as e:
+            return jsonify({"error": f"Malformed block: {e}"}), 400
+    accepted = [block for block in blocks if chain.add_block(block)]
+    sender = request.headers.get(PEER_HEADER)
+    for block in accepted:
+        state.network_node.relay_block(block, exclude=sender, lane=lane)
+    tip = chain.last_block
+    return jsonify({"accepted": len(accepted), "height": tip.index, "hash": tip.hash}), 200
 
 
 @chain_bp.route("/api/transactions", methods=["POST"])
@@ -30,15 +158,194 @@ def create_transaction():
     return jsonify({"message": f"Transaction added to block {block_index}", "tx_id": tx.tx_id}), 201
 
 
+def _optional_arg(name: str, convert):
+    """Query argument *name* converted by *convert*, or None if absent.
+    Unlike ``request.args.get(type=...)``, a malformed value raises
+    ValueError instead of being silently dropped."""
+    value = request.args.get(name)
+    return None if value is None else convert(value)
+
+
+@chain_bp.route("/api/transactions", methods=["GET"])
+def query_transactions():
+    """Page through mined transactions using the secondary indexes.
+
+    Any indexed field (``tx_type``, ``kind``, ``sender``, ``recipient``,
+    ``contract_id``, ``proposal_id``, ``community_id``, ``agent_did``) is an
+    exact-match filter; ``start``/``end`` bound the timestamp.  Results are in
+    chain order; pass the returned ``cursor`` to get the next page.  With
+    lanes enabled, ``lane`` selects a lane sub-chain.
+    """
+    state = current_app.app_state
+    chain = state.blockchain
+    lane = request.args.get("lane")
+    if lane is not None:
+        chain = state.lanes.get(lane) if state.lanes is not None else None
+        if chain is None:
+            return jsonify({"error": "Lane not found"}), 404
+    reserved = ("start", "end", "cursor", "limit", "lane")
+    filters = {k: v for k, v in request.args.items() if k not in reserved}
+    try:
+        limit = int(request.args.get("limit", 100))
+        since = _optional_arg("start", float)
+        until = _optional_arg("end", float)
+        cursor = _optional_arg("cursor", int)
+        if any(bound is not None and math.isnan(bound) for bound in (since, until)):
+            raise ValueError("NaN bound")
+    except ValueError:
+        return jsonify({"error": "start and end must be numbers; cursor and limit integers"}), 400
+    if not 1 <= limit <= 1000:
+        return jsonify({"error": "limit must be between 1 and 1000"}), 400
+    try:
+        entries, cursor = chain.index.query(filters, since=since, until=until, cursor=cursor, limit=limit)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    return jsonify({
+        "transactions": [{**tx.to_dict(), "block_index": height} for tx, height in entries],
+        "count": len(entries),
+        "cursor": cursor,
+    }), 200
+
+
 @chain_bp.route("/api/mine", methods=["POST"])
 def mine():
+    """Start a background mining job for the pending transactions.
+
+    Returns 202 with the job immediately; pass ``"wait": true`` to block
+    until the job finishes and get the mined block as before.
+    """
     state = current_app.app_state
-    data = request.get_json() or {}
+    data = request.get_json(silent=True) or {}
     miner_did = data.get("miner_did", state.network_node.node_id)
     if not state.blockchain.pending_transactions:
         return jsonify({"message": "No pending transactions to mine"}), 400
-    block = state.blockchain.mine_block(miner_did)
-    return jsonify({"message": "Block mined", "block": block.to_dict()}), 200
+    job = state.mining.submit(state.blockchain, miner_did)
+    if not data.get("wait"):
+        return jsonify({
+            "message": "Mining job started",
+            "job_id": job.job_id,
+            "job": job.to_dict(),
+        }), 202
+    job.wait()
+    if job.block is None:
+        return jsonify({"error": f"Mining job {job.status.value.lower()}", "job": job.to_dict()}), 400
+    return jsonify({"message": "Block mined", "block": job.block.to_dict(), "job_id": job.job_id}), 200
+
+
+@chain_bp.route("/api/mine/jobs", methods=["GET"])
+def list_mining_jobs():
+    state = current_app.app_state
+    return jsonify(state.mining.to_dict()), 200
+
+
+@chain_bp.route("/api/mine/jobs/<job_id>", methods=["GET"])
+def get_mining_job(job_id):
+    state = current_app.app_state
+    job = state.mining.get(job_id)
+    if not job:
+        return jsonify({"error": "Mining job not found"}), 404
+    return jsonify(job.to_dict()), 200
+
+
+@chain_bp.route("/api/mine/jobs/<job_id>/progress", methods=["GET"])
+def get_mining_progress(job_id):
+    state = current_app.app_state
+    job = state.mining.get(job_id)
+    if not job:
+        return jsonify({"error": "Mining job not found"}), 404
+    return jsonify({"job_id": job.job_id, "status": job.status.value, **job.progress()}), 200
+
+
+@chain_bp.route("/api/mine/jobs/<job_id>/cancel", methods=["POST"])
+def cancel_mining_job(job_id):
+    state = current_app.app_state
+    job = state.mining.get(job_id)
+    if not job:
+        return jsonify({"error": "Mining job not found"}), 404
+    if not job.cancel():
+        return jsonify({"error": f"Mining job already {job.status.value.lower()}"}), 400
+    job.wait()
+    return jsonify({"message": "Mining job cancelled", "job": job.to_dict()}), 200
+
+
+@chain_bp.route("/api/chain/scheduler", methods=["GET"])
+def scheduler_status():
+    """Block scheduler settings, pending-pool size and confirmation latency."""
+    state = current_app.app_state
+    return jsonify({"scheduler": state.scheduler.to_dict()}), 200
+
+
+@chain_bp.route("/api/chain/scheduler", methods=["POST"])
+def configure_scheduler():
+    """Update scheduler triggers and start or stop it (``"running"``)."""
+    state = current_app.app_state
+    data = request.get_json(silent=True) or {}
+    scheduler = state.scheduler
+    settings = {
+        key: data.get(key, getattr(scheduler, key))
+        for key in ("interval", "max_pending", "max_pending_bytes")
+    }
+    try:
+        scheduler.configure(**settings)
+        if data.get("running") is True:
+            scheduler.start()
+        elif data.get("running") is False:
+            scheduler.stop()
+    except (TypeError, ValueError) as e:
+        return jsonify({"error": str(e)}), 400
+    return jsonify({"scheduler": scheduler.to_dict()}), 200
+
+
+@chain_bp.route("/api/chain/lanes", methods=["GET"])
+def lanes_status():
+    """Lane sub-chain tips and pools, and the tips last committed by a root block."""
+    state = current_app.app_state
+    if state.lanes is None:
+        return jsonify({"error": "Transaction lanes are not enabled"}), 400
+    return jsonify(state.lanes.to_dict()), 200
+
+
+@chain_bp.route("/api/chain/lanes/<name>", methods=["GET"])
+def get_lane_chain(name):
+    state = current_app.app_state
+    if state.lanes is None:
+        return jsonify({"error": "Transaction lanes are not enabled"}), 400
+    lane = state.lanes.get(name)
+    if lane is None:
+        return jsonify({"error": "Lane not found"}), 404
+    blocks = lane.blocks_since(request.args.get("since", 0, type=int))
+    return stream_json({
+        "lane": lane.name,
+        "chain": (block.to_dict() for block in blocks),
+        "length": lane.last_block.index + 1,
+        "pending_transactions": [tx.to_dict() for tx in list(lane.pending_transactions)],
+    })
+
+
+@chain_bp.route("/api/chain/lanes/mine", methods=["POST"])
+def mine_lanes():
+    """Seal every lane with pending transactions (or those in ``"lanes"``)
+    in parallel and wait for them; then, unless ``"commit": false``, mine
+    the root block committing to the new lane tips."""
+    state = current_app.app_state
+    if state.lanes is None:
+        return jsonify({"error": "Transaction lanes are not enabled"}), 400
+    data = request.get_json(silent=True) or {}
+    miner_did = data.get("miner_did", state.network_node.node_id)
+    names = data.get("lanes")
+    if names is not None:
+        unknown = [n for n in names if state.lanes.get(n) is None]
+        if unknown:
+            return jsonify({"error": f"Unknown lanes: {unknown}"}), 400
+    blocks = state.lanes.seal(state.mining, miner_did, names=names)
+    root = state.lanes.commit(state.mining, miner_did) if data.get("commit", True) else None
+    if not blocks and root is None:
+        return jsonify({"message": "No pending transactions to mine"}), 400
+    return jsonify({
+        "message": f"Sealed {len(blocks)} lane(s)",
+        "blocks": {name: block.to_dict() for name, block in blocks.items()},
+        "root": root.to_dict() if root is not None else None,
+    }), 200
 
 
 @chain_bp.route("/api/balance/<path:did>", methods=["GET"])
@@ -51,10 +358,16 @@ def get_balance(did):
 
 @chain_bp.route("/api/transactions/<path:did>", methods=["GET"])
 def get_transactions_for(did):
-    """Return all mined transactions involving *did*."""
+    """Return all mined transactions involving *did*.  ``pruned`` counts
+    older ones whose bodies this node no longer keeps."""
     state = current_app.app_state
     txs = state.blockchain.get_transactions_for(did)
-    return jsonify({"did": did, "transactions": txs, "count": len(txs)}), 200
+    return jsonify({
+        "did": did,
+        "transactions": txs,
+        "count": len(txs),
+        "pruned": state.blockchain.pruned_count(did),
+    }), 200
 
 
 @chain_bp.route("/api/verify-tx", methods=["POST"])
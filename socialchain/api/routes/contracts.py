@@ -4,6 +4,7 @@ from flask import Blueprint, jsonify, request, current_app
 
 from ...blockchain.contract import SmartContract, ContractStatus
 from ...blockchain.transaction import Transaction
+from ..streaming import stream_json
 
 contracts_bp = Blueprint("contracts", __name__)
 
@@ -11,8 +12,8 @@ contracts_bp = Blueprint("contracts", __name__)
 @contracts_bp.route("/api/contracts", methods=["GET"])
 def list_contracts():
     state = current_app.app_state
-    contracts = [c.to_dict() for c in state.contracts.values()]
-    return jsonify({"contracts": contracts, "count": len(contracts)}), 200
+    contracts = list(state.contracts.values())
+    return stream_json({"contracts": (c.to_dict() for c in contracts), "count": len(contracts)})
 
 
 @contracts_bp.route("/api/contracts", methods=["POST"])
@@ -141,22 +142,15 @@ def get_contract_transactions(contract_id):
     if not contract:
         return jsonify({"error": "Contract not found"}), 404
 
-    matching_txs = []
-    for block in state.blockchain.chain:
-        for tx in block.transactions:
+    matching_txs = state.blockchain.find_transactions(contract_id=contract_id)
+    # Also check pending transactions
+    for chain in state.blockchain.chains():
+        for tx in chain.pending_transactions:
             tx_dict = tx.to_dict()
             if (
                 isinstance(tx_dict.get("data"), dict)
                 and tx_dict["data"].get("contract_id") == contract_id
             ):
-                matching_txs.append({**tx_dict, "block_index": block.index})
-    # Also check pending transactions
-    for tx in state.blockchain.pending_transactions:
-        tx_dict = tx.to_dict()
-        if (
-            isinstance(tx_dict.get("data"), dict)
-            and tx_dict["data"].get("contract_id") == contract_id
-        ):
-            matching_txs.append({**tx_dict, "block_index": "pending"})
+                matching_txs.append({**tx_dict, "block_index": "pending"})
 
     return jsonify({"contract_id": contract_id, "transactions": matching_txs}), 200
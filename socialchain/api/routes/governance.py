@@ -12,8 +12,11 @@ from flask import Blueprint, jsonify, request, current_app
 from ...governance.community import Community, CommunityRole
 from ...governance.proposal import ProposalStatus
 from ...governance.voting import VotingMethod, VoteChoice
+from ...social import bulk
+from ...social.personalized import WalkBank
 from ...social.trust import TrustLevel, score_to_trust_level
 from ...blockchain.transaction import Transaction
+from ..streaming import stream_json
 
 governance_bp = Blueprint("governance", __name__)
 
@@ -266,8 +269,60 @@ def resolve_proposal(proposal_id):
     return jsonify({"error": "Proposal not found"}), 404
 
 
+@governance_bp.route("/api/governance/communities/<community_id>/audit", methods=["GET"])
+def community_audit(community_id):
+    """Mined governance transactions (creation, votes, resolutions) of a community."""
+    state = current_app.app_state
+    if community_id not in state.communities:
+        return jsonify({"error": "Community not found"}), 404
+    txs = state.blockchain.find_transactions(community_id=community_id)
+    return jsonify({"community_id": community_id, "transactions": txs, "count": len(txs)}), 200
+
+
+@governance_bp.route("/api/governance/proposals/<proposal_id>/audit", methods=["GET"])
+def proposal_audit(proposal_id):
+    """Mined votes and resolution of a proposal."""
+    state = current_app.app_state
+    if not any(c.get_proposal(proposal_id) for c in state.communities.values()):
+        return jsonify({"error": "Proposal not found"}), 404
+    txs = state.blockchain.find_transactions(proposal_id=proposal_id)
+    return jsonify({"proposal_id": proposal_id, "transactions": txs, "count": len(txs)}), 200
+
+
 # ── Trust endpoints ──────────────────────────────────────────────────────────
 
+def _trust_context(value):
+    """Parse a trust ``context`` argument: None, a context name, a weighted
+    combination such as ``"governance:0.7,trade:0.3"``, or (in JSON bodies)
+    an object of weights.  Weights are validated by the TrustGraph."""
+    if value is None or value == "":
+        return None
+    if isinstance(value, dict):
+        return value
+    if not isinstance(value, str):
+        raise ValueError("context must be a name or a map of weights")
+    if ":" not in value:
+        return value
+    weights = {}
+    for part in value.split(","):
+        name, _, weight = part.partition(":")
+        try:
+            weights[name.strip()] = float(weight)
+        except ValueError:
+            raise ValueError(f"Invalid context weight: {part}") from None
+    return weights
+
+
+def _as_of(value):
+    """Parse an ``as_of`` argument (Unix time), or None."""
+    if value is None or value == "":
+        return None
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        raise ValueError("as_of must be a Unix timestamp") from None
+
+
 @governance_bp.route("/api/governance/trust", methods=["POST"])
 def set_trust():
     state = current_app.app_state
@@ -292,11 +347,75 @@ def set_trust():
     return jsonify({"message": "Trust set", "trust": edge.to_dict()}), 200
 
 
+@governance_bp.route("/api/governance/trust", methods=["DELETE"])
+def remove_trust():
+    state = current_app.app_state
+    data = request.get_json(silent=True) or {}
+    required = ["truster_did", "trustee_did"]
+    if not all(k in data for k in required):
+        return jsonify({"error": f"Missing required fields: {required}"}), 400
+    context = data.get("context")
+    if context is not None and not isinstance(context, str):
+        return jsonify({"error": "context must be a name"}), 400
+    if not state.trust_graph.remove_trust(data["truster_did"], data["trustee_did"], context):
+        return jsonify({"error": "Trust relationship not found"}), 404
+    return jsonify({"message": "Trust removed"}), 200
+
+
+@governance_bp.route("/api/governance/trust/graph", methods=["GET"])
+def get_trust_graph():
+    """Dump every node and edge of the trust graph (of every context, or
+    of the ``context`` query parameter)."""
+    state = current_app.app_state
+    graph = state.trust_graph
+    try:
+        context = _trust_context(request.args.get("context"))
+        edge_count = graph.get_edge_count(context)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    return stream_json({
+        "nodes": graph.list_nodes(),
+        "edges": (edge.to_dict() for edge in graph.iter_edges(context)),
+        "contexts": graph.list_contexts(),
+        "node_count": graph.get_node_count(),
+        "edge_count": edge_count,
+    })
+
+
+@governance_bp.route("/api/governance/trust/bulk", methods=["GET"])
+def export_trust_bulk():
+    """Stream the whole trust graph and every vouch as NDJSON (default) or
+    the binary edge list (``format=binary``); see ``social.bulk``."""
+    state = current_app.app_state
+    fmt = request.args.get("format", "ndjson")
+    if fmt not in bulk.FORMATS:
+        return jsonify({"error": f"format must be one of {list(bulk.FORMATS)}"}), 400
+    chunks = bulk.export_chunks(state.trust_graph, fmt, state.sybil_resistance)
+    return current_app.response_class(chunks, mimetype=bulk.MEDIA_TYPES[fmt])
+
+
+@governance_bp.route("/api/governance/trust/bulk", methods=["POST"])
+def import_trust_bulk():
+    """Import a bulk trust file from the request body.  Batches before an
+    invalid record stay imported."""
+    state = current_app.app_state
+    fmt = {media: name for name, media in bulk.MEDIA_TYPES.items()}.get(request.mimetype)
+    try:
+        counts = bulk.load(state.trust_graph, request.stream, fmt, state.sybil_resistance)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    return jsonify({"message": "Trust graph imported", **counts}), 200
+
+
 @governance_bp.route("/api/governance/trust/<did>", methods=["GET"])
 def get_trust_info(did):
     state = current_app.app_state
-    trustees = [e.to_dict() for e in state.trust_graph.get_trustees(did)]
-    trusters = [e.to_dict() for e in state.trust_graph.get_trusters(did)]
+    try:
+        context = _trust_context(request.args.get("context"))
+        trustees = [e.to_dict() for e in state.trust_graph.get_trustees(did, context)]
+        trusters = [e.to_dict() for e in state.trust_graph.get_trusters(did, context)]
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
     return jsonify({
         "did": did,
         "trustees": trustees,
@@ -312,20 +431,131 @@ def get_propagated_trust():
     if not source or not target:
         return jsonify({"error": "Missing source and/or target query parameters"}), 400
 
-    score = state.trust_graph.propagated_trust(source, target)
+    try:
+        context = _trust_context(request.args.get("context"))
+        as_of = _as_of(request.args.get("as_of"))
+        score, path = state.trust_graph.trust_path(source, target, context=context, as_of=as_of)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
     return jsonify({
         "source": source,
         "target": target,
         "propagated_trust": score,
         "trust_level": score_to_trust_level(score).value,
+        "path": path,
     }), 200
 
 
+@governance_bp.route("/api/governance/trust/propagated", methods=["POST"])
+def get_propagated_trust_batch():
+    """Propagated trust from one source to many ``targets`` (default: every
+    reachable identity), computed in a single search."""
+    state = current_app.app_state
+    data = request.get_json(silent=True) or {}
+    source = data.get("source")
+    if not source:
+        return jsonify({"error": "Missing source"}), 400
+    targets = data.get("targets")
+    if targets is not None and not isinstance(targets, list):
+        return jsonify({"error": "targets must be a list of DIDs"}), 400
+    try:
+        context = _trust_context(data.get("context"))
+        as_of = _as_of(data.get("as_of"))
+        reachable = state.trust_graph.propagated_trust_from(source, context=context, as_of=as_of)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    if targets is None:
+        targets = list(reachable)
+    trust = {}
+    for target in targets:
+        score, path = reachable.get(target, (0.0, []))
+        trust[target] = {
+            "propagated_trust": score,
+            "trust_level": score_to_trust_level(score).value,
+            "path": path,
+        }
+    return jsonify({"source": source, "trust": trust, "count": len(trust)}), 200
+
+
+MAX_CONTEXT_WALK_BANKS = 8
+
+
+def _walk_bank(state, raw_context: str):
+    """The walk bank for a ``context`` query parameter, made on first use;
+    only the most recently made MAX_CONTEXT_WALK_BANKS are kept besides the
+    default view's."""
+    if not raw_context:
+        return state.walk_bank
+    banks = state.context_walk_banks
+    bank = banks.get(raw_context)
+    if bank is None:
+        bank = WalkBank(state.trust_graph, context=_trust_context(raw_context))
+        if len(banks) >= MAX_CONTEXT_WALK_BANKS:
+            banks.pop(next(iter(banks))).close()
+        banks[raw_context] = bank
+    return bank
+
+
+@governance_bp.route("/api/governance/trust/personalized", methods=["GET"])
+def get_personalized_trust():
+    """Trust from one viewer's point of view (personalized PageRank): the
+    ``k`` most trusted identities, or the score of ``target``, over the
+    default view or the ``context`` query parameter.  Walks follow
+    effective (decayed) scores as of the graph's current decay bucket."""
+    state = current_app.app_state
+    viewer = request.args.get("viewer")
+    if not viewer:
+        return jsonify({"error": "Missing viewer parameter"}), 400
+    raw_context = request.args.get("context", "")
+    try:
+        bank = _walk_bank(state, raw_context)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    result = {"viewer": viewer}
+    if raw_context:
+        result["context"] = raw_context
+    target = request.args.get("target")
+    if target:
+        result.update(target=target, score=bank.score(viewer, target))
+        return jsonify(result), 200
+    k = request.args.get("k", 10, type=int)
+    if not 1 <= k <= 1000:
+        return jsonify({"error": "k must be between 1 and 1000"}), 400
+    result["ranking"] = [{"did": did, "score": score} for did, score in bank.top_k(viewer, k)]
+    return jsonify(result), 200
+
+
 @governance_bp.route("/api/governance/reputation", methods=["GET"])
 def get_reputation():
+    """Global reputation scores, over every context or the ``context``
+    query parameter, optionally ``as_of`` a Unix time.  Responses carry the
+    graph ``version`` and an ETag, so clients can revalidate with
+    ``If-None-Match``."""
     state = current_app.app_state
-    reputation = state.trust_graph.compute_reputation()
-    return jsonify({"reputation": reputation}), 200
+    graph = state.trust_graph
+    raw_context = request.args.get("context", "")
+    try:
+        context = _trust_context(raw_context)
+        as_of = _as_of(request.args.get("as_of"))
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    etag = f"{graph.epoch}-{graph.version}"
+    if raw_context:
+        etag = f"{etag}-{raw_context}"
+    moment = as_of if as_of is not None else graph.decay_bucket()
+    if moment is not None:
+        etag = f"{etag}-{graph.half_life}-{moment}"
+    if etag in request.if_none_match:
+        response = current_app.response_class(status=304)
+        response.set_etag(etag)
+        return response
+    try:
+        reputation = graph.compute_reputation(context=context, as_of=as_of)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    response = jsonify({"reputation": reputation, "version": graph.version})
+    response.set_etag(etag)
+    return response, 200
 
 
 # ── Sybil resistance endpoints ──────────────────────────────────────────────
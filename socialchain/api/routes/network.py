@@ -6,7 +6,8 @@ network_bp = Blueprint("network", __name__)
 @network_bp.route("/api/network/peers", methods=["GET"])
 def list_peers():
     state = current_app.app_state
-    return jsonify({"peers": state.network_node.get_peers()}), 200
+    registry = state.network_node.registry
+    return jsonify({"peers": state.network_node.get_peers(), "stats": registry.stats()}), 200
 
 
 @network_bp.route("/api/network/peers", methods=["POST"])
@@ -21,3 +22,31 @@ def register_peer():
         return jsonify({"error": "Missing did or address"}), 400
     state.network_node.register_peer(did, address)
     return jsonify({"message": f"Peer {did} registered at {address}"}), 201
+
+
+@network_bp.route("/api/network/peers/exchange", methods=["POST"])
+def exchange_peers():
+    """Peer exchange: return a random sample of our peers.
+
+    The caller may advertise its own ``did`` and ``address``; if the DID is
+    new to us it is remembered as a candidate (not an outbound peer) for
+    overlay maintenance.  The request is unauthenticated, so it never
+    changes the address of a peer we already know.
+    """
+    state = current_app.app_state
+    node = state.network_node
+    data = request.get_json(silent=True) or {}
+    did = data.get("did")
+    address = data.get("address")
+    if did and address and did != node.node_id and node.registry.get(did) is None:
+        node.register_peer(did, address, outbound=False)
+    sample = node.registry.sample(node.EXCHANGE_SAMPLE, exclude={did} if did else None)
+    peers = [{"did": d, "address": a} for d, a in sample.items()]
+    peers.append({"did": node.node_id, "address": node.address})
+    return jsonify({"peers": peers}), 200
+
+
+@network_bp.route("/api/network/overlay", methods=["GET"])
+def overlay_status():
+    state = current_app.app_state
+    return jsonify({"overlay": state.overlay.to_dict()}), 200
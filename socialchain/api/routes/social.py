@@ -4,6 +4,7 @@ from flask import Blueprint, jsonify, request, current_app
 from ...social.profile import Profile, DeviceType
 from ...social.request import SocialRequest, RequestAction, RequestStatus
 from ...blockchain.transaction import Transaction
+from ..streaming import stream_json
 
 social_bp = Blueprint("social", __name__)
 
@@ -11,8 +12,8 @@ social_bp = Blueprint("social", __name__)
 @social_bp.route("/api/social/profiles", methods=["GET"])
 def list_profiles():
     state = current_app.app_state
-    profiles = [p.to_dict() for p in state.network_map.list_profiles()]
-    return jsonify({"profiles": profiles}), 200
+    profiles = state.network_map.list_profiles()
+    return stream_json({"profiles": (p.to_dict() for p in profiles)})
 
 
 @social_bp.route("/api/social/profiles", methods=["POST"])
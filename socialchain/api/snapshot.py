@@ -0,0 +1,207 @@
+"""State snapshots for fast node bootstrap.
+
+A snapshot captures a node's derived state at a block: balances and the
+most recent blocks (from which the per-DID transaction indexes are rebuilt),
+transaction lanes, contracts, the trust graph, vouches and communities,
+tagged with the block's height and hash.  A node restored from a snapshot
+only needs the blocks after it, so neither boot time nor snapshot size grows
+with the chain.
+
+``SnapshotStore`` keeps the most recent snapshots on disk, each written to a
+temporary file and renamed into place so a crash never leaves a truncated
+snapshot behind.  ``PeriodicSnapshots`` writes one every ``every`` blocks.
+"""
+import gzip
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from typing import List, Optional
+
+from ..blockchain.block import Block
+from ..blockchain.contract import SmartContract
+from ..governance.community import Community
+from ..social.personalized import WalkBank
+from ..social.sybil import SybilResistance
+from ..social.trust import TrustGraph
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_VERSION = 2
+
+
+def build_snapshot(state) -> dict:
+    """Capture *state* (an ``AppState``) at its current chain tip."""
+    chain = state.blockchain.snapshot()
+    snapshot = {
+        "version": SNAPSHOT_VERSION,
+        "height": chain["height"],
+        "hash": chain["hash"],
+        "created_at": time.time(),
+        "chain": chain,
+        "contracts": [c.to_dict() for c in list(state.contracts.values())],
+        "trust_graph": state.trust_graph.to_dict(),
+        "vouches": state.sybil_resistance.to_dict(),
+        "communities": [c.snapshot() for c in list(state.communities.values())],
+    }
+    if state.lanes is not None:
+        snapshot["lanes"] = state.lanes.snapshot()
+    return snapshot
+
+
+def restore_snapshot(state, snapshot: dict) -> None:
+    """Load *snapshot* into *state*.  The blockchain is restored in place,
+    so listeners and components holding it keep working."""
+    if snapshot.get("version") != SNAPSHOT_VERSION:
+        raise ValueError(f"Unsupported snapshot version {snapshot.get('version')!r}")
+    if (snapshot["chain"]["height"], snapshot["chain"]["hash"]) != (snapshot["height"], snapshot["hash"]):
+        raise ValueError("Snapshot chain state does not match its tag")
+    lanes = snapshot.get("lanes")
+    if state.lanes is None and lanes:
+        raise ValueError("Snapshot has transaction lanes, which this node does not enable")
+    if state.lanes is not None:
+        if lanes is None:
+            raise ValueError("Snapshot has no transaction lanes, which this node enables")
+        state.lanes.check_snapshot(snapshot["chain"], lanes)
+    state.blockchain.restore(snapshot["chain"])
+    if state.lanes is not None:
+        state.lanes.restore(lanes)
+    state.contracts = {
+        d["contract_id"]: SmartContract.from_dict(d) for d in snapshot.get("contracts", [])
+    }
+    state.trust_graph = TrustGraph.from_dict(snapshot.get("trust_graph", {}))
+    state.sybil_resistance = SybilResistance.from_dict(snapshot.get("vouches", {}), state.trust_graph)
+    for bank in [state.walk_bank, *state.context_walk_banks.values()]:
+        bank.close()
+    state.walk_bank = WalkBank(state.trust_graph)
+    state.context_walk_banks = {}
+    state.communities = {
+        d["community_id"]: Community.from_snapshot(d) for d in snapshot.get("communities", [])
+    }
+
+
+def bootstrap_from_peer(state, did: str, address: str) -> bool:
+    """Restore *state* from a peer's snapshot, then sync the blocks after
+    it (and its lanes').  Returns False if the snapshot could not be fetched
+    or was invalid."""
+    snapshot = state.network_node.fetch_snapshot(did, address)
+    if snapshot is None:
+        return False
+    try:
+        restore_snapshot(state, snapshot)
+    except (KeyError, ValueError) as e:
+        state.network_node.registry.ban(did, f"invalid snapshot: {e}")
+        logger.warning(f"Banned {did}: served an invalid snapshot ({e})")
+        return False
+    state.network_node.sync_chain(state.blockchain)
+    return True
+
+
+class SnapshotStore:
+    """Gzipped JSON snapshots in *directory*, newest ``keep`` retained."""
+
+    PREFIX = "snapshot-"
+    SUFFIX = ".json.gz"
+
+    def __init__(self, directory: str, keep: int = 3):
+        if keep < 1:
+            raise ValueError("keep must be at least 1")
+        self.directory = directory
+        self.keep = keep
+        os.makedirs(directory, exist_ok=True)
+
+    def _filename(self, snapshot: dict) -> str:
+        # Zero-padded height so lexical order is height order
+        return f"{self.PREFIX}{snapshot['height']:012d}-{snapshot['hash'][:16]}{self.SUFFIX}"
+
+    def save(self, snapshot: dict) -> str:
+        """Write *snapshot* atomically and prune old ones.  Returns its path."""
+        path = os.path.join(self.directory, self._filename(snapshot))
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, prefix=".tmp-", suffix=self.SUFFIX)
+        try:
+            with os.fdopen(fd, "wb") as raw:
+                with gzip.GzipFile(fileobj=raw, mode="wb", compresslevel=6) as f:
+                    f.write(json.dumps(snapshot, separators=(",", ":")).encode())
+                raw.flush()
+                os.fsync(raw.fileno())
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            raise
+        self._prune()
+        return path
+
+    def list(self) -> List[str]:
+        """Snapshot paths, oldest first."""
+        names = sorted(
+            name for name in os.listdir(self.directory)
+            if name.startswith(self.PREFIX) and name.endswith(self.SUFFIX)
+        )
+        return [os.path.join(self.directory, name) for name in names]
+
+    @staticmethod
+    def load(path: str) -> dict:
+        with gzip.open(path, "rb") as f:
+            return json.loads(f.read())
+
+    def latest(self) -> Optional[dict]:
+        """The newest readable snapshot, or None."""
+        for path in reversed(self.list()):
+            try:
+                return self.load(path)
+            except (OSError, ValueError) as e:
+                logger.warning(f"Skipping unreadable snapshot {path}: {e}")
+        return None
+
+    def _prune(self) -> None:
+        for path in self.list()[:-self.keep]:
+            os.unlink(path)
+
+
+class PeriodicSnapshots:
+    """Save a snapshot of *state* whenever the chain tip reaches a multiple
+    of *every* blocks."""
+
+    def __init__(self, state, store: SnapshotStore, every: int = 100):
+        if every < 1:
+            raise ValueError("every must be at least 1")
+        self.state = state
+        self.store = store
+        self.every = every
+        self.last_height: Optional[int] = None
+        self.last_path: Optional[str] = None
+        self._lock = threading.Lock()
+        self._blockchain = None
+
+    def _on_tip_change(self, tip: Block) -> None:
+        if tip.index % self.every or tip.index == self.last_height:
+            return
+        with self._lock:
+            try:
+                self.last_path = self.store.save(build_snapshot(self.state))
+                self.last_height = tip.index
+            except Exception as e:
+                logger.warning(f"Snapshot at height {tip.index} failed: {e}")
+
+    def start(self) -> None:
+        if self._blockchain is None:
+            self._blockchain = self.state.blockchain
+            self._blockchain.add_tip_listener(self._on_tip_change)
+
+    def stop(self) -> None:
+        if self._blockchain is not None:
+            self._blockchain.remove_tip_listener(self._on_tip_change)
+            self._blockchain = None
+
+    def to_dict(self) -> dict:
+        return {
+            "directory": self.store.directory,
+            "every": self.every,
+            "keep": self.store.keep,
+            "last_height": self.last_height,
+            "last_path": self.last_path,
+            "stored": len(self.store.list()),
+        }
@@ -0,0 +1,69 @@
+"""Streaming JSON responses for large collections.
+
+``jsonify`` builds the whole response in memory: the nested dicts, then the
+JSON text, then the response body, so peak memory is several times the size
+of the data.  ``stream_json`` instead serialises one element of each generator at
+a time and hands the text to the WSGI server in chunks as it is produced:
+
+    return stream_json({"chain": (b.to_dict() for b in blocks), "length": n})
+
+Dicts are walked key by key and generators element by element; anything
+else (including each element a generator yields) is encoded with
+``json.dumps`` as a unit, so the caller decides the granularity, e.g. one
+block dict at a time.
+"""
+import json
+from types import GeneratorType
+from typing import Any, Iterable, Iterator
+
+from flask import Response
+
+CHUNK_SIZE = 64 * 1024  # characters buffered before a chunk is sent
+
+_dumps = json.JSONEncoder(separators=(",", ":")).encode
+
+
+def iter_json(value: Any) -> Iterator[str]:
+    """Yield the JSON text of *value* in pieces."""
+    if isinstance(value, dict):
+        yield "{"
+        first = True
+        for key, item in value.items():
+            yield ("" if first else ",") + _dumps(str(key)) + ":"
+            first = False
+            yield from iter_json(item)
+        yield "}"
+    elif isinstance(value, GeneratorType):
+        yield "["
+        first = True
+        for item in value:
+            yield ("" if first else ",") + _dumps(item)
+            first = False
+        yield "]"
+    else:
+        yield _dumps(value)
+
+
+def _chunked(parts: Iterable[str], size: int) -> Iterator[bytes]:
+    buffer, buffered = [], 0
+    for part in parts:
+        buffer.append(part)
+        buffered += len(part)
+        if buffered >= size:
+            yield "".join(buffer).encode()
+            buffer, buffered = [], 0
+    if buffer:
+        yield "".join(buffer).encode()
+
+
+def stream_json(value: Any, status: int = 200, chunk_size: int = CHUNK_SIZE) -> Response:
+    """A chunked ``application/json`` response that serialises *value* lazily.
+
+    Generators inside *value* run while the response is being sent, after
+    the view has returned and outside its request context, so they must
+    not touch ``request`` or ``current_app``.  Pass them snapshots (e.g.
+    ``list(...)`` of object references) of collections that other requests
+    may modify.
+    """
+    return Response(_chunked(iter_json(value), chunk_size), status=status,
+                    mimetype="application/json")
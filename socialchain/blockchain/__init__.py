@@ -2,19 +2,30 @@ from .block import Block
 from .transaction import Transaction, TransactionType
 from .blockchain import Blockchain
 from .identity import Identity
+from .interner import DIDInterner, DIDS
 from .contract import SmartContract, ContractStatus
+from .consensus import ConsensusEngine, ProofOfWork, ProofOfAuthority
+from .mining import JobStatus, MiningJob, MiningJobManager
+from .scheduler import BlockScheduler
+from .lanes import DEFAULT_LANES, LaneChain, LaneSet
 from .crypto import (
     sha256, double_sha256, hmac_sha256,
     derive_key, verify_key,
     merkle_root, difficulty_target, hash_meets_difficulty,
-    sigmoid, log_scale, weighted_average,
+    difficulty_to_target, target_to_difficulty, hash_meets_target, target_work,
+    sigmoid, log_scale, weighted_average, percentile,
 )
 
 __all__ = [
     "Block", "Transaction", "TransactionType", "Blockchain", "Identity",
+    "DIDInterner", "DIDS",
     "SmartContract", "ContractStatus",
+    "ConsensusEngine", "ProofOfWork", "ProofOfAuthority",
+    "JobStatus", "MiningJob", "MiningJobManager", "BlockScheduler",
+    "DEFAULT_LANES", "LaneChain", "LaneSet",
     "sha256", "double_sha256", "hmac_sha256",
     "derive_key", "verify_key",
     "merkle_root", "difficulty_target", "hash_meets_difficulty",
-    "sigmoid", "log_scale", "weighted_average",
+    "difficulty_to_target", "target_to_difficulty", "hash_meets_target", "target_work",
+    "sigmoid", "log_scale", "weighted_average", "percentile",
 ]
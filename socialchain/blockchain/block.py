@@ -2,6 +2,7 @@ import hashlib
 import json
 import time
 from typing import List, Optional
+from .crypto import merkle_root
 from .transaction import Transaction
 
 
@@ -13,25 +14,76 @@ class Block:
         previous_hash: str,
         nonce: int = 0,
         timestamp: Optional[float] = None,
+        block_hash: Optional[str] = None,
+        signer: Optional[str] = None,
+        signature: Optional[str] = None,
+        target: Optional[int] = None,
+        merkle_root: Optional[str] = None,
+        tx_count: int = 0,
     ):
         self.index = index
         self.timestamp = timestamp or time.time()
         self.transactions = transactions
         self.previous_hash = previous_hash
         self.nonce = nonce
-        self.hash = self.compute_hash()
+        # Set by signature-based consensus engines; the signer is part of the
+        # hashed header, the signature (over the hash) is not.
+        self.signer = signer
+        self.signature = signature
+        # Proof-of-work target (the hash must be numerically below it);
+        # committed to by the hash when set
+        self.target = target
+        # The header commits to the Merkle root of the transactions.  A
+        # pruned block has dropped its transactions and keeps only the root
+        # and the transaction count.
+        self.pruned = merkle_root is not None
+        self._merkle_root = merkle_root
+        self._tx_count = tx_count
+        # A known hash (e.g. received from a peer) skips the recomputation;
+        # it is still checked by Blockchain.verify_block before acceptance.
+        self.hash = block_hash or self.compute_hash()
 
-    def compute_hash(self) -> str:
+    @property
+    def merkle_root(self) -> str:
+        """Merkle root over the transactions' leaf hashes; recomputed from
+        the body unless the block has been pruned."""
+        if self.pruned:
+            return self._merkle_root
+        return merkle_root([tx.leaf_hash() for tx in self.transactions])
+
+    @property
+    def tx_count(self) -> int:
+        return self._tx_count if self.pruned else len(self.transactions)
+
+    def prune(self) -> None:
+        """Discard the transaction bodies, keeping the header intact."""
+        if not self.pruned:
+            self._merkle_root = self.merkle_root
+            self._tx_count = len(self.transactions)
+            self.transactions = []
+            self.pruned = True
+
+    def compute_hash(self, root: Optional[str] = None) -> str:
+        """Hash the header.  *root* lets a nonce search reuse a Merkle root
+        it computed once instead of rehashing every transaction."""
         block_dict = {
             "index": self.index,
             "timestamp": self.timestamp,
-            "transactions": [tx.to_dict() for tx in self.transactions],
+            "merkle_root": root if root is not None else self.merkle_root,
             "previous_hash": self.previous_hash,
             "nonce": self.nonce,
         }
+        if self.signer is not None:
+            block_dict["signer"] = self.signer
+        if self.target is not None:
+            block_dict["target"] = self.target_hex
         block_string = json.dumps(block_dict, sort_keys=True)
         return hashlib.sha256(block_string.encode()).hexdigest()
 
+    @property
+    def target_hex(self) -> Optional[str]:
+        return f"{self.target:064x}" if self.target is not None else None
+
     def to_dict(self) -> dict:
         return {
             "index": self.index,
@@ -40,7 +92,37 @@ class Block:
             "previous_hash": self.previous_hash,
             "nonce": self.nonce,
             "hash": self.hash,
+            "signer": self.signer,
+            "signature": self.signature,
+            "target": self.target_hex,
+            "merkle_root": self.merkle_root,
+            "tx_count": self.tx_count,
+            "pruned": self.pruned,
         }
 
+    @classmethod
+    def from_dict(cls, d: dict) -> "Block":
+        """Rebuild a block from ``to_dict`` output.  Raises ValueError for a
+        target that is not a hex string."""
+        target = None
+        if d.get("target"):
+            try:
+                target = int(d["target"], 16)
+            except (TypeError, ValueError):
+                raise ValueError(f"Malformed block target: {d['target']!r}") from None
+        return cls(
+            index=d["index"],
+            transactions=[Transaction.from_dict(tx) for tx in d["transactions"]],
+            previous_hash=d["previous_hash"],
+            nonce=d["nonce"],
+            timestamp=d["timestamp"],
+            block_hash=d["hash"],
+            signer=d.get("signer"),
+            signature=d.get("signature"),
+            target=target,
+            merkle_root=d["merkle_root"] if d.get("pruned") else None,
+            tx_count=d.get("tx_count", 0),
+        )
+
     def __repr__(self) -> str:
-        return f"Block(index={self.index}, hash={self.hash[:16]}..., txs={len(self.transactions)})"
+        return f"Block(index={self.index}, hash={self.hash[:16]}..., txs={self.tx_count})"
@@ -1,40 +1,183 @@
 import json
-from typing import Dict, List, Optional
+import threading
+from typing import Any, Callable, Dict, List, Optional, Tuple
 from .block import Block
+from .consensus import ConsensusEngine, ProofOfWork
+from .index import TransactionIndex
 from .transaction import Transaction, TransactionType
-from .crypto import merkle_root, hash_meets_difficulty
+from .crypto import difficulty_to_target, hash_meets_target
 
 
 class Blockchain:
+    # Initial proof-of-work difficulty in leading zero hex digits; may be
+    # fractional.  See ProofOfWork for retargeting.
     DIFFICULTY = 4
+    # Side branches forking more than this many blocks below the tip are
+    # discarded, and blocks whose branch forks deeper than this are rejected,
+    # so a reorganisation never undoes more than this many blocks.
+    MAX_FORK_DEPTH = 100
+    # Fixed genesis timestamp so that independently started nodes share a
+    # common ancestor and can reorganise onto each other's branches.
+    GENESIS_TIMESTAMP = 1700000000.0
 
-    def __init__(self):
+    # Nonces tried between checks of a proof-of-work stop request
+    POW_CHECK_INTERVAL = 1024
+
+    # "Latest wins" pending-pool rules: a new transaction of one of these
+    # types (``data["type"]``, else ``tx_type``) replaces the unmined one
+    # from the same sender with the same values for the listed data fields.
+    COALESCING_RULES: Dict[str, Tuple[str, ...]] = {
+        "status_update": (),
+        "agent_status": ("agent_did",),
+        "lane_commit": (),
+    }
+
+    _genesis_seal: Dict[tuple, tuple] = {}  # (difficulty, parent) -> (nonce, hash)
+
+    def __init__(self, consensus: Optional[ConsensusEngine] = None,
+                 retention: Optional[int] = None):
+        # Block sealing, validation and fork-choice weight are delegated to
+        # the consensus engine (proof-of-work unless configured otherwise)
+        self.consensus = consensus or ProofOfWork()
+        # Pruning mode: transaction bodies of main-chain blocks more than
+        # ``retention`` blocks below the tip are discarded (headers and Merkle
+        # roots are kept).  None keeps every body.  Reorganisations must be
+        # able to undo blocks, so the window cannot be shorter than
+        # MAX_FORK_DEPTH.
+        if retention is not None and retention < self.MAX_FORK_DEPTH:
+            raise ValueError(f"retention must be at least MAX_FORK_DEPTH ({self.MAX_FORK_DEPTH})")
+        self.retention = retention
+        # Guards the block tree against concurrent acceptance from request
+        # handlers, sync and background mining jobs
+        self._lock = threading.RLock()
+        self._tip_listeners: List[Callable[[Block], None]] = []
+        self._transaction_listeners: List[Callable[[Transaction], None]] = []
         self.chain: List[Block] = []
         self.pending_transactions: List[Transaction] = []
+        self.coalescing_rules: Dict[str, Tuple[str, ...]] = dict(self.COALESCING_RULES)
+        self._pending_keys: Dict[tuple, Transaction] = {}  # coalescing key -> pending tx
+        self.coalesced = 0  # pending transactions replaced by a newer one
+        # Block tree: every known block by hash, plus the subset that sits on
+        # side branches (not part of ``self.chain``).
+        self._blocks: Dict[str, Block] = {}
+        self._side_blocks: Dict[str, Block] = {}
+        self._cumulative_work: Dict[str, int] = {}
+        # Derived indexes, updated incrementally as blocks are (dis)connected
+        self._balances: Dict[str, int] = {}
+        self._did_transactions: Dict[str, List[Transaction]] = {}
+        self._tx_locations: Dict[str, int] = {}  # tx_id -> block index
+        self._pruned_tx_counts: Dict[str, int] = {}  # did -> transactions pruned
+        self._pruned_through = 0  # highest height whose body has been pruned
+        self.index = TransactionIndex()  # secondary indexes for queries
+        # Height of the snapshot this chain was restored from; blocks up to
+        # it were accepted by the node that took the snapshot
+        self.snapshot_height: Optional[int] = None
+        # Transaction lanes (a LaneSet): when set, transactions of the lane
+        # categories are routed to the lanes' sub-chains
+        self.lanes = None
         self._create_genesis_block()
 
+    def _genesis_parent(self) -> str:
+        """The ``previous_hash`` of this chain's genesis block."""
+        return "0" * 64
+
     def _create_genesis_block(self) -> None:
-        genesis = Block(index=0, transactions=[], previous_hash="0" * 64)
-        genesis.nonce, genesis.hash = self._proof_of_work(genesis)
-        self.chain.append(genesis)
+        genesis = Block(
+            index=0, transactions=[], previous_hash=self._genesis_parent(),
+            timestamp=self.GENESIS_TIMESTAMP,
+        )
+        self.consensus.seal_genesis(self, genesis)
+        self._blocks[genesis.hash] = genesis
+        self._cumulative_work[genesis.hash] = self._block_work(genesis)
+        self._connect_block(genesis)
 
-    def _proof_of_work(self, block: Block):
+    def _proof_of_work(self, block: Block,
+                       should_stop: Optional[Callable[[], bool]] = None) -> Optional[Tuple[int, str]]:
+        """Search nonces for *block* until its hash is below its target.
+
+        A block without a target gets the one the retarget schedule expects.
+        ``block.nonce`` tracks the search, so observers can read progress.
+        Returns ``(nonce, hash)``, or None if *should_stop* returned True.
+        """
+        if block.target is None:
+            if isinstance(self.consensus, ProofOfWork):
+                block.target = self.consensus.expected_target(self, block)
+            if block.target is None:
+                block.target = difficulty_to_target(self.DIFFICULTY)
+        target = block.target
+        root = block.merkle_root
         nonce = 0
         block.nonce = nonce
-        computed = block.compute_hash()
-        while not hash_meets_difficulty(computed, self.DIFFICULTY):
+        computed = block.compute_hash(root)
+        while not hash_meets_target(computed, target):
             nonce += 1
+            if should_stop is not None and nonce % self.POW_CHECK_INTERVAL == 0 and should_stop():
+                return None
             block.nonce = nonce
-            computed = block.compute_hash()
+            computed = block.compute_hash(root)
         return nonce, computed
 
+    def _block_work(self, block: Block) -> int:
+        return self.consensus.block_work(self, block)
+
+    def seal_block(self, block: Block,
+                   should_stop: Optional[Callable[[], bool]] = None) -> bool:
+        """Seal *block* with the consensus engine (hash search or signature).
+        Returns False if *should_stop* aborted the search."""
+        return self.consensus.seal(self, block, should_stop=should_stop)
+
     @property
     def last_block(self) -> Block:
         return self.chain[-1]
 
+    @property
+    def base_index(self) -> int:
+        """Height of ``chain[0]``: 0, or the first block kept by a snapshot."""
+        return self.chain[0].index
+
+    @staticmethod
+    def transaction_kind(transaction: Transaction) -> str:
+        """The application-level type of *transaction*: ``data["type"]``,
+        else its ``tx_type``."""
+        data = transaction.data if isinstance(transaction.data, dict) else {}
+        return data.get("type") or transaction.tx_type
+
+    def chains(self) -> List["Blockchain"]:
+        """This chain followed by its lanes' sub-chains, if any."""
+        return [self] + (self.lanes.chains() if self.lanes is not None else [])
+
+    def coalescing_key(self, transaction: Transaction) -> Optional[tuple]:
+        """The key under which *transaction* supersedes older pending ones,
+        or None if its type has no coalescing rule."""
+        data = transaction.data if isinstance(transaction.data, dict) else {}
+        tx_type = self.transaction_kind(transaction)
+        fields = self.coalescing_rules.get(tx_type)
+        if fields is None:
+            return None
+        return (tx_type, transaction.sender) + tuple(str(data.get(f)) for f in fields)
+
     def add_transaction(self, transaction: Transaction) -> int:
-        self.pending_transactions.append(transaction)
-        return self.last_block.index + 1
+        """Queue *transaction* for the next block and return that block's
+        height; with lanes enabled, on the sub-chain of its lane."""
+        lane = self.lanes.route(transaction) if self.lanes is not None else None
+        if lane is not None:
+            return lane.add_transaction(transaction)
+        with self._lock:
+            key = self.coalescing_key(transaction)
+            if key is not None:
+                superseded = self._pending_keys.get(key)
+                if superseded is not None:
+                    try:
+                        self.pending_transactions.remove(superseded)
+                        self.coalesced += 1
+                    except ValueError:
+                        pass  # already taken out of the pool
+                self._pending_keys[key] = transaction
+            self.pending_transactions.append(transaction)
+            next_index = self.last_block.index + 1
+        for listener in list(self._transaction_listeners):
+            listener(transaction)
+        return next_index
 
     def verify_transaction(self, transaction: Transaction) -> bool:
         """Verify an ECDSA-signed transaction using the sender's public key.
@@ -73,36 +216,318 @@ class Blockchain:
         except Exception:
             return False
 
-    def mine_block(self, miner_did: str) -> Block:
-        reward_tx = Transaction(
+    def create_block_template(self, miner_did: str) -> Block:
+        """Snapshot the pending pool plus a mining reward into an unsealed
+        block on top of the current tip.  The pending pool is not modified,
+        so transactions keep flowing in while the template is mined."""
+        reward_tx = self._reward_transaction(miner_did)
+        with self._lock:
+            transactions = list(self.pending_transactions)
+            if reward_tx is not None:
+                transactions.append(reward_tx)
+            return Block(
+                index=self.last_block.index + 1,
+                transactions=transactions,
+                previous_hash=self.last_block.hash,
+            )
+
+    def _reward_transaction(self, miner_did: str) -> Optional[Transaction]:
+        return Transaction(
             sender="NETWORK",
             recipient=miner_did,
             data={"reward": 1, "type": "mining_reward"},
             tx_type=TransactionType.MINING_REWARD,
         )
-        self.pending_transactions.append(reward_tx)
-        block = Block(
-            index=len(self.chain),
-            transactions=list(self.pending_transactions),
-            previous_hash=self.last_block.hash,
-        )
-        nonce, block_hash = self._proof_of_work(block)
-        block.nonce = nonce
-        block.hash = block_hash
-        self.chain.append(block)
-        self.pending_transactions = []
+
+    def can_seal(self) -> bool:
+        """True if the consensus engine lets this node seal a block on the
+        current tip (e.g. a proof-of-authority signer that sealed recently
+        must wait for the others)."""
+        with self._lock:
+            tip = self.last_block
+            probe = Block(index=tip.index + 1, transactions=[], previous_hash=tip.hash)
+            return self.consensus.can_seal(self, probe)
+
+    def mine_block(self, miner_did: str) -> Block:
+        block = self.create_block_template(miner_did)
+        self.seal_block(block)
+        self.add_block(block)
         return block
 
+    # ------------------------------------------------------------------
+    # Block tree and reorganisation
+    # ------------------------------------------------------------------
+
     def add_block(self, block: Block) -> bool:
-        if block.previous_hash != self.last_block.hash:
+        """Accept *block* into the block tree.
+
+        The block must extend a known block.  It is connected directly when
+        it extends the current tip; when it extends a side branch whose
+        cumulative work now exceeds the tip's, the chain is reorganised onto
+        that branch.  Returns False for invalid, duplicate or orphan blocks
+        and for blocks forking deeper than ``MAX_FORK_DEPTH``.  Tip listeners
+        are notified when the main chain's tip changes.
+        """
+        with self._lock:
+            tip_before = self.last_block.hash
+            accepted = self._add_block(block)
+            tip = self.last_block
+        if accepted and tip.hash != tip_before:
+            for listener in list(self._tip_listeners):
+                listener(tip)
+        return accepted
+
+    def add_tip_listener(self, listener: Callable[[Block], None]) -> None:
+        """Call *listener(new_tip)* whenever the main chain's tip changes."""
+        if listener not in self._tip_listeners:
+            self._tip_listeners.append(listener)
+
+    def remove_tip_listener(self, listener: Callable[[Block], None]) -> None:
+        if listener in self._tip_listeners:
+            self._tip_listeners.remove(listener)
+
+    def add_transaction_listener(self, listener: Callable[[Transaction], None]) -> None:
+        """Call *listener(tx)* whenever a transaction enters the pending pool."""
+        if listener not in self._transaction_listeners:
+            self._transaction_listeners.append(listener)
+
+    def remove_transaction_listener(self, listener: Callable[[Transaction], None]) -> None:
+        if listener in self._transaction_listeners:
+            self._transaction_listeners.remove(listener)
+
+    def _add_block(self, block: Block) -> bool:
+        if block.hash in self._blocks or block.pruned:
+            # A pruned block's effects cannot be applied to our indexes
             return False
-        if not hash_meets_difficulty(block.hash, self.DIFFICULTY):
+        parent = self._blocks.get(block.previous_hash)
+        if parent is None or block.index != parent.index + 1:
             return False
-        if block.hash != block.compute_hash():
+        if self.last_block.index - self._fork_point(parent).index > self.MAX_FORK_DEPTH:
             return False
-        self.chain.append(block)
+        if not self.verify_block(block):
+            return False
+
+        self._blocks[block.hash] = block
+        self._cumulative_work[block.hash] = (
+            self._cumulative_work[parent.hash] + self._block_work(block)
+        )
+        if parent.hash == self.last_block.hash:
+            self._connect_block(block)
+        else:
+            self._side_blocks[block.hash] = block
+            if self._cumulative_work[block.hash] > self._cumulative_work[self.last_block.hash]:
+                self._reorganize(block)
+        self._prune_side_branches()
+        if self.retention is not None:
+            self.prune_bodies()
         return True
 
+    def verify_block(self, block: Block) -> bool:
+        """Check that *block* is correctly sealed under the consensus engine."""
+        return self.consensus.verify(self, block)
+
+    def can_verify(self, block: Block) -> bool:
+        """True if this chain holds the blocks needed to verify *block*; a
+        False answer means "not yet", not "invalid"."""
+        return self.consensus.can_verify(self, block)
+
+    def has_block(self, block_hash: str) -> bool:
+        return block_hash in self._blocks
+
+    def get_block(self, block_hash: str) -> Optional[Block]:
+        return self._blocks.get(block_hash)
+
+    def is_on_main_chain(self, block: Block) -> bool:
+        position = block.index - self.base_index
+        return 0 <= position < len(self.chain) and self.chain[position].hash == block.hash
+
+    def _fork_point(self, block: Block) -> Block:
+        """The main-chain block that *block*'s branch forks from (*block*
+        itself when it is on the main chain)."""
+        while block.hash in self._side_blocks:
+            block = self._blocks[block.previous_hash]
+        return block
+
+    def _reorganize(self, new_tip: Block) -> None:
+        """Switch the main chain to the branch ending at *new_tip*.
+
+        Only the blocks between the fork point and the two tips are touched:
+        the old branch is disconnected tip-first, then the new branch is
+        connected from the fork point upwards.
+        """
+        branch: List[Block] = []
+        block = new_tip
+        while not self.is_on_main_chain(block):
+            branch.append(block)
+            block = self._blocks[block.previous_hash]
+        fork_point = block
+        while self.last_block.hash != fork_point.hash:
+            self._disconnect_tip()
+        for block in reversed(branch):
+            self._side_blocks.pop(block.hash, None)
+            self._connect_block(block)
+
+    def _connect_block(self, block: Block) -> None:
+        self.chain.append(block)
+        self.index.add_block(block)
+        mined_ids = set()
+        for tx, td in self._index_transactions(block):
+            mined_ids.add(td.get("tx_id"))
+            reward = self._reward_of(td)
+            if reward:
+                self._balances[td["recipient"]] = self._balances.get(td["recipient"], 0) + reward
+        if mined_ids:
+            self.pending_transactions = [
+                tx for tx in self.pending_transactions if tx.tx_id not in mined_ids
+            ]
+            self._reindex_pending()
+
+    def _index_transactions(self, block: Block) -> List[Tuple[Any, dict]]:
+        """Record *block*'s transactions in the location and per-DID
+        indexes.  Returns them as ``(tx, tx_dict)`` pairs."""
+        indexed = []
+        for tx in block.transactions:
+            td = tx.to_dict() if isinstance(tx, Transaction) else tx
+            self._tx_locations[td.get("tx_id")] = block.index
+            for did in self._involved_dids(td):
+                self._did_transactions.setdefault(did, []).append(tx)
+            indexed.append((tx, td))
+        return indexed
+
+    def _disconnect_tip(self) -> Block:
+        """Pop the tip block, undo its index entries and return its
+        transactions (except mining rewards) to the pending pool."""
+        block = self.chain.pop()
+        self._side_blocks[block.hash] = block
+        self.index.remove_block(block)
+        returned: List[Transaction] = []
+        for tx in reversed(block.transactions):
+            td = tx.to_dict() if isinstance(tx, Transaction) else tx
+            self._tx_locations.pop(td.get("tx_id"), None)
+            for did in reversed(self._involved_dids(td)):
+                entries = self._did_transactions[did]
+                entries.pop()
+                if not entries:
+                    del self._did_transactions[did]
+            reward = self._reward_of(td)
+            if reward:
+                recipient = td["recipient"]
+                self._balances[recipient] -= reward
+                if not self._balances[recipient]:
+                    del self._balances[recipient]
+            if isinstance(tx, Transaction) and tx.tx_type != TransactionType.MINING_REWARD:
+                returned.append(tx)
+        pending_ids = {tx.tx_id for tx in self.pending_transactions}
+        returned = [tx for tx in reversed(returned) if tx.tx_id not in pending_ids]
+        self.pending_transactions = returned + self.pending_transactions
+        self._reindex_pending()
+        return block
+
+    def _reindex_pending(self) -> None:
+        """Rebuild the coalescing index after the pool was rewritten; of
+        several transactions sharing a key (e.g. one returned by a reorg)
+        only the last one is kept."""
+        keys = [(self.coalescing_key(tx), tx) for tx in self.pending_transactions]
+        latest = {key: tx for key, tx in keys if key is not None}
+        kept = [tx for key, tx in keys if key is None or latest[key] is tx]
+        self.coalesced += len(self.pending_transactions) - len(kept)
+        self.pending_transactions = kept
+        self._pending_keys = latest
+
+    def _prune_side_branches(self) -> None:
+        """Discard whole side branches whose fork point is more than
+        MAX_FORK_DEPTH blocks below the tip.  A branch goes with all of its
+        blocks, so every side block kept still links to the main chain."""
+        cutoff = self.last_block.index - self.MAX_FORK_DEPTH
+        forks: Dict[str, int] = {}  # side block hash -> fork point height
+        for block in self._side_blocks.values():
+            path = []
+            while block.hash in self._side_blocks and block.hash not in forks:
+                path.append(block.hash)
+                block = self._blocks[block.previous_hash]
+            height = forks.get(block.hash, block.index)
+            for block_hash in path:
+                forks[block_hash] = height
+        stale = [h for h, height in forks.items() if height < cutoff]
+        for block_hash in stale:
+            del self._side_blocks[block_hash]
+            del self._blocks[block_hash]
+            del self._cumulative_work[block_hash]
+
+    def prune_bodies(self) -> int:
+        """Drop the transaction bodies of main-chain blocks older than the
+        retention window, along with their per-DID index entries (balances
+        are already folded in).  Returns the number of blocks pruned."""
+        if self.retention is None:
+            return 0
+        with self._lock:
+            cutoff = self.last_block.index - self.retention
+            start = max(self._pruned_through + 1, self.base_index)
+            pruned = 0
+            for height in range(start, cutoff + 1):
+                block = self.chain[height - self.base_index]
+                dropped: Dict[str, int] = {}
+                for tx in block.transactions:
+                    td = tx.to_dict() if isinstance(tx, Transaction) else tx
+                    self._tx_locations.pop(td.get("tx_id"), None)
+                    for did in self._involved_dids(td):
+                        dropped[did] = dropped.get(did, 0) + 1
+                # A DID's entries are in chain order, so the pruned block's
+                # transactions are the oldest ones left in its list
+                for did, count in dropped.items():
+                    entries = self._did_transactions[did]
+                    del entries[:count]
+                    if not entries:
+                        del self._did_transactions[did]
+                    self._pruned_tx_counts[did] = self._pruned_tx_counts.get(did, 0) + count
+                block.prune()
+                pruned += 1
+            self._pruned_through = max(self._pruned_through, cutoff)
+            self.index.prune_through(self._pruned_through)
+            return pruned
+
+    def get_block_at(self, height: int) -> Optional[Block]:
+        """The main-chain block at *height* (possibly pruned), or None if it
+        is above the tip or below the oldest block this node keeps."""
+        position = height - self.base_index
+        if position < 0 or position >= len(self.chain):
+            return None
+        return self.chain[position]
+
+    def pruned_count(self, did: str) -> int:
+        """Number of *did*'s mined transactions whose bodies were pruned."""
+        return sum(chain._pruned_tx_counts.get(did, 0) for chain in self.chains())
+
+    def find_transactions(self, **filters) -> List[dict]:
+        """Mined transactions matching the indexed field *filters* (see
+        TransactionIndex), on this chain and its lanes, with the height
+        (``block_index``) and lane they were mined in."""
+        found = []
+        for chain in self.chains():
+            entries, _ = chain.index.query(filters, limit=None)
+            lane = getattr(chain, "name", None)
+            for tx, height in entries:
+                td = tx.to_dict() if isinstance(tx, Transaction) else dict(tx)
+                td["block_index"] = height
+                if lane is not None:
+                    td["lane"] = lane
+                found.append(td)
+        return found
+
+    @staticmethod
+    def _involved_dids(td: dict) -> List[str]:
+        dids = [td.get("sender")]
+        if td.get("recipient") != td.get("sender"):
+            dids.append(td.get("recipient"))
+        return dids
+
+    @staticmethod
+    def _reward_of(td: dict) -> int:
+        data = td.get("data")
+        if isinstance(data, dict) and "reward" in data:
+            return data["reward"]
+        return 0
+
     def validate_chain(self) -> bool:
         for i in range(1, len(self.chain)):
             current = self.chain[i]
@@ -111,7 +536,9 @@ class Blockchain:
                 return False
             if current.previous_hash != previous.hash:
                 return False
-            if not hash_meets_difficulty(current.hash, self.DIFFICULTY):
+            if self.snapshot_height is not None and current.index <= self.snapshot_height:
+                continue
+            if not self.consensus.verify(self, current):
                 return False
         return True
 
@@ -120,42 +547,116 @@ class Blockchain:
     # ------------------------------------------------------------------
 
     def get_balance(self, did: str) -> int:
-        """Compute the balance (mining rewards received) for *did*."""
-        balance = 0
-        for block in self.chain:
-            for tx in block.transactions:
-                if isinstance(tx, Transaction):
-                    if tx.recipient == did and isinstance(tx.data, dict) and "reward" in tx.data:
-                        balance += tx.data["reward"]
-        return balance
+        """Return the balance (mining rewards received) for *did*."""
+        return self._balances.get(did, 0)
 
     def get_transactions_for(self, did: str) -> List[dict]:
-        """Return all mined transactions involving *did* (as sender or recipient)."""
-        results: List[dict] = []
-        for block in self.chain:
-            for tx in block.transactions:
-                td = tx.to_dict() if isinstance(tx, Transaction) else tx
-                if td.get("sender") == did or td.get("recipient") == did:
-                    results.append(td)
-        return results
+        """Return all mined transactions involving *did* (as sender or
+        recipient), including those mined on lane sub-chains."""
+        return [
+            tx.to_dict() if isinstance(tx, Transaction) else tx
+            for chain in self.chains()
+            for tx in chain._did_transactions.get(did, [])
+        ]
 
     def get_merkle_root(self, block_index: int) -> str:
-        """Return the Merkle root of transaction hashes for the given block."""
-        if block_index < 0 or block_index >= len(self.chain):
-            return "0" * 64
-        block = self.chain[block_index]
-        tx_hashes = [
-            tx.compute_hash() if isinstance(tx, Transaction) else ""
-            for tx in block.transactions
-        ]
-        return merkle_root(tx_hashes)
+        """Return the Merkle root committed by the block at the given height
+        (still available once its body has been pruned)."""
+        block = self.get_block_at(block_index)
+        return block.merkle_root if block is not None else "0" * 64
 
-    def to_dict(self) -> dict:
+    def blocks_since(self, index: int = 0) -> List[Block]:
+        """Main-chain blocks from height *index* to the tip."""
+        return self.chain[max(0, index - self.base_index):]
+
+    def to_dict(self, since: int = 0) -> dict:
         return {
-            "chain": [block.to_dict() for block in self.chain],
-            "length": len(self.chain),
+            "chain": [block.to_dict() for block in self.blocks_since(since)],
+            "length": self.last_block.index + 1,
             "pending_transactions": [tx.to_dict() for tx in self.pending_transactions],
         }
 
+    # ------------------------------------------------------------------
+    # Snapshots
+    # ------------------------------------------------------------------
+
+    def snapshot(self) -> dict:
+        """Capture the derived state at the current tip.
+
+        Balances are stored directly, so a restored node does not replay the
+        chain.  The last ``MAX_FORK_DEPTH`` main-chain blocks, plus the
+        ancestors the consensus engine reads to verify a block (e.g. a
+        retarget window), are kept as well, so the restored chain can still
+        reorganise and retarget near the snapshot height.  The per-DID
+        transaction indexes are not stored: they are rebuilt from the kept
+        blocks, and older transactions count as pruned, so the snapshot's
+        size is bounded by the kept blocks rather than the chain's history.
+        """
+        with self._lock:
+            blocks = self.chain[-(self.MAX_FORK_DEPTH + self.consensus.lookback()):]
+            kept: Dict[str, int] = {}
+            for block in blocks:
+                for tx in block.transactions:
+                    td = tx.to_dict() if isinstance(tx, Transaction) else tx
+                    for did in self._involved_dids(td):
+                        kept[did] = kept.get(did, 0) + 1
+            pruned_tx_counts = dict(self._pruned_tx_counts)
+            for did, entries in self._did_transactions.items():
+                older = len(entries) - kept.get(did, 0)
+                if older:
+                    pruned_tx_counts[did] = pruned_tx_counts.get(did, 0) + older
+            return {
+                "height": self.last_block.index,
+                "hash": self.last_block.hash,
+                "work": self._cumulative_work[blocks[0].hash],
+                "blocks": [block.to_dict() for block in blocks],
+                "balances": dict(self._balances),
+                "pruned_tx_counts": pruned_tx_counts,
+                "pending_transactions": [tx.to_dict() for tx in self.pending_transactions],
+            }
+
+    def restore(self, snapshot: dict) -> None:
+        """Replace this chain's state with *snapshot* (see ``snapshot``).
+
+        The kept blocks must link up to the tagged tip and hash correctly;
+        blocks after the snapshot are then accepted through ``add_block`` as
+        usual.  Raises ValueError for an inconsistent snapshot.
+        """
+        blocks = [Block.from_dict(b) for b in snapshot["blocks"]]
+        if not blocks or blocks[-1].index != snapshot["height"] or blocks[-1].hash != snapshot["hash"]:
+            raise ValueError("Snapshot blocks do not end at its tagged tip")
+        for block in blocks:
+            if block.hash != block.compute_hash():
+                raise ValueError(f"Snapshot block {block.index} has an invalid hash")
+        for previous, block in zip(blocks, blocks[1:]):
+            if block.previous_hash != previous.hash or block.index != previous.index + 1:
+                raise ValueError(f"Snapshot block {block.index} does not extend its parent")
+        if blocks[0].index == 0 and blocks[0].hash != self.chain[0].hash:
+            raise ValueError("Snapshot was taken on a different genesis block")
+
+        with self._lock:
+            self.chain = blocks
+            self._blocks = {block.hash: block for block in blocks}
+            self._side_blocks = {}
+            self._cumulative_work = {blocks[0].hash: snapshot["work"]}
+            for previous, block in zip(blocks, blocks[1:]):
+                self._cumulative_work[block.hash] = (
+                    self._cumulative_work[previous.hash] + self._block_work(block)
+                )
+            self._balances = dict(snapshot["balances"])
+            self._pruned_tx_counts = dict(snapshot.get("pruned_tx_counts", {}))
+            self._pruned_through = blocks[0].index - 1
+            self._did_transactions = {}
+            self._tx_locations = {}
+            self.index.clear()
+            for block in blocks:
+                self.index.add_block(block)
+                self._index_transactions(block)
+            self.pending_transactions = [
+                Transaction.from_dict(td) for td in snapshot.get("pending_transactions", [])
+            ]
+            self._reindex_pending()
+            self.snapshot_height = snapshot["height"]
+
     def __repr__(self) -> str:
         return f"Blockchain(length={len(self.chain)}, pending={len(self.pending_transactions)})"
@@ -0,0 +1,241 @@
+"""Pluggable consensus engines.
+
+``Blockchain`` delegates sealing new blocks, validating received ones and
+weighing branches (block "work") to a ``ConsensusEngine``:
+
+* ``ProofOfWork`` is a hash search against a numeric target carried in each
+  block.  The target starts at ``Blockchain.DIFFICULTY`` (which may be
+  fractional) and, when a target block interval is configured, is retargeted
+  every ``retarget_every`` blocks from the observed block timestamps.
+* ``ProofOfAuthority`` lets an allow-list of node identities seal blocks by
+  signing them, so producing a block costs one signature instead of a hash
+  search.  Authorities take turns by height; an in-turn block outweighs an
+  out-of-turn one, so a branch follows the rotation whenever the scheduled
+  authority is online, and an authority may not seal again until
+  ``len(authorities) // 2`` other blocks have been added after its last one.
+"""
+import time
+from typing import Callable, Iterable, List, Optional
+
+from .block import Block
+from .crypto import MAX_TARGET, difficulty_to_target, hash_meets_target, target_work
+from .identity import Identity
+
+
+class ConsensusEngine:
+    name = "base"
+
+    def seal_genesis(self, chain, genesis: Block) -> None:
+        """Finalise the deterministic genesis block."""
+        genesis.hash = genesis.compute_hash()
+
+    def seal(self, chain, block: Block,
+             should_stop: Optional[Callable[[], bool]] = None) -> bool:
+        """Seal *block* in place.  Returns False if *should_stop* aborted it."""
+        raise NotImplementedError
+
+    def verify(self, chain, block: Block) -> bool:
+        """True if *block* is correctly sealed for its position in *chain*."""
+        raise NotImplementedError
+
+    def can_seal(self, chain, block: Block) -> bool:
+        """True if this node may seal *block* on its parent now (``seal``
+        would not refuse it)."""
+        return True
+
+    def can_verify(self, chain, block: Block) -> bool:
+        """True if *chain* holds the ancestors ``verify`` needs for *block*.
+        When it does not, ``verify`` rejects the block without that meaning
+        the block is invalid."""
+        return True
+
+    def lookback(self) -> int:
+        """Number of ancestors ``verify`` reads for a block."""
+        return 1
+
+    def block_work(self, chain, block: Block) -> int:
+        """Weight *block* adds to its branch for fork choice."""
+        return 1
+
+    def to_dict(self) -> dict:
+        return {"name": self.name}
+
+
+class ProofOfWork(ConsensusEngine):
+    name = "pow"
+    MAX_FUTURE_DRIFT = 2 * 60 * 60  # seconds a timestamp may run ahead of our clock
+
+    def __init__(self, block_interval: Optional[float] = None, retarget_every: int = 10,
+                 max_adjustment: float = 4.0):
+        if block_interval is not None and block_interval <= 0:
+            raise ValueError("block_interval must be positive")
+        if retarget_every < 2:
+            raise ValueError("retarget_every must be at least 2")
+        if max_adjustment < 1:
+            raise ValueError("max_adjustment must be at least 1")
+        self.block_interval = block_interval  # None keeps the target fixed
+        self.retarget_every = retarget_every
+        self.max_adjustment = max_adjustment
+
+    @property
+    def retargeting(self) -> bool:
+        return self.block_interval is not None
+
+    def expected_target(self, chain, block: Block) -> Optional[int]:
+        """The target the retarget schedule requires for *block*.
+
+        Without a block interval this is simply ``chain.DIFFICULTY``.  With
+        one, blocks inherit their parent's target except at heights that
+        are multiples of ``retarget_every``, where the target is scaled by
+        how long the previous window actually took compared with the
+        configured interval (clamped to ``max_adjustment`` either way).
+        Genesis never takes part in a window, since its timestamp is fixed.
+        Returns None when *chain* lacks the parent or part of the window
+        (an orphan, or a window below a snapshot's oldest kept block).
+        """
+        initial = difficulty_to_target(chain.DIFFICULTY)
+        if not self.retargeting or block.index == 0:
+            return initial
+        parent = chain.get_block(block.previous_hash)
+        if parent is None:
+            return None
+        parent_target = parent.target if parent.target is not None else initial
+        n = self.retarget_every
+        if block.index % n or block.index <= n:
+            return parent_target
+        first = parent
+        for _ in range(n - 1):
+            first = chain.get_block(first.previous_hash)
+            if first is None:
+                return None
+        span = parent.timestamp - first.timestamp
+        ratio = span / ((n - 1) * self.block_interval)
+        ratio = min(self.max_adjustment, max(1 / self.max_adjustment, ratio))
+        # Fixed-point scaling keeps the 256-bit arithmetic exact and identical
+        # on every node
+        scaled = parent_target * round(ratio * 1_000_000) // 1_000_000
+        return max(1, min(MAX_TARGET, scaled))
+
+    def seal_genesis(self, chain, genesis: Block) -> None:
+        genesis.target = difficulty_to_target(chain.DIFFICULTY)
+        key = (chain.DIFFICULTY, genesis.previous_hash)
+        seal = chain._genesis_seal.get(key)
+        if seal is None:
+            seal = chain._proof_of_work(genesis)
+            chain._genesis_seal[key] = seal
+        genesis.nonce, genesis.hash = seal
+
+    def seal(self, chain, block: Block,
+             should_stop: Optional[Callable[[], bool]] = None) -> bool:
+        block.target = self.expected_target(chain, block)
+        if block.target is None:
+            raise ValueError("Cannot seal a block whose retarget window is not on this chain")
+        seal = chain._proof_of_work(block, should_stop=should_stop)
+        if seal is None:
+            return False
+        block.nonce, block.hash = seal
+        return True
+
+    def can_verify(self, chain, block: Block) -> bool:
+        return self.expected_target(chain, block) is not None
+
+    def lookback(self) -> int:
+        return self.retarget_every if self.retargeting else 1
+
+    def verify(self, chain, block: Block) -> bool:
+        expected = self.expected_target(chain, block)
+        if expected is None or block.target is None or block.target != expected:
+            return False
+        if not hash_meets_target(block.hash, block.target):
+            return False
+        if block.hash != block.compute_hash():
+            return False
+        if self.retargeting:
+            parent = chain.get_block(block.previous_hash)
+            if parent is not None and parent.index > 0 and block.timestamp < parent.timestamp:
+                return False
+            if block.timestamp > time.time() + self.MAX_FUTURE_DRIFT:
+                return False
+        return True
+
+    def block_work(self, chain, block: Block) -> int:
+        """Expected number of hashes needed to produce *block*."""
+        target = block.target if block.target is not None else difficulty_to_target(chain.DIFFICULTY)
+        return target_work(target)
+
+    def to_dict(self) -> dict:
+        return {
+            "name": self.name,
+            "block_interval": self.block_interval,
+            "retarget_every": self.retarget_every,
+            "max_adjustment": self.max_adjustment,
+        }
+
+
+class ProofOfAuthority(ConsensusEngine):
+    name = "poa"
+    IN_TURN_WORK = 2
+    OUT_OF_TURN_WORK = 1
+
+    def __init__(self, authorities: Iterable[str], identity: Optional[Identity] = None):
+        self.authorities: List[str] = list(dict.fromkeys(authorities))
+        if not self.authorities:
+            raise ValueError("Proof-of-authority needs at least one authority")
+        self.identity = identity  # local signer; None for a validating-only node
+
+    def in_turn(self, height: int) -> str:
+        """The authority scheduled to seal the block at *height*."""
+        return self.authorities[height % len(self.authorities)]
+
+    def _signed_recently(self, chain, parent_hash: str, signer: str) -> bool:
+        limit = len(self.authorities) // 2
+        block = chain.get_block(parent_hash)
+        for _ in range(limit):
+            if block is None or block.index == 0:
+                break
+            if block.signer == signer:
+                return True
+            block = chain.get_block(block.previous_hash)
+        return False
+
+    def lookback(self) -> int:
+        return max(1, len(self.authorities) // 2)
+
+    def can_seal(self, chain, block: Block) -> bool:
+        return (
+            self.identity is not None
+            and self.identity.did in self.authorities
+            and not self._signed_recently(chain, block.previous_hash, self.identity.did)
+        )
+
+    def seal(self, chain, block: Block,
+             should_stop: Optional[Callable[[], bool]] = None) -> bool:
+        if self.identity is None or self.identity.did not in self.authorities:
+            raise ValueError("This node is not a block-sealing authority")
+        if self._signed_recently(chain, block.previous_hash, self.identity.did):
+            raise ValueError("This authority sealed a recent block; waiting for the others")
+        block.signer = self.identity.did
+        block.hash = block.compute_hash()
+        block.signature = self.identity.sign(block.hash.encode())
+        return True
+
+    def verify(self, chain, block: Block) -> bool:
+        if block.signer not in self.authorities or not block.signature:
+            return False
+        if block.hash != block.compute_hash():
+            return False
+        if not Identity.verify_did_signature(block.signer, block.hash.encode(), block.signature):
+            return False
+        return not self._signed_recently(chain, block.previous_hash, block.signer)
+
+    def block_work(self, chain, block: Block) -> int:
+        if block.index == 0:
+            return self.IN_TURN_WORK
+        return self.IN_TURN_WORK if block.signer == self.in_turn(block.index) else self.OUT_OF_TURN_WORK
+
+    def to_dict(self) -> dict:
+        return {
+            "name": self.name,
+            "authorities": list(self.authorities),
+            "signer": self.identity.did if self.identity else None,
+        }
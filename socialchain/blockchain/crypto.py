@@ -8,7 +8,7 @@ import hashlib
 import hmac
 import json
 import math
-from typing import List, Optional
+from typing import List, Optional, Sequence
 
 
 # ---------------------------------------------------------------------------
@@ -101,6 +101,38 @@ def hash_meets_difficulty(hash_hex: str, difficulty: int) -> bool:
     return hash_hex.startswith("0" * difficulty)
 
 
+MAX_TARGET = (1 << 256) - 1
+
+
+def difficulty_to_target(difficulty: float) -> int:
+    """Numeric target for a (possibly fractional) difficulty.
+
+    A hash meets the target when its integer value is below it.  Difficulty
+    *d* corresponds to *d* leading zero hex digits, so integral difficulties
+    are exactly equivalent to ``hash_meets_difficulty``.
+    """
+    if difficulty < 0:
+        raise ValueError("difficulty must be non-negative")
+    if float(difficulty).is_integer():
+        return min(MAX_TARGET, (1 << 256) >> (4 * int(difficulty)))
+    return max(1, min(MAX_TARGET, int(2 ** 256 / 16 ** difficulty)))
+
+
+def target_to_difficulty(target: int) -> float:
+    """Inverse of ``difficulty_to_target`` (leading hex zeros, fractional)."""
+    return math.log(2 ** 256 / max(1, target), 16)
+
+
+def hash_meets_target(hash_hex: str, target: int) -> bool:
+    """Check whether the integer value of *hash_hex* is below *target*."""
+    return int(hash_hex, 16) < target
+
+
+def target_work(target: int) -> int:
+    """Expected number of hashes needed to find a hash below *target*."""
+    return (1 << 256) // max(1, target)
+
+
 # ---------------------------------------------------------------------------
 # Simple math helpers used in trust / reputation (non-visible background)
 # ---------------------------------------------------------------------------
@@ -124,3 +156,13 @@ def weighted_average(values: List[float], weights: List[float]) -> float:
     if total_weight == 0:
         return 0.0
     return sum(v * w for v, w in zip(values, weights)) / total_weight
+
+
+def percentile(values: Sequence[float], q: float) -> Optional[float]:
+    """Nearest-rank percentile of *values* (``q`` in 0..100), or None when
+    there are none."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = min(len(ordered), max(1, math.ceil(q / 100 * len(ordered))))
+    return ordered[rank - 1]
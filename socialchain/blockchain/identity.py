@@ -1,5 +1,5 @@
 import hashlib
-from typing import Tuple
+from typing import Optional, Tuple
 
 from cryptography.hazmat.primitives.asymmetric import ec
 from cryptography.hazmat.primitives.asymmetric.utils import (
@@ -20,6 +20,22 @@ class Identity:
         self._public_key = self._private_key.public_key()
         self.did = self._compute_did()
 
+    @classmethod
+    def from_pem(cls, pem: bytes, password: Optional[bytes] = None) -> "Identity":
+        """Load a persistent identity from a PEM-encoded private key."""
+        key = serialization.load_pem_private_key(pem, password=password, backend=default_backend())
+        if not isinstance(key, ec.EllipticCurvePrivateKey):
+            raise ValueError("Identity keys must be elliptic-curve keys")
+        return cls(private_key=key)
+
+    def to_pem(self) -> bytes:
+        """Serialise the private key (unencrypted PKCS#8 PEM)."""
+        return self._private_key.private_bytes(
+            encoding=serialization.Encoding.PEM,
+            format=serialization.PrivateFormat.PKCS8,
+            encryption_algorithm=serialization.NoEncryption(),
+        )
+
     def _compute_did(self) -> str:
         pub_bytes = self._public_key.public_bytes(
             encoding=serialization.Encoding.X962,
@@ -40,6 +56,22 @@ class Identity:
         except (InvalidSignature, ValueError):
             return False
 
+    @staticmethod
+    def verify_did_signature(did: str, message: bytes, signature_hex: str) -> bool:
+        """Verify *signature_hex* over *message* against the public key
+        embedded in a ``did:socialchain:<pubkey>`` identifier."""
+        try:
+            method, _, pub_hex = did.rpartition(":")
+            if method != "did:socialchain":
+                return False
+            public_key = ec.EllipticCurvePublicKey.from_encoded_point(
+                ec.SECP256K1(), bytes.fromhex(pub_hex)
+            )
+            public_key.verify(bytes.fromhex(signature_hex), message, ec.ECDSA(hashes.SHA256()))
+            return True
+        except (InvalidSignature, ValueError, TypeError):
+            return False
+
     def public_key_hex(self) -> str:
         pub_bytes = self._public_key.public_bytes(
             encoding=serialization.Encoding.X962,
@@ -0,0 +1,187 @@
+"""Secondary indexes over mined transactions.
+
+``TransactionIndex`` keeps every main-chain transaction in chain order in a
+log and, for each indexed field value, a posting list of log positions:
+
+* ``tx_type``, ``kind`` (``data["type"]``, else ``tx_type``), ``sender`` and
+  ``recipient``;
+* the ``data`` keys in ``DATA_FIELDS`` (contract, proposal, community and
+  agent IDs), compared as strings.
+
+A sorted ``(timestamp, position)`` list answers time ranges; pruned entries
+are dropped from it lazily, in one pass once they make up half of it.  The chain
+updates the index as blocks are connected, disconnected by a reorganisation
+or pruned, so it always mirrors the main chain.
+
+Queries return matches in chain order, at most ``limit`` at a time, plus a
+cursor (the position of the last match) from which the next page resumes:
+
+    entries, cursor = chain.index.query({"contract_id": cid}, limit=50)
+    more, cursor = chain.index.query({"contract_id": cid}, cursor=cursor)
+
+The shortest matching posting list drives the scan; the other filters are
+checked against their lists by binary search.
+"""
+import heapq
+from bisect import bisect_left, bisect_right, insort
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from .block import Block
+from .transaction import Transaction
+
+Entry = Tuple[Transaction, int]  # (transaction, block height)
+
+
+class TransactionIndex:
+    DATA_FIELDS = ("contract_id", "proposal_id", "community_id", "agent_did")
+    BASE_FIELDS = ("tx_type", "kind", "sender", "recipient")
+
+    def __init__(self, data_fields: Optional[Iterable[str]] = None):
+        self.data_fields = tuple(self.DATA_FIELDS if data_fields is None else data_fields)
+        self.fields = self.BASE_FIELDS + self.data_fields
+        self.clear()
+
+    def clear(self) -> None:
+        self._log: List[Tuple[Transaction, int, float]] = []
+        self._base = 0  # position of _log[0]; earlier entries were pruned
+        self._postings: Dict[Tuple[str, str], List[int]] = {}
+        self._times: List[Tuple[float, int]] = []
+        self._stale_times = 0  # pruned entries still in _times
+
+    def __len__(self) -> int:
+        return len(self._log)
+
+    def _keys(self, td: dict) -> List[Tuple[str, str]]:
+        data = td.get("data") if isinstance(td.get("data"), dict) else {}
+        keys = [
+            ("tx_type", str(td.get("tx_type"))),
+            ("kind", str(data.get("type") or td.get("tx_type"))),
+            ("sender", str(td.get("sender"))),
+            ("recipient", str(td.get("recipient"))),
+        ]
+        for field in self.data_fields:
+            if data.get(field) is not None:
+                keys.append((field, str(data[field])))
+        return keys
+
+    # ------------------------------------------------------------------
+    # Maintenance
+    # ------------------------------------------------------------------
+
+    def add(self, tx: Transaction, height: int) -> None:
+        """Append *tx*, mined at *height*, to the end of the index."""
+        td = tx.to_dict() if isinstance(tx, Transaction) else tx
+        position = self._base + len(self._log)
+        timestamp = td.get("timestamp") or 0.0
+        self._log.append((tx, height, timestamp))
+        for key in self._keys(td):
+            self._postings.setdefault(key, []).append(position)
+        insort(self._times, (timestamp, position))
+
+    def add_block(self, block: Block) -> None:
+        for tx in block.transactions:
+            self.add(tx, block.index)
+
+    def remove_block(self, block: Block) -> None:
+        """Remove *block*, which must be the last one added."""
+        for _ in block.transactions:
+            position = self._base + len(self._log) - 1
+            tx, _height, timestamp = self._log.pop()
+            td = tx.to_dict() if isinstance(tx, Transaction) else tx
+            for key in self._keys(td):
+                entries = self._postings[key]
+                entries.pop()
+                if not entries:
+                    del self._postings[key]
+            self._times.pop(bisect_left(self._times, (timestamp, position)))
+
+    def prune_through(self, height: int) -> int:
+        """Drop entries mined at or below *height*.  Returns how many."""
+        count = 0
+        while count < len(self._log) and self._log[count][1] <= height:
+            count += 1
+        dropped: Dict[Tuple[str, str], int] = {}
+        for tx, _height, _timestamp in self._log[:count]:
+            td = tx.to_dict() if isinstance(tx, Transaction) else tx
+            for key in self._keys(td):
+                dropped[key] = dropped.get(key, 0) + 1
+        # Postings are in chain order, so the dropped positions lead each list
+        for key, n in dropped.items():
+            entries = self._postings[key]
+            del entries[:n]
+            if not entries:
+                del self._postings[key]
+        del self._log[:count]
+        self._base += count
+        # Time-range scans skip positions below _base, so stale entries can
+        # wait for a compaction instead of being popped one at a time
+        self._stale_times += count
+        if self._stale_times * 2 > len(self._times):
+            self._times = [entry for entry in self._times if entry[1] >= self._base]
+            self._stale_times = 0
+        return count
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+
+    def count(self, field: str, value) -> int:
+        return len(self._postings.get((field, str(value)), ()))
+
+    def _candidates(self, filters: Dict[str, str], start: int,
+                    since: Optional[float], until: Optional[float],
+                    limit: Optional[int]) -> Iterator[int]:
+        if filters:
+            lists = [self._postings.get((f, str(v)), []) for f, v in filters.items()]
+            driver = min(lists, key=len)
+            others = [entries for entries in lists if entries is not driver]
+            for position in driver[bisect_left(driver, start):]:
+                if all(self._contains(entries, position) for entries in others):
+                    yield position
+        elif since is not None or until is not None:
+            lo = 0 if since is None else bisect_left(self._times, (since, -1))
+            hi = len(self._times) if until is None else bisect_right(self._times, (until, float("inf")))
+            end = self._base + len(self._log)
+            if hi - lo >= end - start:
+                # The range is no smaller than the rest of the log: walk the
+                # log in order and let ``query`` check timestamps
+                yield from range(start, end)
+                return
+            positions = (p for _, p in self._times[lo:hi] if p >= start)
+            # One more than a page tells ``query`` whether another follows
+            yield from sorted(positions) if limit is None else heapq.nsmallest(limit + 1, positions)
+        else:
+            yield from range(start, self._base + len(self._log))
+
+    @staticmethod
+    def _contains(entries: List[int], position: int) -> bool:
+        i = bisect_left(entries, position)
+        return i < len(entries) and entries[i] == position
+
+    def query(self, filters: Optional[Dict[str, str]] = None,
+              since: Optional[float] = None, until: Optional[float] = None,
+              cursor: Optional[int] = None,
+              limit: Optional[int] = 100) -> Tuple[List[Entry], Optional[int]]:
+        """Mined transactions matching every field filter and the timestamp
+        range ``[since, until]``, in chain order after *cursor*.
+
+        Returns the entries (``(transaction, height)``) and the cursor of
+        the next page, or None when there are no more matches.  Raises
+        ValueError for a field that is not indexed.
+        """
+        filters = dict(filters or {})
+        for field in filters:
+            if field not in self.fields:
+                raise ValueError(f"Field is not indexed: {field}")
+        start = self._base if cursor is None else max(cursor + 1, self._base)
+        entries: List[Entry] = []
+        last = None
+        for position in self._candidates(filters, start, since, until, limit):
+            tx, height, timestamp = self._log[position - self._base]
+            if (since is not None and timestamp < since) or (until is not None and timestamp > until):
+                continue
+            if limit is not None and len(entries) == limit:
+                return entries, last
+            entries.append((tx, height))
+            last = position
+        return entries, None
@@ -0,0 +1,49 @@
+"""Process-wide interning of DIDs to dense integer ids.
+
+A DID (``did:socialchain:<66 hex>``) is an ~80 character string, and every
+request that mentions one decodes a fresh copy.  Graph structures that hold
+millions of references (trust edges, vouches, votes, connections) store the
+integer id from ``DIDS`` instead, so each DID is kept once, and convert back
+to strings only at their API boundary.
+
+Ids are assigned in first-seen order and never reused: identities are
+permanent, so the table only grows.
+"""
+import threading
+from typing import Dict, List, Optional
+
+
+class DIDInterner:
+    def __init__(self):
+        self._ids: Dict[str, int] = {}
+        self._dids: List[str] = []
+        self._lock = threading.Lock()
+
+    def intern(self, did: str) -> int:
+        """The id of *did*, assigning the next one if it is new."""
+        did_id = self._ids.get(did)
+        if did_id is None:
+            with self._lock:
+                did_id = self._ids.get(did)
+                if did_id is None:
+                    did_id = len(self._dids)
+                    self._dids.append(did)
+                    self._ids[did] = did_id
+        return did_id
+
+    def get(self, did: str) -> Optional[int]:
+        """The id of *did*, or None if it was never interned (lookups do
+        not grow the table)."""
+        return self._ids.get(did)
+
+    def did(self, did_id: int) -> str:
+        return self._dids[did_id]
+
+    def __contains__(self, did: str) -> bool:
+        return did in self._ids
+
+    def __len__(self) -> int:
+        return len(self._dids)
+
+
+DIDS = DIDInterner()  # shared by every graph structure in the process
@@ -0,0 +1,217 @@
+"""Transaction lanes: per-category sub-chains sealed independently.
+
+Without lanes every transaction waits in one pending pool for the next
+block, so a flood of agent telemetry delays governance votes and contract
+confirmations queued behind it.  A ``LaneSet`` attached to the root chain
+routes each transaction category to its own ``LaneChain`` with its own
+pending pool, block template and tip:
+
+    lanes = LaneSet(blockchain)          # blockchain.add_transaction now routes
+    lanes.seal(mining, miner_did)        # mine every busy lane in parallel
+    lanes.commit(mining, miner_did)      # root block committing to lane tips
+
+Transactions outside every lane (transfers, rewards) stay on the root chain.
+Whenever a lane's tip moves, a ``lane_commit`` transaction listing every
+lane's height and tip hash is queued on the root chain; it coalesces with
+the previous unmined one, so each root block carries a single commitment to
+the latest lane tips.  Lane blocks carry no mining reward; the root block
+does.
+
+Each lane's genesis block commits to the lane name, so a block is only
+accepted by the chain it was sealed for.  Lane blocks travel like root
+blocks: they are announced through ``POST /api/blocks?lane=<name>`` and
+pulled by ``NetworkNode.sync_chain`` from ``GET /api/chain/lanes/<name>``.
+Snapshots carry every lane (see
+``LaneSet.snapshot``), checked against the root chain's last commitment.
+"""
+from typing import Dict, FrozenSet, Iterable, List, Optional
+
+from .block import Block
+from .blockchain import Blockchain
+from .consensus import ConsensusEngine
+from .crypto import sha256
+from .mining import MiningJobManager
+from .transaction import Transaction, TransactionType
+
+# Lane name -> transaction kinds (``data["type"]``, else ``tx_type``)
+DEFAULT_LANES: Dict[str, FrozenSet[str]] = {
+    "social": frozenset({
+        TransactionType.REGISTRATION, TransactionType.PROFILE_UPDATE,
+        TransactionType.CONNECTION,
+    }),
+    "governance": frozenset({
+        TransactionType.GOVERNANCE, "community_create", "governance_vote",
+        "proposal_resolved", "vouch_accepted",
+    }),
+    "contracts": frozenset({
+        TransactionType.CONTRACT_DEPLOY, TransactionType.CONTRACT_EXEC,
+        "contract_create", "contract_complete", "contract_verify",
+    }),
+    "agents": frozenset({
+        TransactionType.AGENT_REGISTRATION, TransactionType.AGENT_TASK,
+        TransactionType.AGENT_STATUS, TransactionType.AGENT_ACTION,
+        "status_update", "device_registration",
+    }),
+}
+
+
+class LaneChain(Blockchain):
+    """The sub-chain of one lane.  Its blocks hold no mining reward."""
+
+    def __init__(self, name: str, kinds: Iterable[str],
+                 consensus: Optional[ConsensusEngine] = None,
+                 retention: Optional[int] = None, difficulty: Optional[float] = None,
+                 max_fork_depth: Optional[int] = None):
+        self.name = name
+        self.kinds = frozenset(kinds)
+        if difficulty is not None:
+            self.DIFFICULTY = difficulty
+        if max_fork_depth is not None:
+            self.MAX_FORK_DEPTH = max_fork_depth
+        super().__init__(consensus=consensus, retention=retention)
+
+    def _genesis_parent(self) -> str:
+        # Commits the lane name to the genesis block, so each lane (and the
+        # root chain) rejects the blocks of every other
+        return sha256(f"lane:{self.name}")
+
+    def _reward_transaction(self, miner_did: str) -> Optional[Transaction]:
+        return None
+
+    def to_dict(self, since: int = 0) -> dict:
+        return {"lane": self.name, **super().to_dict(since)}
+
+    def __repr__(self) -> str:
+        return f"LaneChain(name={self.name}, length={len(self.chain)})"
+
+
+class LaneSet:
+    def __init__(self, root: Blockchain, lanes: Optional[Dict[str, Iterable[str]]] = None):
+        if root.lanes is not None:
+            raise ValueError("Chain already has lanes")
+        self.root = root
+        self.lanes: Dict[str, LaneChain] = {}
+        self._routes: Dict[str, LaneChain] = {}  # transaction kind -> lane
+        for name, kinds in (DEFAULT_LANES if lanes is None else lanes).items():
+            lane = LaneChain(name, kinds, consensus=root.consensus,
+                             retention=root.retention, difficulty=root.DIFFICULTY,
+                             max_fork_depth=root.MAX_FORK_DEPTH)
+            for kind in lane.kinds:
+                if kind in self._routes:
+                    raise ValueError(f"Transaction kind {kind!r} is in more than one lane")
+                self._routes[kind] = lane
+            lane.add_tip_listener(self._on_lane_tip)
+            self.lanes[name] = lane
+        root.lanes = self
+
+    def chains(self) -> List[LaneChain]:
+        return list(self.lanes.values())
+
+    def get(self, name: str) -> Optional[LaneChain]:
+        return self.lanes.get(name)
+
+    def route(self, transaction: Transaction) -> Optional[LaneChain]:
+        """The lane carrying *transaction*, or None for the root chain."""
+        return self._routes.get(self.root.transaction_kind(transaction))
+
+    def tips(self) -> Dict[str, dict]:
+        return {
+            name: {"height": lane.last_block.index, "hash": lane.last_block.hash}
+            for name, lane in self.lanes.items()
+        }
+
+    def commit_transaction(self) -> Transaction:
+        """A ``lane_commit`` transaction for the current lane tips."""
+        return Transaction(
+            sender="NETWORK",
+            recipient="NETWORK",
+            data={"type": TransactionType.LANE_COMMIT, "lanes": self.tips()},
+            tx_type=TransactionType.LANE_COMMIT,
+        )
+
+    def _on_lane_tip(self, tip: Block) -> None:
+        # Built under the root lock so that, of two lanes sealing at once,
+        # the commitment queued last also reads both new tips
+        with self.root._lock:
+            self.root.add_transaction(self.commit_transaction())
+
+    def last_commit(self) -> Optional[dict]:
+        """Lane tips committed by the newest root block that has a
+        ``lane_commit`` transaction, with that block's height, or None."""
+        for block in reversed(self.root.chain):
+            if block.pruned:
+                break
+            for tx in reversed(block.transactions):
+                if tx.tx_type == TransactionType.LANE_COMMIT:
+                    return {"root_height": block.index, "lanes": tx.data.get("lanes", {})}
+        return None
+
+    def seal(self, mining: MiningJobManager, miner_did: str,
+             names: Optional[Iterable[str]] = None,
+             timeout: Optional[float] = None) -> Dict[str, Block]:
+        """Mine one block on each lane (of *names*, default all) that has
+        pending transactions, as concurrent jobs.  Returns the blocks of the
+        jobs that completed, by lane name."""
+        selected = self.lanes if names is None else {n: self.lanes[n] for n in names}
+        jobs = {
+            name: mining.submit(lane, miner_did)
+            for name, lane in selected.items() if lane.pending_transactions
+        }
+        for job in jobs.values():
+            job.wait(timeout)
+        return {name: job.block for name, job in jobs.items() if job.block is not None}
+
+    def commit(self, mining: MiningJobManager, miner_did: str,
+               timeout: Optional[float] = None) -> Optional[Block]:
+        """Mine a root block if a lane commitment is pending."""
+        if not any(tx.tx_type == TransactionType.LANE_COMMIT
+                   for tx in list(self.root.pending_transactions)):
+            return None
+        job = mining.submit(self.root, miner_did)
+        job.wait(timeout)
+        return job.block
+
+    def snapshot(self) -> Dict[str, dict]:
+        """Each lane's ``Blockchain.snapshot``, by name."""
+        return {name: lane.snapshot() for name, lane in self.lanes.items()}
+
+    def check_snapshot(self, root_snapshot: dict, lane_snapshots: Dict[str, dict]) -> None:
+        """Raise ValueError unless *lane_snapshots* has exactly our lanes and
+        holds every lane tip committed by the last ``lane_commit`` among
+        *root_snapshot*'s blocks."""
+        if set(lane_snapshots) != set(self.lanes):
+            raise ValueError(f"Snapshot lanes {sorted(lane_snapshots)} do not match "
+                             f"this node's lanes {sorted(self.lanes)}")
+        committed = None
+        for block in root_snapshot["blocks"]:
+            for td in block.get("transactions", []):
+                if td.get("tx_type") == TransactionType.LANE_COMMIT:
+                    committed = td["data"].get("lanes", {})
+        for name, tip in (committed or {}).items():
+            lane = lane_snapshots.get(name)
+            hashes = {b["index"]: b["hash"] for b in lane["blocks"]} if lane else {}
+            if lane is None or tip["height"] > lane["height"] or (
+                    tip["height"] in hashes and hashes[tip["height"]] != tip["hash"]):
+                raise ValueError(f"Snapshot lane {name!r} does not hold its committed tip")
+
+    def restore(self, lane_snapshots: Dict[str, dict]) -> None:
+        """Restore every lane from *lane_snapshots* (see ``snapshot``)."""
+        for name, lane in self.lanes.items():
+            lane.restore(lane_snapshots[name])
+
+    def to_dict(self) -> dict:
+        return {
+            "lanes": [
+                {
+                    "name": name,
+                    "kinds": sorted(lane.kinds),
+                    "height": lane.last_block.index,
+                    "tip": lane.last_block.hash,
+                    "pending": len(lane.pending_transactions),
+                    "coalesced": lane.coalesced,
+                }
+                for name, lane in self.lanes.items()
+            ],
+            "root_height": self.root.last_block.index,
+            "committed": self.last_commit(),
+        }
@@ -0,0 +1,183 @@
+"""Background mining jobs.
+
+A job snapshots a block template from the pending pool and seals it with the
+chain's consensus engine (e.g. a proof-of-work search) on its own thread, so
+callers (e.g. ``POST /api/mine``) return immediately with a job ID.  Jobs are cancelled on request, and automatically
+when the chain tip moves underneath them (a competing block arrived through
+``add_block`` or sync), since their template would only produce a side block.
+"""
+import threading
+import time
+import uuid
+from enum import Enum
+from typing import Callable, Dict, List, Optional
+
+from .block import Block
+
+
+class JobStatus(str, Enum):
+    QUEUED = "QUEUED"
+    RUNNING = "RUNNING"
+    COMPLETED = "COMPLETED"
+    CANCELLED = "CANCELLED"
+    FAILED = "FAILED"
+
+
+class MiningJob:
+    def __init__(self, blockchain, miner_did: str, template: Block):
+        self.job_id = str(uuid.uuid4())
+        self.blockchain = blockchain
+        self.miner_did = miner_did
+        self.template = template
+        self.status = JobStatus.QUEUED
+        self.created_at = time.time()
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self.block: Optional[Block] = None
+        self.error: Optional[str] = None
+        self.cancel_reason: Optional[str] = None
+        self._cancel = threading.Event()
+        self._done = threading.Event()
+
+    @property
+    def finished(self) -> bool:
+        return self._done.is_set()
+
+    def cancel(self, reason: str = "cancelled by request") -> bool:
+        """Ask the job to stop.  Returns False if it already finished."""
+        if self.finished:
+            return False
+        self.cancel_reason = reason
+        self._cancel.set()
+        return True
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        return self._done.wait(timeout)
+
+    def fail(self, error: str) -> None:
+        """Finish the job as FAILED without running it."""
+        self.error = error
+        self.status = JobStatus.FAILED
+        self.finished_at = time.time()
+        self._done.set()
+
+    def run(self) -> None:
+        self.status = JobStatus.RUNNING
+        self.started_at = time.time()
+        try:
+            sealed = self.blockchain.seal_block(self.template, should_stop=self._cancel.is_set)
+            if not sealed or self._cancel.is_set():
+                self.status = JobStatus.CANCELLED
+                return
+            if not self.blockchain.add_block(self.template):
+                # e.g. the template went stale between sealing and adding
+                self.error = "Sealed block was rejected by the chain"
+                self.status = JobStatus.FAILED
+                return
+            self.block = self.template
+            self.status = JobStatus.COMPLETED
+        except Exception as e:
+            self.error = str(e)
+            self.status = JobStatus.FAILED
+        finally:
+            self.finished_at = time.time()
+            self._done.set()
+
+    def progress(self) -> dict:
+        """Hashes tried so far, hash rate and the expected total for the
+        chain's difficulty."""
+        hashes = self.template.nonce + 1 if self.started_at else 0
+        elapsed = ((self.finished_at or time.time()) - self.started_at) if self.started_at else 0.0
+        return {
+            "hashes": hashes,
+            "elapsed": elapsed,
+            "hash_rate": hashes / elapsed if elapsed else 0.0,
+            "expected_hashes": self.blockchain._block_work(self.template),
+        }
+
+    def to_dict(self) -> dict:
+        return {
+            "job_id": self.job_id,
+            "miner_did": self.miner_did,
+            "status": self.status.value,
+            "index": self.template.index,
+            "previous_hash": self.template.previous_hash,
+            "tx_count": len(self.template.transactions),
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "progress": self.progress(),
+            "block": self.block.to_dict() if self.block else None,
+            "on_main_chain": self.blockchain.is_on_main_chain(self.block) if self.block else None,
+            "cancel_reason": self.cancel_reason,
+            "error": self.error,
+        }
+
+    def __repr__(self) -> str:
+        return f"MiningJob(id={self.job_id[:8]}, status={self.status.value}, index={self.template.index})"
+
+
+class MiningJobManager:
+    """Runs mining jobs on background threads and keeps recent history."""
+
+    MAX_HISTORY = 100  # finished jobs kept for status queries
+
+    def __init__(self):
+        self._jobs: Dict[str, MiningJob] = {}
+        self._lock = threading.Lock()
+        self._listeners: Dict[int, Callable[[Block], None]] = {}  # id(chain) -> listener
+
+    def submit(self, blockchain, miner_did: str) -> MiningJob:
+        """Snapshot a block template from *blockchain* and start mining it.
+        The job fails at once, without a thread, if the consensus engine
+        will not let this node seal on the current tip."""
+        self._watch(blockchain)
+        job = MiningJob(blockchain, miner_did, blockchain.create_block_template(miner_did))
+        with self._lock:
+            self._jobs[job.job_id] = job
+            self._trim_history()
+        if not blockchain.consensus.can_seal(blockchain, job.template):
+            job.fail("This node cannot seal a block on the current tip yet")
+            return job
+        threading.Thread(target=job.run, name=f"mining-{job.job_id[:8]}", daemon=True).start()
+        return job
+
+    def get(self, job_id: str) -> Optional[MiningJob]:
+        return self._jobs.get(job_id)
+
+    def list(self) -> List[MiningJob]:
+        return sorted(list(self._jobs.values()), key=lambda job: job.created_at, reverse=True)
+
+    def active(self) -> List[MiningJob]:
+        return [job for job in list(self._jobs.values()) if not job.finished]
+
+    def cancel(self, job_id: str, reason: str = "cancelled by request") -> bool:
+        job = self._jobs.get(job_id)
+        return job is not None and job.cancel(reason)
+
+    def _watch(self, blockchain) -> None:
+        key = id(blockchain)
+        if key not in self._listeners:
+            self._listeners[key] = lambda tip: self._on_tip_change(blockchain, tip)
+            blockchain.add_tip_listener(self._listeners[key])
+
+    def _on_tip_change(self, blockchain, tip: Block) -> None:
+        """Cancel *blockchain*'s jobs whose template no longer extends the tip."""
+        for job in self.active():
+            if job.blockchain is not blockchain:
+                continue
+            if job.template.previous_hash != tip.hash and job.template.hash != tip.hash:
+                job.cancel(f"stale template: chain tip moved to block {tip.index}")
+
+    def _trim_history(self) -> None:
+        finished = sorted(
+            (job for job in self._jobs.values() if job.finished), key=lambda job: job.created_at
+        )
+        for job in finished[:max(0, len(finished) - self.MAX_HISTORY)]:
+            del self._jobs[job.job_id]
+
+    def to_dict(self) -> dict:
+        return {
+            "active": len(self.active()),
+            "jobs": [job.to_dict() for job in self.list()],
+        }
@@ -0,0 +1,274 @@
+"""Automatic block production.
+
+``BlockScheduler`` mines a block as soon as any configured trigger fires:
+
+* ``interval``: the oldest pending transaction has waited this many seconds;
+* ``max_pending``: the pending pool holds at least this many transactions;
+* ``max_pending_bytes``: the pool's serialised size reaches this many bytes.
+
+Triggers can be combined ("whichever comes first").  The scheduler sleeps
+while the pool is empty, mines through a ``MiningJobManager`` one block at a
+time, and records how long each transaction waited from arrival to
+confirmation on the main chain.  When the consensus engine will not let this
+node seal on the current tip (a proof-of-authority signer's cool-down), it
+waits for the tip to change; after a failed job it backs off exponentially.
+"""
+import json
+import logging
+import threading
+import time
+from collections import deque
+from typing import Callable, Deque, Dict, Optional
+
+from .block import Block
+from .crypto import percentile
+from .mining import JobStatus, MiningJobManager
+from .transaction import Transaction
+
+logger = logging.getLogger(__name__)
+
+
+def _tx_size(tx: Transaction) -> int:
+    return len(json.dumps(tx.to_dict(), sort_keys=True))
+
+
+class BlockScheduler:
+    LATENCY_WINDOW = 1000  # confirmations kept for latency percentiles
+    RETRY_DELAY = 0.5  # seconds before retrying after a failed job, doubled
+    MAX_RETRY_DELAY = 30.0  # per consecutive failure up to this
+
+    def __init__(self, blockchain, mining: MiningJobManager, miner_did: str,
+                 interval: Optional[float] = None, max_pending: Optional[int] = None,
+                 max_pending_bytes: Optional[int] = None,
+                 on_block: Optional[Callable[[Block], object]] = None):
+        self.blockchain = blockchain
+        self.mining = mining
+        self.miner_did = miner_did
+        self.on_block = on_block
+        self.configure(interval=interval, max_pending=max_pending,
+                       max_pending_bytes=max_pending_bytes)
+
+        self._arrivals: Dict[str, float] = {}  # tx_id -> monotonic arrival time
+        self._sizes: Dict[str, int] = {}  # tx_id -> serialised size
+        self._latencies: Deque[float] = deque(maxlen=self.LATENCY_WINDOW)
+        self.confirmed = 0
+        self.blocks_produced = 0
+        self.triggers: Dict[str, int] = {"interval": 0, "count": 0, "bytes": 0}
+        self.last_trigger: Optional[str] = None
+        self.failures = 0  # consecutive failed jobs
+        self._retry_at = 0.0  # monotonic time before which no job starts
+        self._blocked_tip: Optional[str] = None  # tip we may not seal on
+
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def configure(self, interval: Optional[float] = None, max_pending: Optional[int] = None,
+                  max_pending_bytes: Optional[int] = None) -> None:
+        for name, value in (("interval", interval), ("max_pending", max_pending),
+                            ("max_pending_bytes", max_pending_bytes)):
+            if value is not None and value <= 0:
+                raise ValueError(f"{name} must be positive")
+        self.interval = interval
+        self.max_pending = max_pending
+        self.max_pending_bytes = max_pending_bytes
+        if hasattr(self, "_wake"):
+            self._wake.set()  # re-evaluate deadlines under the new settings
+
+    @property
+    def enabled(self) -> bool:
+        return any(v is not None for v in (self.interval, self.max_pending, self.max_pending_bytes))
+
+    # ------------------------------------------------------------------
+    # Pending-pool bookkeeping
+    # ------------------------------------------------------------------
+
+    def _on_transaction(self, tx: Transaction) -> None:
+        self._arrivals.setdefault(tx.tx_id, time.monotonic())
+        if self.max_pending_bytes is not None:
+            self._sizes[tx.tx_id] = _tx_size(tx)
+        self._wake.set()  # starts the interval clock when we were idle
+
+    def _on_tip_change(self, tip: Block) -> None:
+        now = time.monotonic()
+        for tx in tip.transactions:
+            arrived = self._arrivals.pop(tx.tx_id, None)
+            if arrived is not None:
+                self._latencies.append(now - arrived)
+                self.confirmed += 1
+        # Forget anything else that left the pool (e.g. mined by the other
+        # blocks of a reorg)
+        pending = {tx.tx_id for tx in list(self.blockchain.pending_transactions)}
+        self._arrivals = {k: v for k, v in self._arrivals.items() if k in pending}
+        self._sizes = {k: v for k, v in self._sizes.items() if k in pending}
+        self._wake.set()
+
+    def _arrival(self, tx: Transaction) -> float:
+        arrived = self._arrivals.get(tx.tx_id)
+        if arrived is None:
+            # Pending before we were watching (or returned by a reorg)
+            arrived = time.monotonic() - max(0.0, time.time() - tx.timestamp)
+            self._arrivals[tx.tx_id] = arrived
+        return arrived
+
+    def pending_bytes(self) -> int:
+        total = 0
+        for tx in list(self.blockchain.pending_transactions):
+            size = self._sizes.get(tx.tx_id)
+            if size is None:
+                size = self._sizes[tx.tx_id] = _tx_size(tx)
+            total += size
+        return total
+
+    def _oldest_wait(self) -> Optional[float]:
+        pending = list(self.blockchain.pending_transactions)
+        if not pending:
+            return None
+        return time.monotonic() - min(self._arrival(tx) for tx in pending)
+
+    def due(self) -> Optional[str]:
+        """Name of the trigger that fires now, or None."""
+        pending = self.blockchain.pending_transactions
+        if not pending:
+            return None
+        if self.max_pending is not None and len(pending) >= self.max_pending:
+            return "count"
+        if self.max_pending_bytes is not None and self.pending_bytes() >= self.max_pending_bytes:
+            return "bytes"
+        if self.interval is not None and self._oldest_wait() >= self.interval:
+            return "interval"
+        return None
+
+    def _sleep_time(self) -> Optional[float]:
+        """Seconds until the interval trigger fires or a back-off ends; None
+        while idle, while waiting for the tip to change, or when only size
+        triggers are configured (which wake us directly)."""
+        if self._blocked_tip == self.blockchain.last_block.hash:
+            return None
+        backoff = self._retry_at - time.monotonic()
+        if backoff > 0:
+            return backoff
+        if self.interval is None:
+            return None
+        oldest = self._oldest_wait()
+        if oldest is None:
+            return None
+        return max(0.0, self.interval - oldest)
+
+    def _ready(self) -> bool:
+        """True unless backing off or barred from sealing on this tip."""
+        if time.monotonic() < self._retry_at:
+            return False
+        tip = self.blockchain.last_block.hash
+        if self._blocked_tip == tip:
+            return False
+        if not self.blockchain.can_seal():
+            self._blocked_tip = tip
+            return False
+        self._blocked_tip = None
+        return True
+
+    # ------------------------------------------------------------------
+    # Production
+    # ------------------------------------------------------------------
+
+    def produce(self, trigger: str = "manual") -> Optional[Block]:
+        """Mine the pending pool now and wait for the result."""
+        job = self.mining.submit(self.blockchain, self.miner_did)
+        job.wait()
+        if job.block is None:
+            logger.info(f"Scheduled mining job {job.job_id} ended {job.status.value}")
+            if job.status == JobStatus.FAILED:
+                self._back_off()
+            return None
+        self.failures = 0
+        self.blocks_produced += 1
+        self.last_trigger = trigger
+        if trigger in self.triggers:
+            self.triggers[trigger] += 1
+        if self.on_block is not None and self.blockchain.is_on_main_chain(job.block):
+            try:
+                self.on_block(job.block)
+            except Exception as e:
+                logger.warning(f"Block announcement failed: {e}")
+        return job.block
+
+    def _back_off(self) -> None:
+        self.failures += 1
+        delay = min(self.MAX_RETRY_DELAY, self.RETRY_DELAY * 2 ** (self.failures - 1))
+        self._retry_at = time.monotonic() + delay
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            self._wake.wait(self._sleep_time())
+            self._wake.clear()
+            if self._stop.is_set():
+                break
+            trigger = self.due()
+            if trigger and self._ready():
+                try:
+                    self.produce(trigger)
+                except Exception as e:
+                    logger.warning(f"Scheduled block production failed: {e}")
+                    self._back_off()
+
+    def start(self) -> None:
+        if not self.enabled:
+            raise ValueError("Configure at least one of interval, max_pending, max_pending_bytes")
+        if self._thread and self._thread.is_alive():
+            return
+        self.blockchain.add_transaction_listener(self._on_transaction)
+        self.blockchain.add_tip_listener(self._on_tip_change)
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="block-scheduler", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._wake.set()
+        self.blockchain.remove_transaction_listener(self._on_transaction)
+        self.blockchain.remove_tip_listener(self._on_tip_change)
+        for job in self.mining.active():
+            if job.blockchain is self.blockchain:
+                job.cancel("scheduler stopped")
+        if self._thread:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    # ------------------------------------------------------------------
+    # Metrics
+    # ------------------------------------------------------------------
+
+    def latency_stats(self) -> dict:
+        ordered = sorted(self._latencies)
+        return {
+            "samples": len(ordered),
+            "mean": sum(ordered) / len(ordered) if ordered else None,
+            "p50": percentile(ordered, 50),
+            "p90": percentile(ordered, 90),
+            "p99": percentile(ordered, 99),
+            "max": ordered[-1] if ordered else None,
+        }
+
+    def to_dict(self) -> dict:
+        return {
+            "running": self.running,
+            "miner_did": self.miner_did,
+            "interval": self.interval,
+            "max_pending": self.max_pending,
+            "max_pending_bytes": self.max_pending_bytes,
+            "pending": len(self.blockchain.pending_transactions),
+            "pending_bytes": self.pending_bytes(),
+            "coalesced": self.blockchain.coalesced,
+            "oldest_pending_age": self._oldest_wait(),
+            "blocks_produced": self.blocks_produced,
+            "triggers": dict(self.triggers),
+            "last_trigger": self.last_trigger,
+            "failures": self.failures,
+            "confirmed": self.confirmed,
+            "confirmation_latency": self.latency_stats(),
+        }
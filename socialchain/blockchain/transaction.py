@@ -20,12 +20,13 @@ class TransactionType:
     # Valid transaction type values
     GOVERNANCE = "governance"
     AGENT_ACTION = "agent_action"
+    LANE_COMMIT = "lane_commit"
 
     _VALID_TYPES = frozenset({
         "transfer", "mining_reward", "registration", "profile_update",
         "connection", "contract_deploy", "contract_exec",
         "agent_registration", "agent_task", "agent_status",
-        "governance", "agent_action",
+        "governance", "agent_action", "lane_commit",
     })
 
 
@@ -76,6 +77,11 @@ class Transaction:
         )
         return hashlib.sha256(tx_string.encode()).hexdigest()
 
+    def leaf_hash(self) -> str:
+        """Hash of the full transaction, as committed by a block's Merkle
+        root (``compute_hash`` covers only sender, recipient and data)."""
+        return hashlib.sha256(json.dumps(self.to_dict(), sort_keys=True).encode()).hexdigest()
+
     @classmethod
     def from_dict(cls, d: dict) -> "Transaction":
         return cls(
@@ -234,5 +234,27 @@ class Community:
         )
         return community
 
+    def snapshot(self) -> dict:
+        """Full state, including members, proposals and votes."""
+        return {
+            **self.to_dict(),
+            "members": [m.to_dict() for m in self._members.values()],
+            "proposals": [p.to_dict() for p in self._proposals.values()],
+            "voting": self.voting_system.snapshot(),
+        }
+
+    @classmethod
+    def from_snapshot(cls, d: dict) -> "Community":
+        community = cls.from_dict(d)
+        community._members = {}
+        for member_data in d.get("members", []):
+            membership = Membership.from_dict(member_data)
+            community._members[membership.did] = membership
+        community._proposals = {
+            p["proposal_id"]: Proposal.from_dict(p) for p in d.get("proposals", [])
+        }
+        community.voting_system.restore(d.get("voting", {}))
+        return community
+
     def __repr__(self) -> str:
         return f"Community(id={self.community_id[:8]}..., name={self.name!r}, members={self.get_member_count()})"
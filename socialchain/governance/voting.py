@@ -12,6 +12,8 @@ import time
 from enum import Enum
 from typing import Any, Dict, List, Optional, Tuple
 
+from ..blockchain.interner import DIDS
+
 
 class VoteChoice(str, Enum):
     FOR = "for"
@@ -26,16 +28,23 @@ class VotingMethod(str, Enum):
 
 
 class Vote:
-    """An individual vote cast on a proposal."""
+    """An individual vote cast on a proposal (the voter is held as an
+    interned id, see ``DIDS``)."""
+
+    __slots__ = ("voter_id", "proposal_id", "choice", "weight", "timestamp")
 
     def __init__(self, voter_did: str, proposal_id: str, choice: VoteChoice,
                  weight: float = 1.0, timestamp: Optional[float] = None):
-        self.voter_did = voter_did
+        self.voter_id = DIDS.intern(voter_did)
         self.proposal_id = proposal_id
         self.choice = VoteChoice(choice)
         self.weight = weight
         self.timestamp = timestamp or time.time()
 
+    @property
+    def voter_did(self) -> str:
+        return DIDS.did(self.voter_id)
+
     def to_dict(self) -> dict:
         return {
             "voter_did": self.voter_did,
@@ -45,6 +54,16 @@ class Vote:
             "timestamp": self.timestamp,
         }
 
+    @classmethod
+    def from_dict(cls, d: dict) -> "Vote":
+        return cls(
+            voter_did=d["voter_did"],
+            proposal_id=d["proposal_id"],
+            choice=VoteChoice(d["choice"]),
+            weight=d.get("weight", 1.0),
+            timestamp=d.get("timestamp"),
+        )
+
 
 class VotingSystem:
     """Manages voting on proposals with configurable voting methods."""
@@ -54,10 +73,10 @@ class VotingSystem:
         self.method = VotingMethod(method)
         self.quorum_fraction = quorum_fraction
         self.pass_threshold = pass_threshold
-        # proposal_id -> {voter_did -> Vote}
-        self._votes: Dict[str, Dict[str, Vote]] = {}
-        # voter_did -> delegate_did (for delegated voting)
-        self._delegations: Dict[str, str] = {}
+        # proposal_id -> {voter id -> Vote}; ids are interned DIDs (DIDS)
+        self._votes: Dict[str, Dict[int, Vote]] = {}
+        # voter id -> delegate id (for delegated voting)
+        self._delegations: Dict[int, int] = {}
 
     def cast_vote(self, voter_did: str, proposal_id: str,
                   choice: VoteChoice, weight: float = 1.0) -> Vote:
@@ -65,7 +84,7 @@ class VotingSystem:
         if proposal_id not in self._votes:
             self._votes[proposal_id] = {}
 
-        if voter_did in self._votes[proposal_id]:
+        if DIDS.get(voter_did) in self._votes[proposal_id]:
             raise ValueError("Already voted on this proposal")
 
         effective_weight = weight
@@ -75,7 +94,7 @@ class VotingSystem:
             effective_weight = math.sqrt(abs(weight))
 
         vote = Vote(voter_did, proposal_id, choice, effective_weight)
-        self._votes[proposal_id][voter_did] = vote
+        self._votes[proposal_id][vote.voter_id] = vote
         return vote
 
     def delegate_vote(self, delegator_did: str, delegate_did: str) -> None:
@@ -83,9 +102,9 @@ class VotingSystem:
         if delegator_did == delegate_did:
             raise ValueError("Cannot delegate to yourself")
 
+        delegator, current = DIDS.intern(delegator_did), DIDS.intern(delegate_did)
         # Prevent circular delegation
-        current = delegate_did
-        visited = {delegator_did}
+        visited = {delegator}
         while current in self._delegations:
             if current in visited:
                 raise ValueError("Circular delegation detected")
@@ -94,15 +113,19 @@ class VotingSystem:
         if current in visited:
             raise ValueError("Circular delegation detected")
 
-        self._delegations[delegator_did] = delegate_did
+        self._delegations[delegator] = DIDS.get(delegate_did)
 
     def remove_delegation(self, delegator_did: str) -> None:
         """Remove a vote delegation."""
-        self._delegations.pop(delegator_did, None)
+        self._delegations.pop(DIDS.get(delegator_did), None)
 
     def get_effective_voter(self, voter_did: str) -> str:
         """Resolve delegation chain to find the effective voter."""
-        current = voter_did
+        voter = DIDS.get(voter_did)
+        return voter_did if voter is None else DIDS.did(self._effective_voter(voter))
+
+    def _effective_voter(self, voter: int) -> int:
+        current = voter
         visited = set()
         while current in self._delegations:
             if current in visited:
@@ -124,9 +147,9 @@ class VotingSystem:
         }
 
         processed_voters = set()
-        for voter_did, vote in votes.items():
+        for voter, vote in votes.items():
             if self.method == VotingMethod.DELEGATED:
-                effective_voter = self.get_effective_voter(voter_did)
+                effective_voter = self._effective_voter(voter)
                 if effective_voter in processed_voters:
                     continue
                 processed_voters.add(effective_voter)
@@ -172,7 +195,7 @@ class VotingSystem:
 
     def has_voted(self, voter_did: str, proposal_id: str) -> bool:
         """Check if a voter has already voted on a proposal."""
-        return voter_did in self._votes.get(proposal_id, {})
+        return DIDS.get(voter_did) in self._votes.get(proposal_id, {})
 
     def to_dict(self) -> dict:
         return {
@@ -182,3 +205,25 @@ class VotingSystem:
             "total_proposals_voted": len(self._votes),
             "active_delegations": len(self._delegations),
         }
+
+    def snapshot(self) -> dict:
+        """Full state (``to_dict`` only summarises it)."""
+        return {
+            **self.to_dict(),
+            "votes": [vote.to_dict() for votes in self._votes.values() for vote in votes.values()],
+            "delegations": {
+                DIDS.did(delegator): DIDS.did(delegate)
+                for delegator, delegate in self._delegations.items()
+            },
+        }
+
+    def restore(self, d: dict) -> None:
+        """Load votes and delegations from ``snapshot`` output."""
+        self._votes = {}
+        for vote_data in d.get("votes", []):
+            vote = Vote.from_dict(vote_data)
+            self._votes.setdefault(vote.proposal_id, {})[vote.voter_id] = vote
+        self._delegations = {
+            DIDS.intern(delegator): DIDS.intern(delegate)
+            for delegator, delegate in d.get("delegations", {}).items()
+        }
@@ -1,4 +1,5 @@
-from .registry import PeerRegistry
+from .registry import PeerRegistry, PeerStats
 from .node import NetworkNode
+from .overlay import OverlayMaintainer
 
-__all__ = ["PeerRegistry", "NetworkNode"]
+__all__ = ["PeerRegistry", "PeerStats", "NetworkNode", "OverlayMaintainer"]
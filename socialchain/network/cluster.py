@@ -0,0 +1,464 @@
+"""Local multi-node cluster harness.
+
+Spins up N independent SocialChain nodes (one ``create_app`` instance and
+``AppState`` each) on localhost ports, wires them into a topology and drives
+a transaction/mining workload through the real HTTP gossip path
+(``NetworkNode.broadcast_block`` and the ``/api/blocks`` relay) and
+``NetworkNode.sync_chain``.
+
+Faults are injected at the HTTP layer of the receiving node:
+
+* ``set_latency`` delays every peer request a node serves;
+* ``partition`` makes nodes reject peer requests from the other side
+  (peers are identified by the ``X-SocialChain-Peer`` header);
+* ``crash``/``restart`` stop and restart a node's server while keeping its
+  state, like a process that lost connectivity.
+
+``report()`` summarises block propagation latency percentiles, sync times and
+peer-to-peer bandwidth.  ``benchmarks/bench_cluster.py`` is the command-line
+front end.
+"""
+import random
+import threading
+import time
+from typing import Dict, Iterable, Iterator, List, Optional
+
+import requests
+from flask import jsonify, request
+from werkzeug.serving import WSGIRequestHandler, make_server
+
+from .node import PEER_HEADER
+from ..api.app import AppState, create_app
+from ..blockchain.blockchain import Blockchain
+from ..blockchain.crypto import percentile
+from ..blockchain.transaction import Transaction
+
+TOPOLOGIES = ("full", "ring", "line", "star", "random")
+
+
+class _QuietRequestHandler(WSGIRequestHandler):
+    """Suppress werkzeug's per-request access log; clusters are chatty."""
+
+    def log_request(self, *args, **kwargs) -> None:
+        pass
+
+
+class _ObservedBlockchain(Blockchain):
+    """Blockchain that records when each block was first accepted."""
+
+    def __init__(self):
+        self.arrivals: Dict[str, float] = {}
+        super().__init__()
+
+    def add_block(self, block) -> bool:
+        accepted = super().add_block(block)
+        if accepted:
+            self.arrivals.setdefault(block.hash, time.perf_counter())
+        return accepted
+
+
+class ClusterNode:
+    """One node of a ``LocalCluster``: its state, app and HTTP server."""
+
+    POLL_INTERVAL = 0.05  # server shutdown latency
+
+    def __init__(self, index: int, state: AppState, host: str):
+        self.index = index
+        self.state = state
+        self.app = create_app(state=state)
+        self.host = host
+        self.port: Optional[int] = None
+        self.latency = 0.0  # seconds added to every peer request served
+        self.group: Optional[int] = None  # partition group; None = connected
+        self.bytes_in = 0
+        self.bytes_out = 0
+        self.requests_served = 0
+        self._peer_groups: Dict[str, Optional[int]] = {}
+        self._server = None
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self._install_hooks()
+
+    @property
+    def did(self) -> str:
+        return self.state.network_node.node_id
+
+    @property
+    def address(self) -> str:
+        return f"{self.host}:{self.port}"
+
+    @property
+    def running(self) -> bool:
+        return self._server is not None
+
+    def _install_hooks(self) -> None:
+        @self.app.before_request
+        def _inject_faults():
+            sender = request.headers.get(PEER_HEADER)
+            if sender is None:
+                return None  # harness control traffic is never faulted
+            if self.group is not None and self._peer_groups.get(sender) != self.group:
+                return jsonify({"error": "partitioned"}), 503
+            if self.latency:
+                time.sleep(self.latency)
+            return None
+
+        @self.app.after_request
+        def _meter(response):
+            if request.headers.get(PEER_HEADER) is not None:
+                with self._lock:
+                    self.requests_served += 1
+                    self.bytes_in += request.content_length or 0
+                    if response.is_streamed:
+                        response.response = self._count_out(response.response)
+                    else:
+                        self.bytes_out += len(response.get_data())
+            return response
+
+    def _count_out(self, chunks: Iterable) -> Iterator:
+        """Pass a streamed body through, metering each chunk as it is sent."""
+        for chunk in chunks:
+            with self._lock:
+                self.bytes_out += len(chunk.encode() if isinstance(chunk, str) else chunk)
+            yield chunk
+
+    def start(self) -> None:
+        if self._server is not None:
+            return
+        self._server = make_server(
+            self.host, self.port or 0, self.app, threaded=True,
+            request_handler=_QuietRequestHandler,
+        )
+        self.port = self._server.server_port
+        self.state.network_node.host = self.host
+        self.state.network_node.port = self.port
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, kwargs={"poll_interval": self.POLL_INTERVAL},
+            name=f"cluster-node-{self.index}", daemon=True,
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        if self._server is None:
+            return
+        self._server.shutdown()
+        self._server.server_close()
+        self._thread.join()
+        self._server = None
+        self._thread = None
+
+    def to_dict(self) -> dict:
+        tip = self.state.blockchain.last_block
+        return {
+            "index": self.index,
+            "did": self.did,
+            "address": self.address,
+            "running": self.running,
+            "height": tip.index,
+            "tip": tip.hash,
+            "latency": self.latency,
+            "group": self.group,
+            "outbound": len(self.state.network_node.registry.outbound()),
+            "bytes_in": self.bytes_in,
+            "bytes_out": self.bytes_out,
+            "requests_served": self.requests_served,
+        }
+
+
+class LocalCluster:
+    """N SocialChain nodes on localhost wired into a chosen topology.
+
+    Usage::
+
+        with LocalCluster(8, topology="random", degree=3) as cluster:
+            cluster.run_workload(blocks=20, txs_per_block=10)
+            print(cluster.report())
+    """
+
+    DEFAULT_DIFFICULTY = 2
+    PROPAGATION_TIMEOUT = 10.0
+    POLL_INTERVAL = 0.002
+
+    def __init__(self, size: int, topology: str = "full", degree: int = 3,
+                 difficulty: Optional[int] = None, host: str = "127.0.0.1",
+                 seed: Optional[int] = None):
+        if size < 1:
+            raise ValueError("A cluster needs at least one node")
+        if topology not in TOPOLOGIES:
+            raise ValueError(f"Unknown topology {topology!r}; expected one of {TOPOLOGIES}")
+        self.topology = topology
+        self.degree = degree
+        self._rng = random.Random(seed)
+        chain_cls = type("ClusterBlockchain", (_ObservedBlockchain,), {
+            "DIFFICULTY": difficulty if difficulty is not None else self.DEFAULT_DIFFICULTY,
+        })
+        self.nodes: List[ClusterNode] = []
+        for i in range(size):
+            state = AppState()
+            state.blockchain = chain_cls()
+            self.nodes.append(ClusterNode(i, state, host))
+        self._edges: Optional[List[tuple]] = None
+        self.propagation: List[dict] = []  # one entry per announced block
+        self.syncs: List[dict] = []
+
+    # ------------------------------------------------------------------
+    # Lifecycle and topology
+    # ------------------------------------------------------------------
+
+    def start(self) -> "LocalCluster":
+        for node in self.nodes:
+            node.start()
+        self._wire_topology()
+        return self
+
+    def stop(self) -> None:
+        for node in self.nodes:
+            node.stop()
+
+    def __enter__(self) -> "LocalCluster":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+    def edges(self) -> List[tuple]:
+        """Directed ``(from, to)`` outbound links for the configured topology."""
+        if self._edges is None:
+            self._edges = self._build_edges()
+        return self._edges
+
+    def _build_edges(self) -> List[tuple]:
+        n = len(self.nodes)
+        if n < 2:
+            return []
+        if self.topology == "full":
+            return [(i, j) for i in range(n) for j in range(n) if i != j]
+        if self.topology == "ring":
+            links = {(i, (i + 1) % n) for i in range(n)} | {((i + 1) % n, i) for i in range(n)}
+            return sorted(links)
+        if self.topology == "line":
+            return [(i, i + 1) for i in range(n - 1)] + [(i + 1, i) for i in range(n - 1)]
+        if self.topology == "star":
+            return [(0, i) for i in range(1, n)] + [(i, 0) for i in range(1, n)]
+        # random: each node picks ``degree`` outbound peers; links are made
+        # symmetric so announcements can travel both ways
+        links = set()
+        for i in range(n):
+            for j in self._rng.sample([j for j in range(n) if j != i], min(self.degree, n - 1)):
+                links.add((i, j))
+                links.add((j, i))
+        return sorted(links)
+
+    def _wire_topology(self) -> None:
+        for i, j in self.edges():
+            self.nodes[i].state.network_node.register_peer(self.nodes[j].did, self.nodes[j].address)
+        for node in self.nodes:
+            for did in node.state.network_node.registry.outbound():
+                node.state.network_node.probe_tip(did, node.state.network_node.registry.get(did))
+
+    # ------------------------------------------------------------------
+    # Fault injection
+    # ------------------------------------------------------------------
+
+    def set_latency(self, seconds: float, nodes: Optional[Iterable[int]] = None) -> None:
+        for i in (range(len(self.nodes)) if nodes is None else nodes):
+            self.nodes[i].latency = seconds
+
+    def partition(self, *groups: Iterable[int]) -> None:
+        """Split the cluster; nodes only accept peer traffic from their own
+        group.  Nodes not listed form one extra group together."""
+        assigned: Dict[int, int] = {}
+        for g, members in enumerate(groups):
+            for i in members:
+                assigned[i] = g
+        rest = len(groups)
+        group_of = {node.did: assigned.get(node.index, rest) for node in self.nodes}
+        for node in self.nodes:
+            node.group = group_of[node.did]
+            node._peer_groups = group_of
+
+    def heal(self) -> None:
+        self.drain_relays()
+        for node in self.nodes:
+            node.group = None
+            node._peer_groups = {}
+
+    def crash(self, index: int) -> None:
+        self.nodes[index].stop()
+
+    def restart(self, index: int) -> None:
+        self.drain_relays()
+        self.nodes[index].start()
+
+    def drain_relays(self, timeout: Optional[float] = None) -> bool:
+        """Wait until no node has a relay in flight.
+
+        ``heal`` and ``restart`` drain first, so announcements sent while a
+        node was cut off are lost deterministically rather than racing the
+        fault being lifted.  Relays can trigger further relays on the nodes
+        they reach, hence the loop.
+        """
+        deadline = time.perf_counter() + (timeout or self.PROPAGATION_TIMEOUT)
+        while True:
+            busy = False
+            for node in self.nodes:
+                network = node.state.network_node
+                with network._relay_lock:
+                    pending = bool(network._relays)
+                if pending:
+                    busy = True
+                    if not network.wait_for_relays(max(0.0, deadline - time.perf_counter())):
+                        return False
+            if not busy:
+                return True
+
+    # ------------------------------------------------------------------
+    # Workload
+    # ------------------------------------------------------------------
+
+    def submit_transactions(self, index: int, count: int) -> List[str]:
+        """Submit *count* transactions to node *index* through its HTTP API."""
+        node = self.nodes[index]
+        tx_ids = []
+        for k in range(count):
+            response = requests.post(
+                f"http://{node.address}/api/transactions",
+                json={"sender": node.did, "recipient": self._rng.choice(self.nodes).did,
+                      "data": {"type": "transfer", "amount": k}},
+                timeout=5,
+            )
+            response.raise_for_status()
+            tx_ids.append(response.json()["tx_id"])
+        return tx_ids
+
+    def mine_and_announce(self, index: int, wait: bool = True) -> dict:
+        """Mine pending transactions on node *index*, announce the block and
+        (optionally) wait until every reachable node has accepted it."""
+        node = self.nodes[index]
+        blockchain = node.state.blockchain
+        if not blockchain.pending_transactions:
+            blockchain.add_transaction(Transaction(node.did, node.did, {"type": "transfer", "amount": 0}))
+        block = blockchain.mine_block(node.did)
+        announced = time.perf_counter()
+        node.state.network_node.broadcast_block(block)
+        record = {"hash": block.hash, "height": block.index, "origin": index, "announced": announced}
+        if wait:
+            self.wait_for_block(block.hash, record=record)
+        self.propagation.append(record)
+        return record
+
+    def _reachable(self, origin: Optional[int] = None) -> List[ClusterNode]:
+        """Running nodes, restricted to *origin*'s side of any partition."""
+        group = self.nodes[origin].group if origin is not None else None
+        return [
+            node for node in self.nodes
+            if node.running and (group is None or node.group == group)
+        ]
+
+    def wait_for_block(self, block_hash: str, timeout: Optional[float] = None,
+                       record: Optional[dict] = None) -> bool:
+        """Poll until every running node on the origin's side of any
+        partition has *block_hash* (or time out)."""
+        targets = self._reachable(record["origin"] if record else None)
+        deadline = time.perf_counter() + (timeout or self.PROPAGATION_TIMEOUT)
+        while time.perf_counter() < deadline:
+            if all(node.state.blockchain.has_block(block_hash) for node in targets):
+                break
+            time.sleep(self.POLL_INTERVAL)
+        reached = [n for n in self.nodes if n.state.blockchain.has_block(block_hash)]
+        if record is not None:
+            latencies = [
+                n.state.blockchain.arrivals[block_hash] - record["announced"]
+                for n in reached if n.index != record["origin"]
+            ]
+            record["latencies"] = latencies
+            record["coverage"] = len(reached) / len(self.nodes)
+        return all(node.state.blockchain.has_block(block_hash) for node in targets)
+
+    def run_workload(self, blocks: int = 10, txs_per_block: int = 5,
+                     interval: float = 0.0) -> List[dict]:
+        """Submit transactions and mine *blocks* blocks on random running
+        nodes, waiting for each to propagate before mining the next."""
+        records = []
+        for _ in range(blocks):
+            origin = self._rng.choice(self._reachable()).index
+            self.submit_transactions(origin, txs_per_block)
+            records.append(self.mine_and_announce(origin))
+            if interval:
+                time.sleep(interval)
+        return records
+
+    def sync(self, index: int) -> dict:
+        """Run ``sync_chain`` on node *index* and time it."""
+        node = self.nodes[index]
+        started = time.perf_counter()
+        changed = node.state.network_node.sync_chain(node.state.blockchain)
+        record = {
+            "node": index,
+            "changed": changed,
+            "seconds": time.perf_counter() - started,
+            "height": node.state.blockchain.last_block.index,
+        }
+        self.syncs.append(record)
+        return record
+
+    def settle(self, rounds: int = 3) -> List[dict]:
+        """Sync every running node that is not on the best tip.
+
+        Announcements are fire-and-forget, so a node that was unreachable
+        (or backed off by its peers) when a block was relayed only catches
+        up through ``sync_chain``; this is the harness's anti-entropy pass.
+        """
+        records = []
+        for _ in range(rounds):
+            if self.converged():
+                break
+            best = max(node.state.blockchain.last_block.index for node in self._reachable())
+            for node in self._reachable():
+                if node.state.blockchain.last_block.index < best:
+                    records.append(self.sync(node.index))
+        return records
+
+    def converged(self) -> bool:
+        tips = {node.state.blockchain.last_block.hash for node in self._reachable()}
+        return len(tips) == 1
+
+    # ------------------------------------------------------------------
+    # Reporting
+    # ------------------------------------------------------------------
+
+    def report(self) -> dict:
+        latencies = [lat for record in self.propagation for lat in record.get("latencies", [])]
+        sync_times = [record["seconds"] for record in self.syncs]
+        bytes_total = sum(node.bytes_in + node.bytes_out for node in self.nodes)
+        elapsed = (
+            self.propagation[-1]["announced"] - self.propagation[0]["announced"]
+            if len(self.propagation) > 1 else 0.0
+        )
+        return {
+            "nodes": len(self.nodes),
+            "topology": self.topology,
+            "edges": len(self.edges()),
+            "blocks": len(self.propagation),
+            "converged": self.converged(),
+            "propagation": {
+                "samples": len(latencies),
+                "p50": percentile(latencies, 50),
+                "p90": percentile(latencies, 90),
+                "p99": percentile(latencies, 99),
+                "max": max(latencies) if latencies else None,
+                "min_coverage": min((r.get("coverage", 0) for r in self.propagation), default=None),
+            },
+            "sync": {
+                "runs": len(sync_times),
+                "p50": percentile(sync_times, 50),
+                "max": max(sync_times) if sync_times else None,
+            },
+            "bandwidth": {
+                "bytes": bytes_total,
+                "requests": sum(node.requests_served for node in self.nodes),
+                "bytes_per_block": bytes_total / len(self.propagation) if self.propagation else 0,
+                "bytes_per_second": bytes_total / elapsed if elapsed else None,
+            },
+            "per_node": [node.to_dict() for node in self.nodes],
+        }
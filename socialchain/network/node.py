@@ -1,15 +1,24 @@
 import json
 import logging
-from typing import Any, Dict, List, Optional
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from typing import Any, Dict, List, Optional, Set
 
 import requests
 
+from . import wire
 from .registry import PeerRegistry
 from ..blockchain.identity import Identity
+from ..blockchain.block import Block
 from ..blockchain.blockchain import Blockchain
 
 logger = logging.getLogger(__name__)
 
+# Identifies the sending node on every peer request, so receivers can avoid
+# relaying an announcement straight back to where it came from.
+PEER_HEADER = "X-SocialChain-Peer"
+
 
 class NetworkNode:
     def __init__(self, host: str = "127.0.0.1", port: int = 5000, identity: Optional[Identity] = None):
@@ -18,9 +27,27 @@ class NetworkNode:
         self.host = host
         self.port = port
         self.registry = PeerRegistry()
+        self._relay_pool: Optional[ThreadPoolExecutor] = None
+        self._relays: Set[Future] = set()
+        self._relay_lock = threading.Lock()
+        self.relays_dropped = 0
+
+    EXCHANGE_SAMPLE = 16  # peers returned per peer-exchange request
+    RELAY_WORKERS = 4  # threads forwarding announcements
+    MAX_PENDING_RELAYS = 256  # queued relays beyond this are dropped
+
+    @property
+    def address(self) -> str:
+        return f"{self.host}:{self.port}"
+
+    def _headers(self, extra: Optional[Dict[str, str]] = None) -> Dict[str, str]:
+        headers = {PEER_HEADER: self.node_id}
+        if extra:
+            headers.update(extra)
+        return headers
 
-    def register_peer(self, did: str, address: str) -> None:
-        self.registry.add(did, address)
+    def register_peer(self, did: str, address: str, outbound: bool = True) -> None:
+        self.registry.add(did, address, outbound=outbound)
 
     def remove_peer(self, did: str) -> bool:
         return self.registry.remove(did)
@@ -29,56 +56,277 @@ class NetworkNode:
         return self.registry.list()
 
     def broadcast(self, endpoint: str, data: dict) -> List[dict]:
+        """POST *data* to every available outbound peer.
+
+        Only the bounded outbound set is contacted, so the cost of a
+        broadcast does not grow with the address book.  Peers that are
+        banned or backing off after failures are skipped, and each request's
+        timeout is scaled to the peer's observed RTT.
+        """
         results = []
-        for did, address in self.registry.list().items():
+        for did, address in self.registry.outbound().items():
+            if not self.registry.is_available(did):
+                results.append({"did": did, "status": None, "skipped": True})
+                continue
             url = f"http://{address}{endpoint}"
+            started = time.monotonic()
             try:
-                response = requests.post(url, json=data, timeout=5)
+                response = requests.post(
+                    url, json=data, headers=self._headers(), timeout=self.registry.timeout_for(did)
+                )
+                self.registry.record_success(did, time.monotonic() - started)
                 results.append({"did": did, "status": response.status_code, "data": response.json()})
             except Exception as e:
+                self.registry.record_failure(did)
                 logger.warning(f"Failed to broadcast to {did} at {url}: {e}")
                 results.append({"did": did, "status": None, "error": str(e)})
         return results
 
-    def sync_chain(self, blockchain: Blockchain) -> bool:
-        longest_chain = None
-        max_length = len(blockchain.chain)
-        for did, address in self.registry.list().items():
-            url = f"http://{address}/api/chain"
+    def exchange_peers(self, did: str, address: str) -> List[str]:
+        """Fetch a sample of *did*'s peers and add the unknown ones as candidates.
+
+        We advertise our own DID and address so the remote side can learn
+        about us too.  Returns the DIDs that were newly added.
+        """
+        started = time.monotonic()
+        try:
+            response = requests.post(
+                f"http://{address}/api/network/peers/exchange",
+                json={"did": self.node_id, "address": self.address},
+                headers=self._headers(),
+                timeout=self.registry.timeout_for(did),
+            )
+            response.raise_for_status()
+            offered = response.json().get("peers", [])
+        except Exception as e:
+            self.registry.record_failure(did)
+            logger.warning(f"Peer exchange with {did} failed: {e}")
+            return []
+        self.registry.record_success(did, time.monotonic() - started)
+        added = []
+        for peer in offered[:self.EXCHANGE_SAMPLE]:
+            peer_did, peer_address = peer.get("did"), peer.get("address")
+            if not peer_did or not peer_address or peer_did == self.node_id:
+                continue
+            if self.registry.get(peer_did) is None:
+                self.registry.add(peer_did, peer_address, outbound=False)
+                added.append(peer_did)
+        return added
+
+    def broadcast_block(self, block: Block, exclude: Optional[str] = None,
+                        lane: Optional[str] = None) -> List[dict]:
+        """Announce *block* to outbound peers via ``POST /api/blocks``
+        (``?lane=`` for a block of that transaction lane).
+
+        Peers that advertised wire support get the compressed binary
+        encoding; everyone else gets JSON.  *exclude* is typically the peer
+        the block came from.
+        """
+        results = []
+        for did, address in self.registry.outbound().items():
+            if did == exclude:
+                continue
+            if not self.registry.is_available(did):
+                results.append({"did": did, "status": None, "skipped": True})
+                continue
+            url = f"http://{address}/api/blocks" + (f"?lane={lane}" if lane else "")
+            encodings = self.registry.get_stats(did).wire_encodings
+            started = time.monotonic()
             try:
-                response = requests.get(url, timeout=5)
-                data = response.json()
-                if data["length"] > max_length:
-                    max_length = data["length"]
-                    longest_chain = data
+                timeout = self.registry.timeout_for(did)
+                if encodings:
+                    body, headers = wire.pack(
+                        wire.encode_blocks([block]), wire.choose_encoding(",".join(encodings))
+                    )
+                    response = requests.post(
+                        url, data=body, headers=self._headers(headers), timeout=timeout
+                    )
+                else:
+                    response = requests.post(
+                        url, json={"block": block.to_dict()}, headers=self._headers(),
+                        timeout=timeout,
+                    )
+                self.registry.record_success(did, time.monotonic() - started)
+                results.append({"did": did, "status": response.status_code, "data": response.json()})
             except Exception as e:
-                logger.warning(f"Failed to sync with {did}: {e}")
-        if longest_chain:
-            # Replace the local chain with the longer one from peers
-            from ..blockchain.block import Block
-            from ..blockchain.transaction import Transaction
-            new_chain = []
-            for block_data in longest_chain["chain"]:
-                txs = [Transaction.from_dict(tx) for tx in block_data["transactions"]]
-                block = Block(
-                    index=block_data["index"],
-                    transactions=txs,
-                    previous_hash=block_data["previous_hash"],
-                    nonce=block_data["nonce"],
-                    timestamp=block_data["timestamp"],
+                self.registry.record_failure(did)
+                logger.warning(f"Failed to announce block to {did} at {url}: {e}")
+                results.append({"did": did, "status": None, "error": str(e)})
+        return results
+
+    def relay_block(self, block: Block, exclude: Optional[str] = None,
+                    lane: Optional[str] = None) -> Optional[Future]:
+        """Forward a newly accepted block to our outbound peers in the
+        background, so the request that delivered it is not held open while
+        the announcement floods onwards.
+
+        Relays run on a small fixed pool.  When too many are already queued
+        the announcement is dropped (and counted): relaying is best effort
+        and peers that miss it catch up through ``sync_chain``.
+        """
+        with self._relay_lock:
+            if len(self._relays) >= self.MAX_PENDING_RELAYS:
+                self.relays_dropped += 1
+                logger.warning(f"Relay queue full; not forwarding block {block.hash}")
+                return None
+            if self._relay_pool is None:
+                self._relay_pool = ThreadPoolExecutor(
+                    max_workers=self.RELAY_WORKERS, thread_name_prefix="block-relay",
                 )
-                block.hash = block_data["hash"]
-                new_chain.append(block)
-            blockchain.chain = new_chain
-            return True
+            future = self._relay_pool.submit(self.broadcast_block, block, exclude, lane)
+            self._relays.add(future)
+        future.add_done_callback(self._relay_done)
+        return future
+
+    def _relay_done(self, future: Future) -> None:
+        with self._relay_lock:
+            self._relays.discard(future)
+
+    def wait_for_relays(self, timeout: Optional[float] = None) -> bool:
+        """Block until every queued relay has finished; False on timeout."""
+        with self._relay_lock:
+            pending = list(self._relays)
+        return not wait(pending, timeout=timeout).not_done
+
+    def probe_tip(self, did: str, address: str) -> Optional[int]:
+        """Ask a peer for its chain height, recording RTT, reported height
+        and the wire encodings it supports."""
+        started = time.monotonic()
+        try:
+            response = requests.get(
+                f"http://{address}/api/chain/tip",
+                headers=self._headers(),
+                timeout=self.registry.timeout_for(did),
+            )
+            response.raise_for_status()
+            data = response.json()
+        except Exception as e:
+            self.registry.record_failure(did)
+            logger.warning(f"Failed to probe {did}: {e}")
+            return None
+        self.registry.record_success(did, time.monotonic() - started, height=data["height"])
+        self.registry.get_stats(did).wire_encodings = [
+            e for e in data.get("wire", []) if e in wire.SUPPORTED_ENCODINGS
+        ]
+        return data["height"]
+
+    def _fetch_chain(self, did: str, address: str, since: int = 0,
+                     lane: Optional[str] = None) -> Optional[List[Block]]:
+        """Download a peer's chain (or the sub-chain of transaction *lane*)
+        from height *since*, in wire format when the peer offers it."""
+        started = time.monotonic()
+        query = f"?since={since}" if since else ""
+        path = f"/api/chain/lanes/{lane}" if lane else "/api/chain"
+        try:
+            response = requests.get(
+                f"http://{address}{path}{query}",
+                headers=self._headers(wire.request_headers()),
+                timeout=self.registry.MAX_TIMEOUT,
+            )
+            decoded = wire.unpack(response.content, response.headers)
+            if decoded is not None:
+                blocks = decoded[1]["chain"]
+            else:
+                blocks = [Block.from_dict(b) for b in response.json()["chain"]]
+        except Exception as e:
+            self.registry.record_failure(did)
+            logger.warning(f"Failed to sync with {did}: {e}")
+            return None
+        height = blocks[-1].index if blocks and not lane else None
+        self.registry.record_success(did, time.monotonic() - started, height=height)
+        return blocks
+
+    def fetch_snapshot(self, did: str, address: str) -> Optional[dict]:
+        """Download a peer's state snapshot (see ``GET /api/snapshot``)."""
+        started = time.monotonic()
+        try:
+            response = requests.get(
+                f"http://{address}/api/snapshot",
+                headers=self._headers(),
+                timeout=self.registry.MAX_TIMEOUT,
+            )
+            response.raise_for_status()
+            snapshot = response.json()
+        except Exception as e:
+            self.registry.record_failure(did)
+            logger.warning(f"Failed to fetch snapshot from {did}: {e}")
+            return None
+        self.registry.record_success(did, time.monotonic() - started, height=snapshot["height"])
+        return snapshot
+
+    def sync_chain(self, blockchain: Blockchain) -> bool:
+        """Pull blocks from the best peer that is ahead of us.
+
+        Available peers are probed for their height in latency order; the
+        full chain is then downloaded from the lowest-latency peer among
+        those reporting the greatest height, falling back to the next one on
+        failure.  Blocks are fed through ``Blockchain.add_block`` so the
+        local block tree decides by cumulative work whether to reorganise.
+        Only blocks from ``MAX_FORK_DEPTH`` below our tip are requested,
+        since a fork any deeper would be rejected anyway (and a chain
+        restored from a snapshot never asks below its oldest kept block).
+        With transaction lanes, each lane's sub-chain is
+        pulled from the same peer.
+        A peer serving an incorrectly sealed block is banned (one we lack
+        the ancestors to check is skipped instead).  Returns True
+        if the local tip changed.
+        """
+        local_height = blockchain.last_block.index
+        candidates = []
+        for did, address in self.registry.select_for_sync():
+            height = self.probe_tip(did, address)
+            if height is not None and height > local_height:
+                candidates.append((height, did, address))
+        # Highest first; select_for_sync order breaks ties by latency
+        candidates.sort(key=lambda c: -c[0])
+
+        tip_before = blockchain.last_block.hash
+        for _, did, address in candidates:
+            blocks = self._fetch_chain(did, address, since=self._sync_from(blockchain))
+            if blocks is None or not self._add_blocks(blockchain, did, blocks):
+                continue
+            for name, lane in (blockchain.lanes.lanes.items() if blockchain.lanes else ()):
+                lane_blocks = self._fetch_chain(did, address, since=self._sync_from(lane), lane=name)
+                if lane_blocks is None or not self._add_blocks(lane, did, lane_blocks):
+                    break
+            if blockchain.last_block.hash != tip_before:
+                return True
         return False
 
+    @staticmethod
+    def _sync_from(blockchain: Blockchain) -> int:
+        """Lowest height worth fetching: a peer branch forking further below
+        our tip than ``MAX_FORK_DEPTH`` could not be adopted."""
+        return max(blockchain.base_index, blockchain.last_block.index - blockchain.MAX_FORK_DEPTH)
+
+    def _add_blocks(self, blockchain: Blockchain, did: str, blocks: List[Block]) -> bool:
+        """Feed *did*'s *blocks* to *blockchain*.  Returns False (banning the
+        peer for an incorrectly sealed block) if one was not accepted.  A
+        block this chain cannot verify yet, e.g. one whose retarget window
+        lies below a snapshot's oldest kept block, is refused without a ban."""
+        for block in blocks:
+            if blockchain.has_block(block.hash):
+                continue
+            if not blockchain.can_verify(block):
+                logger.warning(f"Cannot verify block {block.index} from {did} yet")
+                return False
+            if not blockchain.verify_block(block):
+                self.registry.ban(did, f"invalid block {block.index}")
+                logger.warning(f"Banned {did}: served invalid block {block.index}")
+                return False
+            if not blockchain.add_block(block):
+                logger.warning(f"Rejected block {block.index} from {did}")
+                return False
+        return True
+
     def to_dict(self) -> dict:
         return {
             "node_id": self.node_id,
             "host": self.host,
             "port": self.port,
             "peers": self.registry.list(),
+            "outbound": sorted(self.registry.outbound()),
+            "peer_stats": self.registry.stats(),
         }
 
     def __repr__(self) -> str:
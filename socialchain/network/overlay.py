@@ -0,0 +1,144 @@
+"""Bounded-degree overlay maintenance.
+
+Keeps each node's outbound peer set near a fixed target size regardless of
+how many peers it knows about, so per-node gossip cost stays constant as the
+network grows.  Each round the maintainer drops unhealthy outbound peers,
+discovers candidates through peer exchange, fills free slots with the
+lowest-latency candidates and occasionally rotates a random connection so
+the overlay keeps mixing.
+"""
+import logging
+import random
+import threading
+from typing import List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class OverlayMaintainer:
+    TARGET_OUTBOUND = 8
+    ROTATE_PROBABILITY = 0.25  # chance per round of swapping one outbound peer
+    PROBE_CANDIDATES = 4  # candidates RTT-probed per round before promotion
+    DEFAULT_INTERVAL = 30.0
+
+    def __init__(self, node, target_outbound: Optional[int] = None,
+                 interval: Optional[float] = None, rng: Optional[random.Random] = None):
+        self.node = node
+        self.target_outbound = target_outbound or self.TARGET_OUTBOUND
+        self.interval = interval or self.DEFAULT_INTERVAL
+        self._rng = rng or random.Random()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def registry(self):
+        return self.node.registry
+
+    def _candidates(self) -> List[str]:
+        """Known, available peers that are not currently outbound."""
+        return [
+            did for did in self.registry.available()
+            if not self.registry.is_outbound(did) and did != self.node.node_id
+        ]
+
+    def _discover(self) -> List[str]:
+        """Run peer exchange with one random reachable peer."""
+        sources = list(self.registry.outbound()) or list(self.registry.available())
+        sources = [did for did in sources if self.registry.is_available(did)]
+        if not sources:
+            return []
+        did = self._rng.choice(sources)
+        return self.node.exchange_peers(did, self.registry.get(did))
+
+    def _best_candidates(self, count: int) -> List[str]:
+        """Pick *count* candidates, preferring the lowest measured latency.
+
+        A handful of never-measured candidates are probed first so new peers
+        get a chance to compete on latency.
+        """
+        candidates = self._candidates()
+        unmeasured = [did for did in candidates if self.registry.get_stats(did).rtt_ewma is None]
+        for did in self._rng.sample(unmeasured, min(self.PROBE_CANDIDATES, len(unmeasured))):
+            self.node.probe_tip(did, self.registry.get(did))
+        candidates = [did for did in candidates if self.registry.is_available(did)]
+        candidates.sort(key=self.registry.latency_key)
+        return candidates[:count]
+
+    def maintain(self) -> dict:
+        """Run one maintenance round and return a summary of the changes."""
+        dropped, added, rotated = [], [], None
+
+        for did in list(self.registry.outbound()):
+            if not self.registry.is_available(did):
+                self.registry.set_outbound(did, False)
+                dropped.append(did)
+
+        outbound = list(self.registry.outbound())
+        if len(outbound) > self.target_outbound:
+            outbound.sort(key=self.registry.latency_key)
+            for did in outbound[self.target_outbound:]:
+                self.registry.set_outbound(did, False)
+                dropped.append(did)
+
+        missing = self.target_outbound - len(self.registry.outbound())
+        if missing > 0:
+            if len(self._candidates()) < missing:
+                self._discover()
+            for did in self._best_candidates(missing):
+                self.registry.set_outbound(did, True)
+                added.append(did)
+        elif not dropped and self._rng.random() < self.ROTATE_PROBABILITY:
+            # Only rotate a stable overlay; a round that just trimmed peers
+            # already changed the outbound set
+            candidates = self._candidates()
+            if candidates:
+                old = self._rng.choice(list(self.registry.outbound()))
+                new = self._rng.choice(candidates)
+                self.registry.set_outbound(old, False)
+                self.registry.set_outbound(new, True)
+                rotated = {"removed": old, "added": new}
+
+        return {
+            "dropped": dropped,
+            "added": added,
+            "rotated": rotated,
+            "outbound": len(self.registry.outbound()),
+            "known": len(self.registry),
+        }
+
+    # ------------------------------------------------------------------
+    # Background loop
+    # ------------------------------------------------------------------
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            try:
+                self.maintain()
+            except Exception as e:
+                logger.warning(f"Overlay maintenance round failed: {e}")
+
+    def start(self) -> None:
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="overlay-maintainer", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout=self.interval)
+            self._thread = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def to_dict(self) -> dict:
+        return {
+            "target_outbound": self.target_outbound,
+            "interval": self.interval,
+            "running": self.running,
+            "outbound": len(self.registry.outbound()),
+            "known": len(self.registry),
+        }
@@ -1,25 +1,202 @@
-from typing import Dict, List, Optional
+import random
+import time
+from typing import Dict, List, Optional, Tuple
+
+
+class PeerStats:
+    """Health and latency statistics tracked for a single peer."""
+
+    RTT_ALPHA = 0.2  # EWMA weight given to the newest RTT sample
+
+    def __init__(self):
+        self.rtt_ewma: Optional[float] = None  # seconds
+        self.successes = 0
+        self.failures = 0
+        self.consecutive_failures = 0
+        self.last_seen: Optional[float] = None
+        self.reported_height: Optional[int] = None
+        self.backoff_until = 0.0
+        self.banned_until = 0.0
+        self.ban_reason: Optional[str] = None
+        # Wire-format codecs the peer advertised; empty means JSON only
+        self.wire_encodings: List[str] = []
+
+    def record_rtt(self, rtt: float) -> None:
+        if self.rtt_ewma is None:
+            self.rtt_ewma = rtt
+        else:
+            self.rtt_ewma = self.RTT_ALPHA * rtt + (1 - self.RTT_ALPHA) * self.rtt_ewma
+
+    @property
+    def health(self) -> float:
+        """Laplace-smoothed success ratio in (0, 1)."""
+        return (self.successes + 1) / (self.successes + self.failures + 2)
+
+    def to_dict(self) -> dict:
+        return {
+            "rtt_ewma": self.rtt_ewma,
+            "successes": self.successes,
+            "failures": self.failures,
+            "consecutive_failures": self.consecutive_failures,
+            "health": round(self.health, 3),
+            "last_seen": self.last_seen,
+            "reported_height": self.reported_height,
+            "backoff_until": self.backoff_until,
+            "banned_until": self.banned_until,
+            "ban_reason": self.ban_reason,
+            "wire_encodings": self.wire_encodings,
+        }
 
 
 class PeerRegistry:
+    BASE_BACKOFF = 1.0  # seconds after the first failure, doubled per failure
+    MAX_BACKOFF = 300.0
+    BAN_DURATION = 3600.0
+    DEFAULT_RTT = 0.5  # assumed RTT for peers that have never answered
+    MIN_TIMEOUT = 0.5
+    MAX_TIMEOUT = 5.0
+    MAX_KNOWN_PEERS = 1000  # address-book size; outbound peers are never evicted
+
     def __init__(self):
         self._peers: Dict[str, str] = {}  # did -> host:port
+        self._stats: Dict[str, PeerStats] = {}
+        # Peers we actively gossip with; the rest of the address book only
+        # serves as candidates for overlay maintenance and peer exchange.
+        self._outbound: set = set()
 
-    def add(self, did: str, address: str) -> None:
+    def add(self, did: str, address: str, outbound: bool = True) -> None:
+        if did not in self._peers and len(self._peers) >= self.MAX_KNOWN_PEERS:
+            if not self._evict_candidate():
+                return
         self._peers[did] = address
+        self._stats.setdefault(did, PeerStats())
+        if outbound:
+            self._outbound.add(did)
 
     def remove(self, did: str) -> bool:
         if did in self._peers:
             del self._peers[did]
+            self._stats.pop(did, None)
+            self._outbound.discard(did)
             return True
         return False
 
+    def _evict_candidate(self) -> bool:
+        """Make room in a full address book, preferring banned peers."""
+        candidates = [did for did in self._peers if did not in self._outbound]
+        if not candidates:
+            return False
+        banned = [did for did in candidates if self.is_banned(did)]
+        self.remove(random.choice(banned or candidates))
+        return True
+
     def list(self) -> Dict[str, str]:
         return dict(self._peers)
 
+    def outbound(self) -> Dict[str, str]:
+        return {did: self._peers[did] for did in self._outbound}
+
+    def is_outbound(self, did: str) -> bool:
+        return did in self._outbound
+
+    def set_outbound(self, did: str, outbound: bool) -> None:
+        if did not in self._peers:
+            return
+        if outbound:
+            self._outbound.add(did)
+        else:
+            self._outbound.discard(did)
+
+    def sample(self, k: int, exclude: Optional[set] = None) -> Dict[str, str]:
+        """Random sample of up to *k* available peers, for peer exchange."""
+        exclude = exclude or set()
+        pool = [did for did in self.available() if did not in exclude]
+        return {did: self._peers[did] for did in random.sample(pool, min(k, len(pool)))}
+
     def get(self, did: str) -> Optional[str]:
         return self._peers.get(did)
 
+    def get_stats(self, did: str) -> Optional[PeerStats]:
+        return self._stats.get(did)
+
+    # ------------------------------------------------------------------
+    # Health tracking
+    # ------------------------------------------------------------------
+
+    def record_success(self, did: str, rtt: float, height: Optional[int] = None) -> None:
+        stats = self._stats.get(did)
+        if stats is None:
+            return
+        stats.record_rtt(rtt)
+        stats.successes += 1
+        stats.consecutive_failures = 0
+        stats.backoff_until = 0.0
+        stats.last_seen = time.time()
+        if height is not None:
+            stats.reported_height = height
+
+    def record_failure(self, did: str) -> None:
+        """Count a failed request and back the peer off exponentially."""
+        stats = self._stats.get(did)
+        if stats is None:
+            return
+        stats.failures += 1
+        stats.consecutive_failures += 1
+        delay = min(self.MAX_BACKOFF, self.BASE_BACKOFF * 2 ** (stats.consecutive_failures - 1))
+        stats.backoff_until = time.time() + delay
+
+    def ban(self, did: str, reason: str, duration: Optional[float] = None) -> None:
+        """Stop contacting a peer that served invalid data."""
+        stats = self._stats.get(did)
+        if stats is None:
+            return
+        stats.banned_until = time.time() + (self.BAN_DURATION if duration is None else duration)
+        stats.ban_reason = reason
+
+    def is_banned(self, did: str, now: Optional[float] = None) -> bool:
+        stats = self._stats.get(did)
+        return stats is not None and stats.banned_until > (now or time.time())
+
+    def is_available(self, did: str, now: Optional[float] = None) -> bool:
+        """True unless the peer is banned or inside its backoff window."""
+        stats = self._stats.get(did)
+        if stats is None:
+            return did in self._peers
+        now = now or time.time()
+        return stats.banned_until <= now and stats.backoff_until <= now
+
+    def available(self) -> Dict[str, str]:
+        now = time.time()
+        return {did: addr for did, addr in self._peers.items() if self.is_available(did, now)}
+
+    def latency_key(self, did: str) -> float:
+        """Sort key favouring fast, reliable peers (lower is better)."""
+        stats = self._stats[did]
+        rtt = stats.rtt_ewma if stats.rtt_ewma is not None else self.DEFAULT_RTT
+        return rtt / stats.health
+
+    def select_for_sync(self, limit: Optional[int] = None) -> List[Tuple[str, str]]:
+        """Return available outbound peers as ``(did, address)`` ordered by latency."""
+        now = time.time()
+        peers = sorted(
+            ((did, addr) for did, addr in self.outbound().items() if self.is_available(did, now)),
+            key=lambda item: self.latency_key(item[0]),
+        )
+        return peers[:limit] if limit is not None else peers
+
+    def timeout_for(self, did: str) -> float:
+        """Request timeout scaled to the peer's observed RTT."""
+        stats = self._stats.get(did)
+        if stats is None or stats.rtt_ewma is None:
+            return self.MAX_TIMEOUT
+        return max(self.MIN_TIMEOUT, min(self.MAX_TIMEOUT, 4 * stats.rtt_ewma))
+
+    def stats(self) -> Dict[str, dict]:
+        return {
+            did: {**self._stats[did].to_dict(), "outbound": did in self._outbound}
+            for did in self._peers
+        }
+
     def __len__(self) -> int:
         return len(self._peers)
 
@@ -0,0 +1,486 @@
+"""Compact node-to-node wire format.
+
+Peers that send ``Accept: application/x-socialchain-wire`` on sync requests
+(or advertise ``wire`` encodings from ``/api/chain/tip``) exchange blocks in a
+binary canonical encoding instead of JSON:
+
+* integers are LEB128 varints and floats are little-endian doubles;
+* hashes, signatures, DIDs and UUIDs are stored as raw bytes rather than hex
+  text, with a one-byte tag so every string round-trips exactly;
+* free-form transaction ``data`` payloads are gathered into one canonical
+  compact JSON array per message.
+
+The whole message is then optionally compressed with zlib, or zstd when the
+``zstandard`` package is installed; the codec is negotiated through the
+``X-SocialChain-Encoding`` header.  Peers that do not ask for the wire format
+keep getting plain JSON.
+"""
+import io
+import json
+import struct
+import uuid
+import zlib
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from ..blockchain.block import Block
+from ..blockchain.transaction import Transaction
+
+try:
+    import zstandard as _zstd
+    _ZSTD_AVAILABLE = True
+except ImportError:
+    _ZSTD_AVAILABLE = False
+
+WIRE_MEDIA_TYPE = "application/x-socialchain-wire"
+ENCODING_HEADER = "X-SocialChain-Encoding"
+
+MAGIC = b"SCW"
+MAX_MESSAGE = 64 * 1024 * 1024  # decompressed bytes accepted per message
+VERSION = 4  # 2: blocks carry signer and signature; 3: PoW target; 4: pruned bodies
+
+# Message kinds
+MSG_JSON = 1
+MSG_BLOCKS = 2
+MSG_CHAIN = 3
+
+# Compression codecs, most preferred first
+SUPPORTED_ENCODINGS: Tuple[str, ...] = (
+    ("zstd", "zlib", "identity") if _ZSTD_AVAILABLE else ("zlib", "identity")
+)
+
+# String tags
+_TAG_NONE = 0
+_TAG_UTF8 = 1
+_TAG_HEX = 2
+_TAG_DID = 3
+_TAG_UUID = 4
+
+_DID_PREFIX = "did:socialchain:"
+_TX_TYPES = (
+    "transfer", "mining_reward", "registration", "profile_update",
+    "connection", "contract_deploy", "contract_exec",
+    "agent_registration", "agent_task", "agent_status",
+    "governance", "agent_action",
+)
+_TX_TYPE_CODES = {t: i + 1 for i, t in enumerate(_TX_TYPES)}
+
+# Number tags
+_NUM_NONE = 0
+_NUM_FLOAT = 1
+_NUM_INT = 2
+
+_DOUBLE = struct.Struct("<d")
+
+
+class WireError(ValueError):
+    """Raised when a wire message is malformed or uses an unknown codec."""
+
+
+# ---------------------------------------------------------------------------
+# Primitive encoders
+# ---------------------------------------------------------------------------
+
+def _put_varint(out: bytearray, value: int) -> None:
+    if value < 0:
+        raise WireError("varints must be non-negative")
+    while value >= 0x80:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def _put_bytes(out: bytearray, data: bytes) -> None:
+    _put_varint(out, len(data))
+    out += data
+
+
+def _hex_bytes(s: str) -> Optional[bytes]:
+    """Return the raw bytes of *s* if it is lowercase hex that round-trips."""
+    if not s or len(s) % 2:
+        return None
+    try:
+        raw = bytes.fromhex(s)
+    except ValueError:
+        return None
+    return raw if raw.hex() == s else None
+
+
+def _put_str(out: bytearray, s: Optional[str]) -> None:
+    """Write *s* using the most compact tag that reproduces it exactly."""
+    if s is None:
+        out.append(_TAG_NONE)
+        return
+    if s.startswith(_DID_PREFIX):
+        raw = _hex_bytes(s[len(_DID_PREFIX):])
+        if raw is not None:
+            out.append(_TAG_DID)
+            _put_bytes(out, raw)
+            return
+    raw = _hex_bytes(s)
+    if raw is not None:
+        out.append(_TAG_HEX)
+        _put_bytes(out, raw)
+        return
+    if len(s) == 36:
+        try:
+            u = uuid.UUID(s)
+        except ValueError:
+            u = None
+        if u is not None and str(u) == s:
+            out.append(_TAG_UUID)
+            out += u.bytes
+            return
+    out.append(_TAG_UTF8)
+    _put_bytes(out, s.encode("utf-8"))
+
+
+def _canonical_json(obj: Any) -> bytes:
+    return json.dumps(obj, sort_keys=True, separators=(",", ":")).encode("utf-8")
+
+
+def _format_uuid(raw: bytes) -> str:
+    h = raw.hex()
+    return f"{h[:8]}-{h[8:12]}-{h[12:16]}-{h[16:20]}-{h[20:]}"
+
+
+class _Reader:
+    """Sequential decoder over a message body.
+
+    Decoding is on the sync hot path, so the primitives avoid per-field
+    allocations where possible.
+    """
+    __slots__ = ("data", "pos")
+
+    def __init__(self, data: bytes, pos: int = 0):
+        self.data = data
+        self.pos = pos
+
+    def byte(self) -> int:
+        try:
+            value = self.data[self.pos]
+        except IndexError:
+            raise WireError("truncated message")
+        self.pos += 1
+        return value
+
+    def varint(self) -> int:
+        data, pos = self.data, self.pos
+        try:
+            b = data[pos]
+            if b < 0x80:
+                self.pos = pos + 1
+                return b
+            shift = result = 0
+            while True:
+                b = data[pos]
+                pos += 1
+                result |= (b & 0x7F) << shift
+                if b < 0x80:
+                    self.pos = pos
+                    return result
+                shift += 7
+        except IndexError:
+            raise WireError("truncated message")
+
+    def raw(self, n: int) -> bytes:
+        end = self.pos + n
+        if end > len(self.data):
+            raise WireError("truncated message")
+        chunk = self.data[self.pos:end]
+        self.pos = end
+        return chunk
+
+    def bytes_(self) -> bytes:
+        return self.raw(self.varint())
+
+    def double(self) -> float:
+        if self.pos + 8 > len(self.data):
+            raise WireError("truncated message")
+        value = _DOUBLE.unpack_from(self.data, self.pos)[0]
+        self.pos += 8
+        return value
+
+    def str_(self) -> Optional[str]:
+        tag = self.byte()
+        if tag == _TAG_HEX:
+            return self.bytes_().hex()
+        if tag == _TAG_DID:
+            return _DID_PREFIX + self.bytes_().hex()
+        if tag == _TAG_UTF8:
+            return self.bytes_().decode("utf-8")
+        if tag == _TAG_UUID:
+            return _format_uuid(self.raw(16))
+        if tag == _TAG_NONE:
+            return None
+        raise WireError(f"unknown string tag {tag}")
+
+
+# ---------------------------------------------------------------------------
+# Blocks and transactions
+# ---------------------------------------------------------------------------
+#
+# Transaction ``data`` payloads are not written inline: every payload in a
+# message is collected into one canonical JSON array that precedes the block
+# records, so the decoder parses them with a single ``json.loads`` call.
+
+def _put_number(out: bytearray, value) -> None:
+    """Write a timestamp-like number so that ints, floats and None survive
+    unchanged (block hashes depend on their JSON spelling)."""
+    if value is None:
+        out.append(_NUM_NONE)
+    elif isinstance(value, float):
+        out.append(_NUM_FLOAT)
+        out += _DOUBLE.pack(value)
+    elif isinstance(value, int) and value >= 0:
+        out.append(_NUM_INT)
+        _put_varint(out, value)
+    else:
+        raise WireError(f"cannot encode number {value!r}")
+
+
+def _read_number(r: "_Reader"):
+    tag = r.byte()
+    if tag == _NUM_FLOAT:
+        return r.double()
+    if tag == _NUM_INT:
+        return r.varint()
+    if tag == _NUM_NONE:
+        return None
+    raise WireError(f"unknown number tag {tag}")
+
+
+def _put_tx(out: bytearray, tx: Transaction, payloads: List[Any]) -> None:
+    _put_str(out, tx.tx_id)
+    _put_str(out, tx.sender)
+    _put_str(out, tx.recipient)
+    _put_str(out, tx.signature)
+    code = _TX_TYPE_CODES.get(tx.tx_type)
+    if code is None:
+        out.append(0)
+        _put_str(out, tx.tx_type)
+    else:
+        out.append(code)
+    _put_number(out, tx.timestamp)
+    payloads.append(tx.data)
+
+
+def _read_tx(r: "_Reader", payloads) -> Transaction:
+    tx_id = r.str_()
+    sender = r.str_()
+    recipient = r.str_()
+    signature = r.str_()
+    code = r.byte()
+    if code == 0:
+        tx_type = r.str_()
+    elif code <= len(_TX_TYPES):
+        tx_type = _TX_TYPES[code - 1]
+    else:
+        raise WireError(f"unknown transaction type code {code}")
+    timestamp = _read_number(r)
+    try:
+        data = next(payloads)
+    except StopIteration:
+        raise WireError("missing transaction payload")
+    return Transaction(
+        sender=sender, recipient=recipient, data=data, signature=signature,
+        tx_id=tx_id, tx_type=tx_type, timestamp=timestamp,
+    )
+
+
+def _put_block(out: bytearray, block: Block, payloads: List[Any]) -> None:
+    _put_varint(out, block.index)
+    _put_number(out, block.timestamp)
+    _put_varint(out, block.nonce)
+    _put_str(out, block.previous_hash)
+    _put_str(out, block.hash)
+    _put_str(out, block.signer)
+    _put_str(out, block.signature)
+    _put_str(out, block.target_hex)
+    _put_str(out, block.merkle_root if block.pruned else None)
+    if block.pruned:
+        _put_varint(out, block.tx_count)
+    _put_varint(out, len(block.transactions))
+    for tx in block.transactions:
+        _put_tx(out, tx, payloads)
+
+
+def _read_block(r: "_Reader", payloads) -> Block:
+    index = r.varint()
+    timestamp = _read_number(r)
+    nonce = r.varint()
+    previous_hash = r.str_()
+    block_hash = r.str_()
+    signer = r.str_()
+    signature = r.str_()
+    target = r.str_()
+    pruned_root = r.str_()
+    tx_count = r.varint() if pruned_root else 0
+    transactions = [_read_tx(r, payloads) for _ in range(r.varint())]
+    return Block(
+        index=index, transactions=transactions, previous_hash=previous_hash,
+        nonce=nonce, timestamp=timestamp, block_hash=block_hash,
+        signer=signer, signature=signature,
+        target=int(target, 16) if target else None,
+        merkle_root=pruned_root, tx_count=tx_count,
+    )
+
+
+# ---------------------------------------------------------------------------
+# Messages
+# ---------------------------------------------------------------------------
+
+def _header(kind: int) -> bytearray:
+    out = bytearray(MAGIC)
+    out.append(VERSION)
+    out.append(kind)
+    return out
+
+
+def encode_json(obj: Any) -> bytes:
+    """Wrap an arbitrary JSON payload (e.g. a broadcast) as a wire message."""
+    out = _header(MSG_JSON)
+    out += _canonical_json(obj)
+    return bytes(out)
+
+
+def _with_payloads(kind: int, body: bytearray, payloads: List[Any]) -> bytes:
+    out = _header(kind)
+    _put_bytes(out, _canonical_json(payloads))
+    out += body
+    return bytes(out)
+
+
+def encode_blocks(blocks: Iterable[Block]) -> bytes:
+    blocks = list(blocks)
+    body, payloads = bytearray(), []
+    _put_varint(body, len(blocks))
+    for block in blocks:
+        _put_block(body, block, payloads)
+    return _with_payloads(MSG_BLOCKS, body, payloads)
+
+
+def encode_chain(blocks: Iterable[Block], pending: Iterable[Transaction]) -> bytes:
+    """Encode a full-chain sync response (blocks plus pending transactions)."""
+    blocks = list(blocks)
+    pending = list(pending)
+    body, payloads = bytearray(), []
+    _put_varint(body, len(blocks))
+    for block in blocks:
+        _put_block(body, block, payloads)
+    _put_varint(body, len(pending))
+    for tx in pending:
+        _put_tx(body, tx, payloads)
+    return _with_payloads(MSG_CHAIN, body, payloads)
+
+
+def decode(data: bytes) -> Tuple[int, Any]:
+    """Decode an uncompressed message into ``(kind, value)``.
+
+    ``value`` is the JSON object for ``MSG_JSON``, a list of blocks for
+    ``MSG_BLOCKS`` and ``{"chain": [...], "length": n,
+    "pending_transactions": [...]}`` with Block/Transaction objects for
+    ``MSG_CHAIN``.
+    """
+    if len(data) < 5 or data[:3] != MAGIC:
+        raise WireError("not a SocialChain wire message")
+    if data[3] != VERSION:
+        raise WireError(f"unsupported wire version {data[3]}")
+    kind = data[4]
+    if kind == MSG_JSON:
+        return kind, json.loads(bytes(data[5:]))
+    if kind not in (MSG_BLOCKS, MSG_CHAIN):
+        raise WireError(f"unknown message kind {kind}")
+    r = _Reader(bytes(data), 5)
+    try:
+        payloads = iter(json.loads(r.bytes_()))
+    except ValueError:
+        raise WireError("malformed transaction payloads")
+    chain = [_read_block(r, payloads) for _ in range(r.varint())]
+    if kind == MSG_BLOCKS:
+        return kind, chain
+    pending = [_read_tx(r, payloads) for _ in range(r.varint())]
+    return kind, {"chain": chain, "length": len(chain), "pending_transactions": pending}
+
+
+# ---------------------------------------------------------------------------
+# Compression and negotiation
+# ---------------------------------------------------------------------------
+
+def compress(data: bytes, encoding: str) -> bytes:
+    if encoding == "identity":
+        return data
+    if encoding == "zlib":
+        return zlib.compress(data, 6)
+    if encoding == "zstd" and _ZSTD_AVAILABLE:
+        return _zstd.ZstdCompressor(level=3).compress(data)
+    raise WireError(f"unsupported encoding {encoding!r}")
+
+
+def decompress(data: bytes, encoding: str) -> bytes:
+    """Decompress *data*, raising WireError for a corrupt stream or one
+    that expands beyond MAX_MESSAGE bytes."""
+    if encoding == "identity":
+        return data
+    if encoding == "zlib":
+        decompressor = zlib.decompressobj()
+        try:
+            out = decompressor.decompress(data, MAX_MESSAGE)
+        except zlib.error as e:
+            raise WireError(f"corrupt zlib stream: {e}") from None
+        if decompressor.unconsumed_tail:
+            raise WireError(f"message exceeds {MAX_MESSAGE} bytes")
+        if not decompressor.eof or decompressor.unused_data:
+            raise WireError("truncated or trailing zlib data")
+        return out
+    if encoding == "zstd" and _ZSTD_AVAILABLE:
+        try:
+            size = _zstd.frame_content_size(data)  # -1 when not recorded
+            if size > MAX_MESSAGE:
+                raise WireError(f"message exceeds {MAX_MESSAGE} bytes")
+            with _zstd.ZstdDecompressor().stream_reader(io.BytesIO(data)) as reader:
+                out = reader.read(MAX_MESSAGE + 1)
+        except _zstd.ZstdError as e:
+            raise WireError(f"corrupt zstd stream: {e}") from None
+        if len(out) > MAX_MESSAGE:
+            raise WireError(f"message exceeds {MAX_MESSAGE} bytes")
+        if size >= 0 and len(out) != size:
+            raise WireError("truncated zstd data")
+        return out
+    raise WireError(f"unsupported encoding {encoding!r}")
+
+
+def choose_encoding(offered: Optional[str]) -> str:
+    """Pick the first codec from a comma-separated client list we support."""
+    for name in (offered or "").split(","):
+        name = name.strip().lower()
+        if name in SUPPORTED_ENCODINGS:
+            return name
+    return "identity"
+
+
+def accepts_wire(accept_header: Optional[str]) -> bool:
+    return WIRE_MEDIA_TYPE in (accept_header or "")
+
+
+def request_headers(encodings: Optional[Iterable[str]] = None) -> Dict[str, str]:
+    """Headers a client sends to ask for the wire format."""
+    return {
+        "Accept": f"{WIRE_MEDIA_TYPE}, application/json;q=0.5",
+        ENCODING_HEADER: ", ".join(encodings or SUPPORTED_ENCODINGS),
+    }
+
+
+def pack(message: bytes, encoding: str) -> Tuple[bytes, Dict[str, str]]:
+    """Compress *message* and return it with the matching response headers."""
+    return compress(message, encoding), {
+        "Content-Type": WIRE_MEDIA_TYPE,
+        ENCODING_HEADER: encoding,
+    }
+
+
+def unpack(body: bytes, headers) -> Optional[Tuple[int, Any]]:
+    """Decode a response/request body if it is a wire message, else None."""
+    content_type = headers.get("Content-Type", "") or ""
+    if not content_type.startswith(WIRE_MEDIA_TYPE):
+        return None
+    return decode(decompress(body, headers.get(ENCODING_HEADER, "identity")))
@@ -2,11 +2,14 @@ from .profile import Profile, DeviceType
 from .network_map import NetworkMap
 from .request import SocialRequest, RequestAction, RequestStatus
 from .trust import TrustGraph, TrustEdge, TrustLevel, score_to_trust_level
+from .reputation import ReputationEngine, TrustMatrix
+from .personalized import WalkBank
 from .sybil import SybilResistance, Vouch, VouchStatus, VerificationLevel
 
 __all__ = [
     "Profile", "DeviceType", "NetworkMap",
     "SocialRequest", "RequestAction", "RequestStatus",
     "TrustGraph", "TrustEdge", "TrustLevel", "score_to_trust_level",
+    "ReputationEngine", "TrustMatrix", "WalkBank",
     "SybilResistance", "Vouch", "VouchStatus", "VerificationLevel",
 ]
@@ -0,0 +1,440 @@
+"""Bulk import and export of the trust graph and vouches.
+
+Two streaming formats carry the same records: identities without edges,
+the trust edges of every context (raw score and timestamp), and vouches.
+
+* NDJSON (``application/x-ndjson``): a header line, then one JSON object per
+  record with a ``"type"`` of ``node``, ``edge`` or ``vouch``; easy to
+  produce or inspect with other tools.
+* A compact binary edge list (``application/x-socialchain-trust``): every
+  DID, context, vouch id and message is interned once in a string table,
+  and records are fixed-width arrays of table indices, scores and
+  timestamps, decoded a section at a time with ``struct.iter_unpack``.
+
+Exports are generators of byte chunks, so they can be streamed straight
+into an HTTP response or a file.  Imports read a stream in batches of up to
+``BATCH_SIZE`` records; each batch is validated as a whole (a binary section
+checks its score column in one pass) and only then applied in one call
+(``TrustGraph.add_edges``, ``SybilResistance.add_vouches``), so an invalid
+record stops the import with exactly the batches before it loaded.
+
+``main`` is the command-line front end, e.g. to seed a staging node from a
+production snapshot::
+
+    python -m socialchain.social.bulk convert snapshot-....json.gz trust.bin
+    python -m socialchain.social.bulk push trust.bin http://staging:5000
+"""
+import argparse
+import gzip
+import itertools
+import json
+import struct
+import sys
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from .sybil import SybilResistance, Vouch, VouchStatus
+from .trust import TrustEdge, TrustGraph
+
+FORMATS = ("ndjson", "binary")
+MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "binary": "application/x-socialchain-trust",
+}
+FORMAT_NAME = "socialchain-trust"
+FORMAT_VERSION = 1
+BATCH_SIZE = 10000  # records per validated batch / binary section
+
+MAGIC = b"SCTG"
+
+# Binary sections: a (tag, count) header followed by count records
+_SECTION = struct.Struct("<BI")
+_SEC_END = 0
+_SEC_STRINGS = 1  # each: u32 length + UTF-8 bytes, appended to the table
+_SEC_NODES = 2  # each: did
+_SEC_EDGES = 3  # each: truster, trustee, context, score, timestamp
+_SEC_VOUCHES = 4  # each: vouch_id, voucher, vouchee, message, status, timestamp
+
+_LENGTH = struct.Struct("<I")
+_NODE = struct.Struct("<I")
+_EDGE = struct.Struct("<IIIdd")
+_VOUCH = struct.Struct("<IIIIBd")
+_STATUSES = list(VouchStatus)
+
+# (kind, objects) batches handed from the readers to ``load``
+Batch = Tuple[str, list]
+
+
+# ── Export ──────────────────────────────────────────────────────────────────
+
+def _isolated_nodes(graph: TrustGraph) -> Iterator[str]:
+    for did in graph.list_nodes():
+        if not graph.get_trustees(did) and not graph.get_trusters(did):
+            yield did
+
+
+def _batched(items: Iterable, size: int) -> Iterator[list]:
+    batch = []
+    for item in items:
+        batch.append(item)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def _ndjson_chunks(graph: TrustGraph, sybil: Optional[SybilResistance]) -> Iterator[bytes]:
+    encode = json.JSONEncoder(separators=(",", ":")).encode
+    yield (encode({"type": "header", "format": FORMAT_NAME, "version": FORMAT_VERSION}) + "\n").encode()
+    for batch in _batched(_isolated_nodes(graph), BATCH_SIZE):
+        yield "".join(encode({"type": "node", "did": did}) + "\n" for did in batch).encode()
+    for batch in _batched(graph.iter_edges(), BATCH_SIZE):
+        yield "".join(
+            encode({
+                "type": "edge",
+                "truster_did": edge.truster_did,
+                "trustee_did": edge.trustee_did,
+                "score": edge.score,
+                "context": edge.context,
+                "timestamp": edge.timestamp,
+            }) + "\n"
+            for edge in batch
+        ).encode()
+    if sybil is not None:
+        for batch in _batched(sybil.iter_vouches(), BATCH_SIZE):
+            yield "".join(
+                encode({"type": "vouch", **vouch.to_dict()}) + "\n" for vouch in batch
+            ).encode()
+
+
+class _StringTable:
+    """Interns strings for the binary writer, remembering the ones not yet
+    written out."""
+
+    def __init__(self):
+        self.ids: Dict[str, int] = {}
+        self.pending: List[str] = []
+
+    def __call__(self, value: str) -> int:
+        index = self.ids.get(value)
+        if index is None:
+            index = self.ids[value] = len(self.ids)
+            self.pending.append(value)
+        return index
+
+    def flush(self) -> bytes:
+        if not self.pending:
+            return b""
+        parts = [_SECTION.pack(_SEC_STRINGS, len(self.pending))]
+        for value in self.pending:
+            encoded = value.encode()
+            parts.append(_LENGTH.pack(len(encoded)))
+            parts.append(encoded)
+        self.pending = []
+        return b"".join(parts)
+
+
+def _binary_chunks(graph: TrustGraph, sybil: Optional[SybilResistance]) -> Iterator[bytes]:
+    table = _StringTable()
+    yield MAGIC + bytes([FORMAT_VERSION])
+    for batch in _batched(_isolated_nodes(graph), BATCH_SIZE):
+        body = b"".join(_NODE.pack(table(did)) for did in batch)
+        yield table.flush() + _SECTION.pack(_SEC_NODES, len(batch)) + body
+    for batch in _batched(graph.iter_edges(), BATCH_SIZE):
+        body = b"".join(
+            _EDGE.pack(table(edge.truster_did), table(edge.trustee_did), table(edge.context),
+                       edge.score, edge.timestamp)
+            for edge in batch
+        )
+        yield table.flush() + _SECTION.pack(_SEC_EDGES, len(batch)) + body
+    if sybil is not None:
+        for batch in _batched(sybil.iter_vouches(), BATCH_SIZE):
+            body = b"".join(
+                _VOUCH.pack(table(vouch.vouch_id), table(vouch.voucher_did),
+                            table(vouch.vouchee_did), table(vouch.message),
+                            _STATUSES.index(vouch.status), vouch.timestamp)
+                for vouch in batch
+            )
+            yield table.flush() + _SECTION.pack(_SEC_VOUCHES, len(batch)) + body
+    yield _SECTION.pack(_SEC_END, 0)
+
+
+def export_chunks(graph: TrustGraph, fmt: str = "ndjson",
+                  sybil: Optional[SybilResistance] = None) -> Iterator[bytes]:
+    """Stream *graph* (and the vouches of *sybil*) in format *fmt*."""
+    if fmt not in FORMATS:
+        raise ValueError(f"Unknown bulk format: {fmt}")
+    if fmt == "binary":
+        return _binary_chunks(graph, sybil)
+    return _ndjson_chunks(graph, sybil)
+
+
+def dump(graph: TrustGraph, stream, fmt: str = "ndjson",
+         sybil: Optional[SybilResistance] = None) -> int:
+    """Write an export to the binary file-like *stream*.  Returns the
+    number of bytes written."""
+    written = 0
+    for chunk in export_chunks(graph, fmt, sybil):
+        stream.write(chunk)
+        written += len(chunk)
+    return written
+
+
+# ── Import ──────────────────────────────────────────────────────────────────
+
+def _read_exact(stream, size: int) -> bytes:
+    parts, remaining = [], size
+    while remaining:
+        part = stream.read(remaining)
+        if not part:
+            raise ValueError("Truncated trust file")
+        parts.append(part)
+        remaining -= len(part)
+    return b"".join(parts)
+
+
+def _did(value) -> str:
+    if not isinstance(value, str) or not value:
+        raise ValueError("DID must be a non-empty string")
+    return value
+
+
+def _ndjson_record(item: dict):
+    """Validate one NDJSON record and build its object."""
+    kind = item.get("type")
+    if kind == "node":
+        return "nodes", _did(item.get("did"))
+    if kind == "edge":
+        score, timestamp = item.get("score"), item.get("timestamp")
+        context = item.get("context", "general")
+        if isinstance(score, bool) or not isinstance(score, (int, float)):
+            raise ValueError("Trust score must be a number")
+        if timestamp is not None and not isinstance(timestamp, (int, float)):
+            raise ValueError("Timestamp must be a number")
+        if not isinstance(context, str):
+            raise ValueError("Context must be a string")
+        return "edges", TrustEdge(_did(item.get("truster_did")), _did(item.get("trustee_did")),
+                                  score, context, timestamp)
+    if kind == "vouch":
+        vouch = Vouch.from_dict(item)
+        _did(vouch.voucher_did)
+        _did(vouch.vouchee_did)
+        return "vouches", vouch
+    raise ValueError(f"Unknown record type {kind!r}")
+
+
+def _read_ndjson(stream, first: bytes = b"") -> Iterator[Batch]:
+    lines = iter(stream)
+    if first:
+        lines = itertools.chain([first + next(lines, b"")], lines)
+    batch: Dict[str, list] = {"nodes": [], "edges": [], "vouches": []}
+    pending = 0
+    for number, line in enumerate(lines, 1):
+        if not line.strip():
+            continue
+        try:
+            item = json.loads(line)
+            if not isinstance(item, dict):
+                raise ValueError("not a JSON object")
+            if item.get("type") == "header":
+                if item.get("format") != FORMAT_NAME or item.get("version", 0) > FORMAT_VERSION:
+                    raise ValueError("unsupported trust file")
+                continue
+            kind, value = _ndjson_record(item)
+        except (KeyError, TypeError, ValueError) as e:
+            raise ValueError(f"Line {number}: {e}") from None
+        batch[kind].append(value)
+        pending += 1
+        if pending >= BATCH_SIZE:
+            yield from batch.items()
+            batch = {"nodes": [], "edges": [], "vouches": []}
+            pending = 0
+    yield from batch.items()
+
+
+def _binary_edges(data: bytes, table: List[str], seen: int) -> List[TrustEdge]:
+    rows = list(_EDGE.iter_unpack(data))
+    # Validate the whole section before building any edge; struct already
+    # guarantees the types, so only ranges and empty DIDs need checking
+    scores = [row[3] for row in rows]
+    if rows and (min(scores) < -1.0 or max(scores) > 1.0):
+        bad = next(i for i, score in enumerate(scores) if not -1.0 <= score <= 1.0)
+        raise ValueError(f"Edge {seen + bad + 1}: Trust score must be between -1.0 and 1.0")
+    if "" in table:
+        empty = table.index("")
+        for i, row in enumerate(rows):
+            if empty in (row[0], row[1]):
+                raise ValueError(f"Edge {seen + i + 1}: DID must be a non-empty string")
+    return [
+        TrustEdge(table[a], table[b], score, table[c], timestamp)
+        for a, b, c, score, timestamp in rows
+    ]
+
+
+def _read_binary(stream, first: bytes = b"") -> Iterator[Batch]:
+    header = first + _read_exact(stream, len(MAGIC) + 1 - len(first))
+    if header[:len(MAGIC)] != MAGIC:
+        raise ValueError("Not a binary trust file")
+    if header[len(MAGIC)] > FORMAT_VERSION:
+        raise ValueError(f"Unsupported trust file version: {header[len(MAGIC)]}")
+    table: List[str] = []
+    edges_seen = 0
+    while True:
+        tag, count = _SECTION.unpack(_read_exact(stream, _SECTION.size))
+        if tag == _SEC_END:
+            return
+        try:
+            if tag == _SEC_STRINGS:
+                for _ in range(count):
+                    length = _LENGTH.unpack(_read_exact(stream, _LENGTH.size))[0]
+                    table.append(_read_exact(stream, length).decode())
+            elif tag == _SEC_NODES:
+                nodes = [table[i] for (i,) in _NODE.iter_unpack(_read_exact(stream, count * _NODE.size))]
+                if "" in nodes:
+                    raise ValueError("DID must be a non-empty string")
+                yield "nodes", nodes
+            elif tag == _SEC_EDGES:
+                data = _read_exact(stream, count * _EDGE.size)
+                yield "edges", _binary_edges(data, table, edges_seen)
+                edges_seen += count
+            elif tag == _SEC_VOUCHES:
+                data = _read_exact(stream, count * _VOUCH.size)
+                yield "vouches", [
+                    Vouch(table[voucher], table[vouchee], vouch_id=table[vid],
+                          status=_STATUSES[status], message=table[message], timestamp=timestamp)
+                    for vid, voucher, vouchee, message, status, timestamp
+                    in _VOUCH.iter_unpack(data)
+                ]
+            else:
+                raise ValueError(f"Unknown section {tag} in trust file")
+        except IndexError:
+            raise ValueError("Trust file refers to an unknown string or status") from None
+        except UnicodeDecodeError:
+            raise ValueError("Trust file holds invalid UTF-8") from None
+
+
+def read_batches(stream, fmt: Optional[str] = None) -> Iterator[Batch]:
+    """Parse a bulk file from the binary file-like *stream* into validated
+    ``(kind, objects)`` batches: identities (``"nodes"``), TrustEdges
+    (``"edges"``) and Vouches (``"vouches"``).  The format is detected from
+    the first bytes if not given."""
+    first = b""
+    if fmt is None:
+        first = stream.read(1)
+        fmt = "binary" if first == MAGIC[:1] else "ndjson"
+    if fmt not in FORMATS:
+        raise ValueError(f"Unknown bulk format: {fmt}")
+    if fmt == "binary":
+        return _read_binary(stream, first)
+    return _read_ndjson(stream, first)
+
+
+def load(graph: TrustGraph, stream, fmt: Optional[str] = None,
+         sybil: Optional[SybilResistance] = None) -> Dict[str, int]:
+    """Import a bulk file into *graph* (and its vouches into *sybil*; they
+    are skipped without one).  Returns counts of what was loaded; raises
+    ValueError at the first invalid record, after loading every batch
+    before it."""
+    counts = {"nodes": 0, "edges": 0, "vouches": 0}
+    try:
+        for kind, objects in read_batches(stream, fmt):
+            if kind == "nodes":
+                for did in objects:
+                    graph.add_node(did)
+                counts["nodes"] += len(objects)
+            elif kind == "edges":
+                counts["edges"] += graph.add_edges(objects)
+            elif sybil is not None:
+                counts["vouches"] += sybil.add_vouches(objects, recompute=False)
+    finally:
+        # Verification levels are rebuilt once for the whole import (or
+        # for the batches loaded before an invalid record)
+        if counts["vouches"]:
+            sybil.recompute_levels()
+    return counts
+
+
+# ── Command line ────────────────────────────────────────────────────────────
+
+def _format_for(path: str, fmt: Optional[str]) -> str:
+    if fmt:
+        return fmt
+    return "binary" if path.endswith((".bin", ".sctg")) else "ndjson"
+
+
+def _open(path: str, mode: str = "rb"):
+    if path == "-":
+        return sys.stdin.buffer if "r" in mode else sys.stdout.buffer
+    if path.endswith(".gz"):
+        return gzip.open(path, mode)
+    return open(path, mode)
+
+
+def _read_source(path: str) -> Tuple[TrustGraph, SybilResistance]:
+    """Load a node snapshot (``.json`` / ``.json.gz``) or a bulk file."""
+    if path.endswith((".json", ".json.gz")):
+        with _open(path) as f:
+            snapshot = json.loads(f.read())
+        graph = TrustGraph.from_dict(snapshot.get("trust_graph", {}))
+        return graph, SybilResistance.from_dict(snapshot.get("vouches", {}), graph)
+    graph = TrustGraph()
+    sybil = SybilResistance(graph)
+    with _open(path) as f:
+        load(graph, f, sybil=sybil)
+    return graph, sybil
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m socialchain.social.bulk",
+        description="Bulk import/export of the SocialChain trust graph and vouches.",
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+    convert = commands.add_parser(
+        "convert", help="convert a snapshot or bulk file to a bulk file")
+    convert.add_argument("source", help="snapshot (.json[.gz]) or bulk file")
+    convert.add_argument("output", help="bulk file to write ('-' for stdout)")
+    convert.add_argument("--format", choices=FORMATS,
+                         help="output format (default: from the extension; .bin is binary)")
+    push = commands.add_parser("push", help="import a snapshot or bulk file into a node")
+    push.add_argument("source", help="snapshot (.json[.gz]) or bulk file")
+    push.add_argument("url", help="node base URL, e.g. http://localhost:5000")
+    pull = commands.add_parser("pull", help="export a node's trust graph to a bulk file")
+    pull.add_argument("url", help="node base URL")
+    pull.add_argument("output", help="bulk file to write ('-' for stdout)")
+    pull.add_argument("--format", choices=FORMATS)
+    args = parser.parse_args(argv)
+
+    if args.command == "convert":
+        graph, sybil = _read_source(args.source)
+        with _open(args.output, "wb") as f:
+            dump(graph, f, _format_for(args.output, args.format), sybil)
+        print(f"{graph.get_node_count():,} identities, {graph.get_edge_count():,} edges",
+              file=sys.stderr)
+        return 0
+
+    import requests
+
+    endpoint = args.url.rstrip("/") + "/api/governance/trust/bulk"
+    if args.command == "push":
+        graph, sybil = _read_source(args.source)
+        response = requests.post(
+            endpoint, data=export_chunks(graph, "binary", sybil),
+            headers={"Content-Type": MEDIA_TYPES["binary"]},
+        )
+        print(response.text.strip(), file=sys.stderr)
+        return 0 if response.ok else 1
+
+    fmt = _format_for(args.output, args.format)
+    response = requests.get(endpoint, params={"format": fmt}, stream=True)
+    if not response.ok:
+        print(response.text.strip(), file=sys.stderr)
+        return 1
+    with _open(args.output, "wb") as f:
+        for chunk in response.iter_content(chunk_size=1 << 16):
+            f.write(chunk)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
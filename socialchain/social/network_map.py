@@ -1,24 +1,25 @@
 from typing import Dict, List, Optional, Tuple
+from ..blockchain.interner import DIDS
 from .profile import Profile
 
 
 class NetworkMap:
     def __init__(self):
         self._profiles: Dict[str, Profile] = {}
-        self._connections: Dict[str, List[str]] = {}  # did -> list of connected dids
+        self._connections: Dict[int, List[int]] = {}  # did id -> connected did ids (see DIDS)
 
     def add_profile(self, profile: Profile) -> None:
         self._profiles[profile.did] = profile
-        if profile.did not in self._connections:
-            self._connections[profile.did] = []
+        self._connections.setdefault(DIDS.intern(profile.did), [])
 
     def remove_profile(self, did: str) -> bool:
         if did in self._profiles:
             del self._profiles[did]
-            self._connections.pop(did, None)
+            node = DIDS.get(did)
+            self._connections.pop(node, None)
             for connections in self._connections.values():
-                if did in connections:
-                    connections.remove(did)
+                if node in connections:
+                    connections.remove(node)
             return True
         return False
 
@@ -28,17 +29,19 @@ class NetworkMap:
     def add_connection(self, did_a: str, did_b: str) -> bool:
         if did_a not in self._profiles or did_b not in self._profiles:
             return False
-        if did_b not in self._connections[did_a]:
-            self._connections[did_a].append(did_b)
-        if did_a not in self._connections[did_b]:
-            self._connections[did_b].append(did_a)
+        a, b = DIDS.get(did_a), DIDS.get(did_b)
+        if b not in self._connections[a]:
+            self._connections[a].append(b)
+        if a not in self._connections[b]:
+            self._connections[b].append(a)
         return True
 
     def get_connections(self, did: str) -> List[str]:
-        return self._connections.get(did, [])
+        return [DIDS.did(node) for node in self._connections.get(DIDS.get(did), [])]
 
     def visualize(self) -> Dict[str, List[str]]:
-        return {did: list(conns) for did, conns in self._connections.items()}
+        return {DIDS.did(node): [DIDS.did(c) for c in conns]
+                for node, conns in self._connections.items()}
 
     def list_profiles(self) -> List[Profile]:
         return list(self._profiles.values())
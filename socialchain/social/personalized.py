@@ -0,0 +1,201 @@
+"""Personalized (viewer-relative) trust ranking by Monte Carlo random walks.
+
+Global reputation ranks identities the same way for everyone.  Personalized
+PageRank instead asks how often a random walk that keeps restarting at the
+*viewer* visits each identity: identities the viewer trusts, and those they
+trust in turn, score highest.
+
+``WalkBank`` keeps ``walks_per_node`` short walk segments per identity.  A
+segment starts at its owner and, at each step, stops with probability
+``reset_probability``; otherwise it moves along a positive trust edge chosen
+with probability proportional to the edge's effective score (a walk stops
+at an identity that trusts nobody).  Edges are those of the bank's trust
+``context`` (the graph's default view unless given) and are weighted with
+``TrustGraph.scorer``, so trust decay applies as in every other trust
+query; effective scores are fixed for one ``decay_bucket`` of the graph,
+and all segments are discarded and regrown lazily when it moves on.  The share of a viewer's segment visits that
+land on a target estimates the viewer's personalized PageRank of it.
+
+Segments are generated lazily, the first time an identity of the graph is
+queried as a viewer (``build`` precomputes them).  At most ``max_viewers``
+identities keep segments; the least recently queried one is dropped to make
+room.  The bank listens to its TrustGraph: when an edge from ``u`` changes,
+only segments passing through ``u`` are resampled, from their first visit to
+``u`` onwards.
+"""
+import itertools
+import random
+from bisect import bisect_right
+from collections import OrderedDict
+import threading
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+WalkKey = Tuple[str, int]  # (owner, segment number)
+
+
+class WalkBank:
+    WALKS_PER_NODE = 32
+    RESET_PROBABILITY = 0.15
+    MAX_WALK_LENGTH = 100  # safety bound; expected length is 1 / reset
+    MAX_VIEWERS = 10000  # identities whose segments are kept (LRU)
+
+    def __init__(self, graph, walks_per_node: Optional[int] = None,
+                 reset_probability: Optional[float] = None, seed: Optional[int] = None,
+                 max_viewers: Optional[int] = None, context: Any = None):
+        self.graph = graph
+        self.context = graph._context_key(context)  # ValueError if invalid
+        self.walks_per_node = walks_per_node or self.WALKS_PER_NODE
+        self.max_viewers = max_viewers or self.MAX_VIEWERS
+        self.reset_probability = reset_probability or self.RESET_PROBABILITY
+        if not 0 < self.reset_probability <= 1:
+            raise ValueError("reset_probability must be in (0, 1]")
+        self._rng = random.Random(seed)
+        self._lock = threading.RLock()
+        self._walks: "OrderedDict[str, List[List[str]]]" = OrderedDict()  # LRU order
+        self._through: Dict[str, Set[WalkKey]] = {}  # did -> segments visiting it
+        # did -> (trustees, cumulative scores) of its positive out-edges
+        self._transitions: Dict[str, Tuple[List[str], List[float]]] = {}
+        self.resampled = 0  # segments resampled after edge changes
+        self.evicted = 0  # viewers whose segments were dropped
+        self.refreshed = 0  # times every segment was dropped for decay
+        self._bucket = graph.decay_bucket()
+        self._scorer = graph.scorer()
+        graph.add_edge_listener(self._on_edge_change)
+
+    def close(self) -> None:
+        """Stop following the graph."""
+        self.graph.remove_edge_listener(self._on_edge_change)
+
+    # ------------------------------------------------------------------
+    # Walks
+    # ------------------------------------------------------------------
+
+    def _step(self, did: str) -> Optional[str]:
+        transitions = self._transitions.get(did)
+        if transitions is None:
+            weighted = [(e.trustee_did, self._scorer(e)) for e in self.graph.get_trustees(did, self.context)]
+            weighted = [(trustee, score) for trustee, score in weighted if score is not None and score > 0]
+            transitions = self._transitions[did] = (
+                [trustee for trustee, _ in weighted],
+                list(itertools.accumulate(score for _, score in weighted)),
+            )
+        trustees, cumulative = transitions
+        if not trustees:
+            return None
+        i = bisect_right(cumulative, self._rng.random() * cumulative[-1])
+        return trustees[min(i, len(trustees) - 1)]
+
+    def _extend(self, walk: List[str]) -> List[str]:
+        while len(walk) < self.MAX_WALK_LENGTH and self._rng.random() >= self.reset_probability:
+            nxt = self._step(walk[-1])
+            if nxt is None:
+                break
+            walk.append(nxt)
+        return walk
+
+    def _index(self, key: WalkKey, walk: List[str]) -> None:
+        for did in set(walk):
+            self._through.setdefault(did, set()).add(key)
+
+    def _unindex(self, key: WalkKey, walk: List[str]) -> None:
+        for did in set(walk):
+            keys = self._through.get(did)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._through[did]
+
+    def _ensure(self, did: str) -> List[List[str]]:
+        walks = self._walks.get(did)
+        if walks is not None:
+            self._walks.move_to_end(did)
+            return walks
+        while len(self._walks) >= self.max_viewers:
+            owner, dropped = self._walks.popitem(last=False)
+            for i, walk in enumerate(dropped):
+                self._unindex((owner, i), walk)
+            self.evicted += 1
+        walks = self._walks[did] = []
+        for i in range(self.walks_per_node):
+            walk = self._extend([did])
+            walks.append(walk)
+            self._index((did, i), walk)
+        return walks
+
+    def _refresh(self) -> None:
+        """Drop every segment once the graph's decay bucket has moved on,
+        since the effective scores they were sampled with are out of date."""
+        bucket = self.graph.decay_bucket()
+        if bucket == self._bucket:
+            return
+        self._bucket = bucket
+        self._scorer = self.graph.scorer()
+        self._walks.clear()
+        self._through.clear()
+        self._transitions.clear()
+        self.refreshed += 1
+
+    def build(self) -> int:
+        """Generate segments for identities of the graph that have none, up
+        to ``max_viewers`` of them.  Returns the number of identities added."""
+        with self._lock:
+            self._refresh()
+            room = self.max_viewers - len(self._walks)
+            missing = [did for did in self.graph.list_nodes() if did not in self._walks]
+            for did in missing[:max(room, 0)]:
+                self._ensure(did)
+            return min(len(missing), max(room, 0))
+
+    def _on_edge_change(self, truster_did: str, trustee_did: str) -> None:
+        with self._lock:
+            self._transitions.pop(truster_did, None)
+            for key in list(self._through.get(truster_did, ())):
+                owner, i = key
+                walk = self._walks[owner][i]
+                self._unindex(key, walk)
+                fresh = self._extend(walk[:walk.index(truster_did) + 1])
+                self._walks[owner][i] = fresh
+                self._index(key, fresh)
+                self.resampled += 1
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+
+    def scores(self, viewer: str) -> Dict[str, float]:
+        """Estimated personalized PageRank of every identity the viewer's
+        walks reach (the viewer included); the scores sum to 1.  Empty for
+        a viewer that is not in the graph."""
+        if not self.graph.has_node(viewer):
+            return {}
+        with self._lock:
+            self._refresh()
+            walks = self._ensure(viewer)
+            visits: Dict[str, int] = {}
+            total = 0
+            for walk in walks:
+                for did in walk:
+                    visits[did] = visits.get(did, 0) + 1
+                total += len(walk)
+        return {did: count / total for did, count in visits.items()}
+
+    def score(self, viewer: str, target: str) -> float:
+        return self.scores(viewer).get(target, 0.0)
+
+    def top_k(self, viewer: str, k: int = 10) -> List[Tuple[str, float]]:
+        """The *k* identities the viewer trusts most, best first."""
+        ranked = [(did, s) for did, s in self.scores(viewer).items() if did != viewer]
+        ranked.sort(key=lambda item: (-item[1], item[0]))
+        return ranked[:k]
+
+    def to_dict(self) -> dict:
+        return {
+            "walks_per_node": self.walks_per_node,
+            "reset_probability": self.reset_probability,
+            "viewers": len(self._walks),
+            "max_viewers": self.max_viewers,
+            "evicted": self.evicted,
+            "segments": sum(len(w) for w in self._walks.values()),
+            "resampled": self.resampled,
+            "refreshed": self.refreshed,
+        }
@@ -0,0 +1,184 @@
+"""Sparse-matrix reputation engine.
+
+Reputation is the fixed point of
+
+    r[v] = (1 - d) / n + d * sum(score(u -> v) * r[u] for positive edges u -> v)
+
+normalised so that the highest score is 1.  Edge scores are used as they
+are (not normalised by the truster's out-degree), so identities that trust
+nobody ("dangling" nodes) pass nothing on and simply keep the teleport
+term; the final max-normalisation removes the overall scale.
+
+``TrustMatrix`` lays the positive edges out in compressed sparse row (CSR)
+form with one row per trustee, so an iteration is a single mat-vec product.
+The product runs on SciPy when it is installed, else on NumPy, else in pure
+Python over the same CSR arrays.  Iteration stops once the max-normalised
+vector changes by less than ``tolerance`` (L1) between iterations, or after
+``max_iterations``.
+
+Passing the previous run's raw vector (``engine.raw``) as *initial*
+warm-starts the iteration: after a few edge changes it is already close to
+the new fixed point, so only a few iterations run.
+"""
+from typing import Dict, List, Optional, Sequence
+
+from ..blockchain.interner import DIDS
+
+try:
+    import numpy as _np
+    _NUMPY_AVAILABLE = True
+except ImportError:
+    _NUMPY_AVAILABLE = False
+
+try:
+    import scipy.sparse as _sparse
+    _SCIPY_AVAILABLE = True
+except ImportError:
+    _SCIPY_AVAILABLE = False
+
+BACKENDS = tuple(
+    name for name, available in (
+        ("scipy", _SCIPY_AVAILABLE and _NUMPY_AVAILABLE),
+        ("numpy", _NUMPY_AVAILABLE),
+        ("python", True),
+    ) if available
+)
+
+
+class TrustMatrix:
+    """Positive trust edges of a graph in CSR form: row ``i`` holds the
+    trusters of ``nodes[i]`` (column indices) and their scores."""
+
+    def __init__(self, nodes: Sequence[str], indptr: List[int],
+                 indices: List[int], data: List[float]):
+        self.nodes = list(nodes)
+        self.indptr = indptr
+        self.indices = indices
+        self.data = data
+
+    @classmethod
+    def from_graph(cls, graph, context=None, as_of: Optional[float] = None) -> "TrustMatrix":
+        """Build from the edges *context* sees, weighted by their effective
+        scores as of *as_of* (see ``TrustGraph.scorer``)."""
+        ids = graph.node_ids()
+        position = {did_id: i for i, did_id in enumerate(ids)}
+        trusters = graph.adjacency(context)[1]
+        weigh = graph.scorer(as_of)
+        indptr, indices, data = [0], [], []
+        for did_id in ids:
+            for truster, edge in trusters.get(did_id, {}).items():
+                score = weigh(edge)
+                if score is not None and score > 0:
+                    indices.append(position[truster])
+                    data.append(score)
+            indptr.append(len(indices))
+        return cls([DIDS.did(did_id) for did_id in ids], indptr, indices, data)
+
+    def __len__(self) -> int:
+        return len(self.nodes)
+
+    @property
+    def nnz(self) -> int:
+        return len(self.data)
+
+
+class ReputationEngine:
+    def __init__(self, damping: float = 0.85, max_iterations: int = 20,
+                 tolerance: float = 1e-9, backend: Optional[str] = None):
+        if backend is None:
+            backend = BACKENDS[0]
+        if backend not in BACKENDS:
+            raise ValueError(f"Reputation backend not available: {backend}")
+        self.damping = damping
+        self.max_iterations = max_iterations
+        self.tolerance = tolerance
+        self.backend = backend
+        self.iterations = 0  # iterations run by the last compute()
+        self.raw: Dict[str, float] = {}  # unnormalised vector of the last compute()
+
+    def compute(self, graph, initial: Optional[Dict[str, float]] = None,
+                context=None, as_of: Optional[float] = None) -> Dict[str, float]:
+        """Normalised reputation of every node of *graph* (a TrustGraph)
+        over the edges *context* sees as of *as_of*, starting from the raw
+        vector *initial* if given."""
+        return self.compute_matrix(TrustMatrix.from_graph(graph, context, as_of), initial)
+
+    def compute_matrix(self, matrix: TrustMatrix,
+                       initial: Optional[Dict[str, float]] = None) -> Dict[str, float]:
+        if not len(matrix):
+            self.iterations = 0
+            self.raw = {}
+            return {}
+        n = len(matrix)
+        start = [1.0 / n] * n
+        if initial:
+            start = [initial.get(did, 1.0 / n) for did in matrix.nodes]
+        if self.backend == "python":
+            raw, scores = self._iterate_python(matrix, start)
+        else:
+            raw, scores = self._iterate_vectorized(matrix, start)
+            raw, scores = raw.tolist(), scores.tolist()
+        # Where the scores keep growing (the trust matrix has spectral
+        # radius above 1/d) only their direction matters; rescale so that
+        # repeated warm starts cannot overflow
+        peak = max(raw)
+        if peak > 1.0:
+            raw = [r / peak for r in raw]
+        self.raw = dict(zip(matrix.nodes, raw))
+        return dict(zip(matrix.nodes, scores))
+
+    # ------------------------------------------------------------------
+
+    def _iterate_vectorized(self, matrix: TrustMatrix, start: List[float]):
+        n = len(matrix)
+        indptr = _np.asarray(matrix.indptr, dtype=_np.int64)
+        indices = _np.asarray(matrix.indices, dtype=_np.int64)
+        data = _np.asarray(matrix.data, dtype=_np.float64)
+        if self.backend == "scipy":
+            product = _sparse.csr_matrix((data, indices, indptr), shape=(n, n)).dot
+        else:
+            rows = _np.repeat(_np.arange(n), _np.diff(indptr))
+
+            def product(x):
+                return _np.bincount(rows, weights=data * x[indices], minlength=n)
+
+        teleport = (1 - self.damping) / n
+        rep = _np.asarray(start, dtype=_np.float64)
+        normalized = rep / rep.max()
+        self.iterations = 0
+        for _ in range(self.max_iterations):
+            rep = teleport + self.damping * product(rep)
+            self.iterations += 1
+            peak = rep.max()
+            current = rep / peak if peak > 0 else rep
+            delta = float(_np.abs(current - normalized).sum())
+            normalized = current
+            if delta < self.tolerance:
+                break
+        return rep, normalized
+
+    def _iterate_python(self, matrix: TrustMatrix, start: List[float]):
+        n = len(matrix)
+        indptr, indices, data = matrix.indptr, matrix.indices, matrix.data
+        teleport = (1 - self.damping) / n
+        damping = self.damping
+        rep = list(start)
+        peak = max(rep)
+        normalized = [r / peak for r in rep]
+        self.iterations = 0
+        for _ in range(self.max_iterations):
+            new_rep = [0.0] * n
+            for row in range(n):
+                total = 0.0
+                for k in range(indptr[row], indptr[row + 1]):
+                    total += data[k] * rep[indices[k]]
+                new_rep[row] = teleport + damping * total
+            rep = new_rep
+            self.iterations += 1
+            peak = max(rep)
+            current = [r / peak for r in rep] if peak > 0 else rep
+            delta = sum(abs(a - b) for a, b in zip(current, normalized))
+            normalized = current
+            if delta < self.tolerance:
+                break
+        return rep, normalized
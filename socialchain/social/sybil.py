@@ -8,9 +8,11 @@ get legitimate users to vouch for them.
 """
 import time
 import uuid
+from collections import deque
 from enum import Enum
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set
 
+from ..blockchain.interner import DIDS
 from .trust import TrustGraph, TrustLevel, score_to_trust_level
 
 
@@ -37,7 +39,10 @@ VERIFICATION_REQUIREMENTS = {
 
 
 class Vouch:
-    """A vouching relationship where one identity vouches for another's legitimacy."""
+    """A vouching relationship where one identity vouches for another's legitimacy.
+    Both parties are held as interned ids (see ``DIDS``)."""
+
+    __slots__ = ("vouch_id", "voucher_id", "vouchee_id", "status", "message", "timestamp")
 
     def __init__(self, voucher_did: str, vouchee_did: str,
                  vouch_id: Optional[str] = None,
@@ -45,12 +50,20 @@ class Vouch:
                  message: str = "",
                  timestamp: Optional[float] = None):
         self.vouch_id = vouch_id or str(uuid.uuid4())
-        self.voucher_did = voucher_did
-        self.vouchee_did = vouchee_did
+        self.voucher_id = DIDS.intern(voucher_did)
+        self.vouchee_id = DIDS.intern(vouchee_did)
         self.status = status
         self.message = message
         self.timestamp = timestamp or time.time()
 
+    @property
+    def voucher_did(self) -> str:
+        return DIDS.did(self.voucher_id)
+
+    @property
+    def vouchee_did(self) -> str:
+        return DIDS.did(self.vouchee_id)
+
     def to_dict(self) -> dict:
         return {
             "vouch_id": self.vouch_id,
@@ -80,13 +93,28 @@ class SybilResistance:
     graph structure analysis - legitimate social clusters have dense internal
     connections, while Sybil clusters connect to the honest region through
     a small number of attack edges.
+
+    Verification levels are kept at a fixed point for every identity: a
+    level depends on the identity's accepted vouches and on whether each
+    voucher is verified itself.  ``_dependents`` indexes voucher -> vouchees
+    of accepted vouches, so a vouch change re-evaluates only identities
+    downstream of it, and a level lookup is a dictionary read.
+
+    Each verified identity also has a *rank*: it meets a requirement
+    counting only verified vouchers of lower rank.  Ranks make every
+    verification traceable to vouchers that need no verified vouches, so a
+    group of identities vouching for each other cannot keep itself
+    verified once its outside support is revoked.
     """
 
     def __init__(self, trust_graph: TrustGraph):
         self.trust_graph = trust_graph
         self._vouches: Dict[str, Vouch] = {}  # vouch_id -> Vouch
-        self._identity_vouches: Dict[str, List[str]] = {}  # did -> [vouch_ids received]
-        self._verification_cache: Dict[str, VerificationLevel] = {}
+        self._identity_vouches: Dict[int, List[str]] = {}  # did id -> [vouch_ids received]
+        # voucher id -> {vouchee id -> accepted vouches between them}
+        self._dependents: Dict[int, Dict[int, int]] = {}
+        self._levels: Dict[int, VerificationLevel] = {}  # absent: UNVERIFIED
+        self._ranks: Dict[int, int] = {}  # verified identity -> rank
 
     def create_vouch(self, voucher_did: str, vouchee_did: str,
                      message: str = "") -> Vouch:
@@ -95,20 +123,15 @@ class SybilResistance:
             raise ValueError("Cannot vouch for yourself")
 
         # Check for duplicate vouches
-        for vouch_id in self._identity_vouches.get(vouchee_did, []):
+        voucher = DIDS.get(voucher_did)
+        for vouch_id in self._identity_vouches.get(DIDS.get(vouchee_did), []):
             vouch = self._vouches[vouch_id]
-            if vouch.voucher_did == voucher_did and vouch.status != VouchStatus.REVOKED:
+            if vouch.voucher_id == voucher and vouch.status != VouchStatus.REVOKED:
                 raise ValueError("Already vouched for this identity")
 
         vouch = Vouch(voucher_did, vouchee_did, message=message)
         self._vouches[vouch.vouch_id] = vouch
-        if vouchee_did not in self._identity_vouches:
-            self._identity_vouches[vouchee_did] = []
-        self._identity_vouches[vouchee_did].append(vouch.vouch_id)
-
-        # Invalidate verification cache for vouchee
-        self._verification_cache.pop(vouchee_did, None)
-
+        self._identity_vouches.setdefault(vouch.vouchee_id, []).append(vouch.vouch_id)
         return vouch
 
     def accept_vouch(self, vouch_id: str) -> Vouch:
@@ -125,8 +148,8 @@ class SybilResistance:
             vouch.voucher_did, vouch.vouchee_did, 0.8, context="vouch"
         )
 
-        # Invalidate cache
-        self._verification_cache.pop(vouch.vouchee_did, None)
+        self._link(vouch)
+        self._propagate({vouch.vouchee_id})
         return vouch
 
     def revoke_vouch(self, vouch_id: str) -> Vouch:
@@ -134,20 +157,22 @@ class SybilResistance:
         vouch = self._vouches.get(vouch_id)
         if not vouch:
             raise ValueError("Vouch not found")
+        if vouch.status == VouchStatus.ACCEPTED:
+            self._unlink(vouch)
         vouch.status = VouchStatus.REVOKED
 
-        # Update trust graph
+        # Update trust graph: the vouch layer no longer holds the edge
+        self.trust_graph.remove_trust(vouch.voucher_did, vouch.vouchee_did, context="vouch")
         self.trust_graph.set_trust(
             vouch.voucher_did, vouch.vouchee_did, -0.5, context="vouch_revoked"
         )
 
-        # Invalidate cache
-        self._verification_cache.pop(vouch.vouchee_did, None)
+        self._propagate({vouch.vouchee_id})
         return vouch
 
     def get_vouches_for(self, did: str) -> List[Vouch]:
         """Get all vouches received by an identity."""
-        vouch_ids = self._identity_vouches.get(did, [])
+        vouch_ids = self._identity_vouches.get(DIDS.get(did), [])
         return [self._vouches[vid] for vid in vouch_ids if vid in self._vouches]
 
     def get_accepted_vouches_for(self, did: str) -> List[Vouch]:
@@ -155,32 +180,105 @@ class SybilResistance:
         return [v for v in self.get_vouches_for(did) if v.status == VouchStatus.ACCEPTED]
 
     def compute_verification_level(self, did: str) -> VerificationLevel:
-        """Compute the verification level for an identity based on its vouches."""
-        if did in self._verification_cache:
-            return self._verification_cache[did]
-
-        accepted = self.get_accepted_vouches_for(did)
-        total_vouches = len(accepted)
-
-        # Count vouches from verified users (at least BASIC level)
-        verified_vouches = 0
-        for vouch in accepted:
-            voucher_level = self._verification_cache.get(vouch.voucher_did,
-                                                         VerificationLevel.UNVERIFIED)
-            if voucher_level != VerificationLevel.UNVERIFIED:
-                verified_vouches += 1
-
-        level = VerificationLevel.UNVERIFIED
+        """The verification level of an identity based on its vouches."""
+        return self._levels.get(DIDS.get(did), VerificationLevel.UNVERIFIED)
+
+    def _evaluate(self, node: int, below: Optional[int] = None,
+                  excluded: Set[int] = frozenset()):
+        """The (level, rank) *node* earns from its accepted vouches, given
+        the current levels of its vouchers; rank is None when unverified.
+        Vouchers in *excluded*, or ranked *below* or higher, count as
+        unverified."""
+        total_vouches = 0
+        ranks = []  # of verified vouchers
+        for vouch_id in self._identity_vouches.get(node, ()):
+            vouch = self._vouches[vouch_id]
+            if vouch.status == VouchStatus.ACCEPTED:
+                total_vouches += 1
+                rank = self._ranks.get(vouch.voucher_id)
+                if (rank is not None and vouch.voucher_id not in excluded
+                        and (below is None or rank < below)):
+                    ranks.append(rank)
+        ranks.sort()
+
+        level, best = VerificationLevel.UNVERIFIED, None
         for check_level in [VerificationLevel.TRUSTED, VerificationLevel.STANDARD,
                             VerificationLevel.BASIC]:
             reqs = VERIFICATION_REQUIREMENTS[check_level]
-            if (total_vouches >= reqs["min_vouches"]
-                    and verified_vouches >= reqs["min_verified_vouches"]):
-                level = check_level
-                break
-
-        self._verification_cache[did] = level
-        return level
+            needed = reqs["min_verified_vouches"]
+            if total_vouches >= reqs["min_vouches"] and len(ranks) >= needed:
+                if level == VerificationLevel.UNVERIFIED:
+                    level = check_level
+                rank = ranks[needed - 1] + 1 if needed else 0
+                best = rank if best is None else min(best, rank)
+        return level, best
+
+    def _link(self, vouch: Vouch) -> None:
+        vouchees = self._dependents.setdefault(vouch.voucher_id, {})
+        vouchees[vouch.vouchee_id] = vouchees.get(vouch.vouchee_id, 0) + 1
+
+    def _unlink(self, vouch: Vouch) -> None:
+        vouchees = self._dependents[vouch.voucher_id]
+        vouchees[vouch.vouchee_id] -= 1
+        if not vouchees[vouch.vouchee_id]:
+            del vouchees[vouch.vouchee_id]
+            if not vouchees:
+                del self._dependents[vouch.voucher_id]
+
+    def _propagate(self, changed: Set[int]) -> None:
+        """Bring levels back to their fixed point after the accepted vouches
+        of the *changed* identities were modified.
+
+        First, verified identities that lost all support from lower-ranked
+        vouchers are reset, together with any of their vouchees that relied
+        on them, transitively.  Then levels are re-evaluated in worklist
+        order from the changed and reset identities, re-queuing an
+        identity's vouchees whenever it becomes verified.
+        """
+        lost: Set[int] = set()
+        touched = set(changed)
+        stack = list(changed)
+        while stack:
+            node = stack.pop()
+            rank = self._ranks.get(node)
+            if rank is None or node in lost:
+                continue
+            if self._evaluate(node, below=rank, excluded=lost)[1] is None:
+                lost.add(node)
+                touched.update(self._dependents.get(node, ()))
+                stack.extend(self._dependents.get(node, ()))
+        for node in lost:
+            self._levels.pop(node, None)
+            del self._ranks[node]
+
+        worklist = deque(touched)
+        queued = set(touched)
+        while worklist:
+            node = worklist.popleft()
+            queued.discard(node)
+            was_verified = node in self._ranks
+            level, rank = self._evaluate(node)
+            if rank is None:
+                self._levels.pop(node, None)
+                self._ranks.pop(node, None)
+                continue
+            self._levels[node] = level
+            self._ranks[node] = rank
+            if not was_verified:
+                for vouchee in self._dependents.get(node, ()):
+                    if vouchee not in queued:
+                        queued.add(vouchee)
+                        worklist.append(vouchee)
+
+    def recompute_levels(self) -> None:
+        """Rebuild the dependency index and every level from scratch."""
+        self._dependents = {}
+        self._levels = {}
+        self._ranks = {}
+        for vouch in self._vouches.values():
+            if vouch.status == VouchStatus.ACCEPTED:
+                self._link(vouch)
+        self._propagate(set(self._identity_vouches))
 
     def detect_sybil_cluster(self, suspect_did: str, min_cluster_size: int = 3) -> Dict[str, Any]:
         """Analyze the trust graph around a suspect identity for Sybil patterns.
@@ -242,9 +340,41 @@ class SybilResistance:
     def get_vouch(self, vouch_id: str) -> Optional[Vouch]:
         return self._vouches.get(vouch_id)
 
+    def add_vouches(self, vouches: Iterable[Vouch], recompute: bool = True) -> int:
+        """Register existing vouches (from a snapshot or bulk import),
+        replacing any with the same id.  Their trust edges are expected to
+        be present in the trust graph already.  Returns the number added.
+
+        With ``recompute=False`` verification levels are left stale, so a
+        caller adding many batches can run ``recompute_levels`` once at the
+        end."""
+        count = 0
+        for vouch in vouches:
+            previous = self._vouches.get(vouch.vouch_id)
+            if previous is not None:
+                self._identity_vouches[previous.vouchee_id].remove(vouch.vouch_id)
+            self._vouches[vouch.vouch_id] = vouch
+            self._identity_vouches.setdefault(vouch.vouchee_id, []).append(vouch.vouch_id)
+            count += 1
+        if count and recompute:
+            self.recompute_levels()
+        return count
+
+    def iter_vouches(self) -> Iterator[Vouch]:
+        return iter(list(self._vouches.values()))
+
     def to_dict(self) -> dict:
         return {
             "total_vouches": len(self._vouches),
             "identities_tracked": len(self._identity_vouches),
+            "verified_identities": len(self._levels),
             "vouches": [v.to_dict() for v in self._vouches.values()],
         }
+
+    @classmethod
+    def from_dict(cls, d: dict, trust_graph: TrustGraph) -> "SybilResistance":
+        """Restore vouches from ``to_dict`` output.  Their trust edges are
+        expected to be present in *trust_graph* already."""
+        sybil = cls(trust_graph)
+        sybil.add_vouches(Vouch.from_dict(vouch_data) for vouch_data in d.get("vouches", []))
+        return sybil
@@ -5,9 +5,14 @@ and reputation computation using eigenvector-like centrality measures. Trust
 relationships are directional and weighted, allowing asymmetric trust between
 participants in the network.
 """
+import heapq
 import time
+import uuid
 from enum import Enum
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from ..blockchain.interner import DIDS
+from .reputation import ReputationEngine
 
 
 class TrustLevel(str, Enum):
@@ -48,18 +53,31 @@ def score_to_trust_level(score: float) -> TrustLevel:
 
 
 class TrustEdge:
-    """A directed, weighted trust relationship between two identities."""
+    """A directed, weighted trust relationship between two identities.
+
+    The identities are held as interned ids (see ``DIDS``); ``truster_did``
+    and ``trustee_did`` give the DIDs back."""
+
+    __slots__ = ("truster_id", "trustee_id", "score", "context", "timestamp")
 
     def __init__(self, truster_did: str, trustee_did: str, score: float,
                  context: str = "general", timestamp: Optional[float] = None):
         if not -1.0 <= score <= 1.0:
             raise ValueError("Trust score must be between -1.0 and 1.0")
-        self.truster_did = truster_did
-        self.trustee_did = trustee_did
+        self.truster_id = DIDS.intern(truster_did)
+        self.trustee_id = DIDS.intern(trustee_did)
         self.score = score
         self.context = context
         self.timestamp = timestamp or time.time()
 
+    @property
+    def truster_did(self) -> str:
+        return DIDS.did(self.truster_id)
+
+    @property
+    def trustee_did(self) -> str:
+        return DIDS.did(self.trustee_id)
+
     def to_dict(self) -> dict:
         return {
             "truster_did": self.truster_did,
@@ -70,6 +88,21 @@ class TrustEdge:
             "trust_level": score_to_trust_level(self.score).value,
         }
 
+    def effective_score(self, as_of: Optional[float] = None,
+                        half_life: Optional[float] = None) -> Optional[float]:
+        """The score as of *as_of* (default now), halved for every
+        *half_life* seconds since the edge was set (no decay if None).
+        None if the edge was set after *as_of*."""
+        if as_of is None:
+            if not half_life:
+                return self.score
+            as_of = time.time()
+        if self.timestamp > as_of:
+            return None
+        if not half_life:
+            return self.score
+        return self.score * 0.5 ** ((as_of - self.timestamp) / half_life)
+
     @classmethod
     def from_dict(cls, d: dict) -> "TrustEdge":
         return cls(
@@ -81,6 +114,36 @@ class TrustEdge:
         )
 
 
+class CombinedTrustEdge(TrustEdge):
+    """An edge of a weighted context combination: the weighted sum of its
+    ``parts`` (``(weight, edge)`` pairs), clamped to [-1, 1].  Each part
+    decays from its own timestamp."""
+
+    __slots__ = ("parts",)
+
+    def __init__(self, parts: List[Tuple[float, TrustEdge]], context: str):
+        first = parts[0][1]
+        self.truster_id = first.truster_id
+        self.trustee_id = first.trustee_id
+        score = sum(weight * edge.score for weight, edge in parts)
+        self.score = max(min(score, 1.0), -1.0)
+        self.context = context
+        self.timestamp = max(edge.timestamp for _, edge in parts)
+        self.parts = parts
+
+    def effective_score(self, as_of: Optional[float] = None,
+                        half_life: Optional[float] = None) -> Optional[float]:
+        if as_of is None and half_life:
+            as_of = time.time()
+        scores = [
+            (weight, edge.effective_score(as_of, half_life)) for weight, edge in self.parts
+        ]
+        scores = [weight * score for weight, score in scores if score is not None]
+        if not scores:
+            return None
+        return max(min(sum(scores), 1.0), -1.0)
+
+
 class TrustGraph:
     """Directed weighted trust graph for computing reputation and trust propagation.
 
@@ -90,146 +153,489 @@ class TrustGraph:
     - Trust propagation through transitive paths with decay
     - Reputation scoring via iterative convergence (PageRank-like)
     - Trust context (e.g., 'governance', 'trade', 'general')
+
+    Each context is its own layer of edges over the shared set of
+    identities, so a vouch does not overwrite governance trust.  Queries
+    take a *context*: ``None`` (the default) sees, for each pair, the most
+    recently set edge across all layers; a name sees that layer alone; a
+    mapping ``{context: weight}`` sees the weighted sum of the layers'
+    scores (clamped to [-1, 1]).  Reputation is cached per context.
+
+    With a ``half_life`` (seconds), trust decays exponentially with the age
+    of its edge.  Edges keep their raw score and timestamp; the decayed
+    score is computed when an edge is read by a query, which may also ask
+    for its result ``as_of`` an earlier time (edges set later are then
+    ignored; edges overwritten or removed since are not recovered).
+
+    Internally identities are interned ids (``DIDS``): the adjacency maps
+    are keyed by them and DIDs are converted only at the public methods.
+    The default view shares the single layer's maps until a second context
+    appears, and only then keeps maps of its own.
     """
 
     PROPAGATION_DECAY = 0.5  # Trust decays by half per hop
     MAX_PROPAGATION_DEPTH = 3  # Maximum hops for trust propagation
     REPUTATION_DAMPING = 0.85  # PageRank-style damping factor
-    REPUTATION_ITERATIONS = 20  # Convergence iterations
-
-    def __init__(self):
-        # truster_did -> {trustee_did -> TrustEdge}
-        self._edges: Dict[str, Dict[str, TrustEdge]] = {}
-        self._nodes: set = set()
+    REPUTATION_ITERATIONS = 20  # Maximum convergence iterations
+    REPUTATION_TOLERANCE = 1e-9  # L1 change of normalised scores to stop at
+    MAX_CACHED_VIEWS = 16  # contexts / combinations whose results are kept
+    TRUST_HALF_LIFE: Optional[float] = None  # seconds; None disables decay
+    # With decay on, reputation "now" is reused until time moves on by this
+    # fraction of the half-life
+    DECAY_RESOLUTION = 0.01
+
+    def __init__(self, half_life: Optional[float] = None):
+        if half_life is None:
+            half_life = self.TRUST_HALF_LIFE
+        if half_life is not None and half_life <= 0:
+            raise ValueError("half_life must be positive")
+        self.half_life = half_life
+        # context -> truster id -> {trustee id -> TrustEdge}, and the
+        # reverse adjacency context -> trustee id -> {truster id -> TrustEdge}
+        self._layers: Dict[str, Dict[int, Dict[int, TrustEdge]]] = {}
+        self._in_layers: Dict[str, Dict[int, Dict[int, TrustEdge]]] = {}
+        self._layer_versions: Dict[str, int] = {}
+        # The default view: the most recent edge of each pair, any context.
+        # None while there is at most one context (its layer is the view).
+        self._edges: Optional[Dict[int, Dict[int, TrustEdge]]] = None
+        self._in_edges: Optional[Dict[int, Dict[int, TrustEdge]]] = None
+        self._nodes: Set[int] = set()
+        # Bumped by every change to nodes or edges; the maintained
+        # reputation is recomputed when it falls behind
+        self.version = 0
+        self.epoch = uuid.uuid4().hex[:12]  # distinguishes versions across restarts
+        # context key -> (stamp, out-edges, in-edges) of weighted combinations
+        self._views: Dict[Any, tuple] = {}
+        # context key -> (stamp, scores, raw vector)
+        self._reputation: Dict[Any, tuple] = {}
+        self.reputation_iterations = 0  # iterations of the last recomputation
+        self._edge_listeners: List[Callable[[str, str], None]] = []
 
     def add_node(self, did: str) -> None:
         """Register an identity in the trust graph."""
-        self._nodes.add(did)
-        if did not in self._edges:
-            self._edges[did] = {}
+        did_id = DIDS.intern(did)
+        if did_id not in self._nodes:
+            self._nodes.add(did_id)
+            self.version += 1
+
+    def _put_edge(self, edge: TrustEdge) -> None:
+        self.add_edges([edge])
+
+    def add_edges(self, edges: Iterable[TrustEdge]) -> int:
+        """Insert edges (replacing those of the same pair and context),
+        bumping ``version`` once; used for single edges and bulk loads
+        alike (see ``social.bulk``).  Returns the number of edges added."""
+        edges = list(edges)
+        nodes = self._nodes
+        layers: Dict[str, tuple] = {}  # context -> (out-edges, in-edges)
+        for edge in edges:
+            truster, trustee, context = edge.truster_id, edge.trustee_id, edge.context
+            if truster not in nodes or trustee not in nodes:
+                self.version += (truster not in nodes) + (trustee not in nodes)
+                nodes.add(truster)
+                nodes.add(trustee)
+            layer = layers.get(context)
+            if layer is None:
+                if self._edges is None and self._layers and context not in self._layers:
+                    self._split_default_view()
+                layer = layers[context] = (
+                    self._layers.setdefault(context, {}), self._in_layers.setdefault(context, {}),
+                )
+            layer[0].setdefault(truster, {})[trustee] = edge
+            layer[1].setdefault(trustee, {})[truster] = edge
+            if self._edges is not None:
+                current = self._edges.get(truster, {}).get(trustee)
+                if current is None or edge.timestamp >= current.timestamp:
+                    self._set_merged(truster, trustee, edge)
+                elif current.context == context:
+                    self._set_merged(truster, trustee, self._latest(truster, trustee))
+        for context in layers:
+            self._layer_versions[context] = self._layer_versions.get(context, 0) + 1
+        if edges:
+            self.version += 1
+            for edge in edges:
+                self._notify(edge.truster_did, edge.trustee_did)
+        return len(edges)
+
+    def _split_default_view(self) -> None:
+        """Give the default view maps of its own (a second context is
+        about to appear), copied from the single existing layer."""
+        (name,) = self._layers
+        self._edges = {truster: dict(edges) for truster, edges in self._layers[name].items()}
+        self._in_edges = {trustee: dict(edges) for trustee, edges in self._in_layers[name].items()}
+
+    def _latest(self, truster: int, trustee: int) -> Optional[TrustEdge]:
+        latest = None
+        for layer in self._layers.values():
+            edge = layer.get(truster, {}).get(trustee)
+            if edge is not None and (latest is None or edge.timestamp >= latest.timestamp):
+                latest = edge
+        return latest
+
+    def _set_merged(self, truster: int, trustee: int, edge: Optional[TrustEdge]) -> None:
+        if edge is not None:
+            self._edges.setdefault(truster, {})[trustee] = edge
+            self._in_edges.setdefault(trustee, {})[truster] = edge
+            return
+        for adjacency, a, b in ((self._edges, truster, trustee), (self._in_edges, trustee, truster)):
+            neighbours = adjacency.get(a)
+            if neighbours is not None:
+                neighbours.pop(b, None)
+                if not neighbours:
+                    del adjacency[a]
 
     def set_trust(self, truster_did: str, trustee_did: str, score: float,
                   context: str = "general") -> TrustEdge:
-        """Set or update a direct trust relationship."""
-        self.add_node(truster_did)
-        self.add_node(trustee_did)
+        """Set or update a direct trust relationship within *context*."""
         edge = TrustEdge(truster_did, trustee_did, score, context)
-        self._edges[truster_did][trustee_did] = edge
+        self._put_edge(edge)
         return edge
 
-    def get_trust(self, truster_did: str, trustee_did: str) -> Optional[TrustEdge]:
+    def remove_trust(self, truster_did: str, trustee_did: str,
+                     context: Optional[str] = None) -> bool:
+        """Remove the direct trust edge between two identities in *context*,
+        or in every context if None (both identities stay in the graph).
+        Returns False if there was none."""
+        truster, trustee = DIDS.get(truster_did), DIDS.get(trustee_did)
+        names = list(self._layers) if context is None else [context]
+        removed = False
+        for name in names:
+            edges = self._layers.get(name, {}).get(truster)
+            if not edges or trustee not in edges:
+                continue
+            del edges[trustee]
+            if not edges:
+                del self._layers[name][truster]
+            trusters = self._in_layers[name][trustee]
+            del trusters[truster]
+            if not trusters:
+                del self._in_layers[name][trustee]
+            self._layer_versions[name] += 1
+            removed = True
+        if not removed:
+            return False
+        if self._edges is not None:
+            self._set_merged(truster, trustee, self._latest(truster, trustee))
+        self.version += 1
+        self._notify(truster_did, trustee_did)
+        return True
+
+    def add_edge_listener(self, listener: Callable[[str, str], None]) -> None:
+        """Call *listener(truster_did, trustee_did)* whenever an edge is set,
+        updated or removed."""
+        if listener not in self._edge_listeners:
+            self._edge_listeners.append(listener)
+
+    def remove_edge_listener(self, listener: Callable[[str, str], None]) -> None:
+        if listener in self._edge_listeners:
+            self._edge_listeners.remove(listener)
+
+    def _notify(self, truster_did: str, trustee_did: str) -> None:
+        for listener in list(self._edge_listeners):
+            listener(truster_did, trustee_did)
+
+    # ------------------------------------------------------------------
+    # Contexts
+    # ------------------------------------------------------------------
+
+    def list_contexts(self) -> List[str]:
+        """Contexts that currently hold at least one edge."""
+        return sorted(name for name, layer in self._layers.items() if layer)
+
+    @staticmethod
+    def _context_key(context: Any) -> Any:
+        """Normalise a context argument: None, a context name, or a sorted
+        tuple of ``(name, weight)`` pairs with positive weights."""
+        if context is None or isinstance(context, str):
+            return context
+        weights = []
+        for name, weight in sorted(dict(context).items()):
+            if not isinstance(weight, (int, float)) or weight < 0:
+                raise ValueError(f"Context weight must be a non-negative number: {name}")
+            if weight:
+                weights.append((name, float(weight)))
+        if not weights:
+            raise ValueError("A context combination needs at least one positive weight")
+        if len(weights) == 1 and weights[0][1] == 1.0:
+            return weights[0][0]
+        return tuple(weights)
+
+    def _stamp(self, key: Any) -> Any:
+        """Changes whenever the view *key* (see ``_context_key``) may have."""
+        if key is None:
+            return self.version
+        names = [key] if isinstance(key, str) else [name for name, _ in key]
+        return tuple(self._layer_versions.get(name, 0) for name in names), len(self._nodes)
+
+    def _remember(self, cache: Dict[Any, tuple], key: Any, entry: tuple) -> None:
+        cache.pop(key, None)
+        cache[key] = entry
+        while len(cache) > self.MAX_CACHED_VIEWS:
+            del cache[next(iter(cache))]
+
+    def adjacency(self, context: Any = None) -> Tuple[dict, dict]:
+        """(out-edges, in-edges) of the view *context* sees: read-only maps
+        ``{id: {id: TrustEdge}}`` keyed by interned DID ids (see ``DIDS``)."""
+        key = self._context_key(context)
+        if key is None:
+            if self._edges is not None:
+                return self._edges, self._in_edges
+            key = next(iter(self._layers), "")
+        if isinstance(key, str):
+            return self._layers.get(key, {}), self._in_layers.get(key, {})
+        stamp = self._stamp(key)
+        cached = self._views.get(key)
+        if cached is not None and cached[0] == stamp:
+            return cached[1], cached[2]
+        label = "+".join(name for name, _ in key)
+        parts: Dict[Tuple[int, int], List[Tuple[float, TrustEdge]]] = {}
+        for name, weight in key:
+            for truster, edges in self._layers.get(name, {}).items():
+                for trustee, edge in edges.items():
+                    parts.setdefault((truster, trustee), []).append((weight, edge))
+        out: Dict[int, Dict[int, TrustEdge]] = {}
+        into: Dict[int, Dict[int, TrustEdge]] = {}
+        for (truster, trustee), pair_parts in parts.items():
+            edge = CombinedTrustEdge(pair_parts, context=label)
+            out.setdefault(truster, {})[trustee] = edge
+            into.setdefault(trustee, {})[truster] = edge
+        self._remember(self._views, key, (stamp, out, into))
+        return out, into
+
+    def scorer(self, as_of: Optional[float] = None) -> Callable[[TrustEdge], Optional[float]]:
+        """A function giving an edge's effective score as of *as_of*
+        (default now) under ``half_life``, or None for edges set after
+        *as_of*.  "Now" is fixed when the scorer is made, so a whole
+        computation sees a single instant."""
+        half_life = self.half_life
+        if as_of is None:
+            if not half_life:
+                return lambda edge: edge.score
+            as_of = time.time()
+        return lambda edge: edge.effective_score(as_of, half_life)
+
+    def decay_bucket(self, now: Optional[float] = None) -> Optional[int]:
+        """Counts DECAY_RESOLUTION steps of the half-life; results computed
+        "now" are reused while it stays the same.  None without decay."""
+        if not self.half_life:
+            return None
+        if now is None:
+            now = time.time()
+        return int(now // (self.half_life * self.DECAY_RESOLUTION))
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+
+    def get_trust(self, truster_did: str, trustee_did: str,
+                  context: Any = None) -> Optional[TrustEdge]:
         """Get the direct trust edge between two identities."""
-        return self._edges.get(truster_did, {}).get(trustee_did)
-
-    def get_direct_trust_score(self, truster_did: str, trustee_did: str) -> float:
-        """Get the direct trust score, or 0.0 if no relationship exists."""
-        edge = self.get_trust(truster_did, trustee_did)
-        return edge.score if edge else 0.0
-
-    def get_trustees(self, did: str) -> List[TrustEdge]:
+        truster, trustee = DIDS.get(truster_did), DIDS.get(trustee_did)
+        return self.adjacency(context)[0].get(truster, {}).get(trustee)
+
+    def get_direct_trust_score(self, truster_did: str, trustee_did: str,
+                               context: Any = None, as_of: Optional[float] = None) -> float:
+        """Get the direct (effective) trust score, or 0.0 if no relationship
+        exists."""
+        edge = self.get_trust(truster_did, trustee_did, context)
+        score = self.scorer(as_of)(edge) if edge else None
+        return 0.0 if score is None else score
+
+    def get_trustees(self, did: str, context: Any = None) -> List[TrustEdge]:
         """Get all identities that a given identity trusts."""
-        return list(self._edges.get(did, {}).values())
+        return list(self.adjacency(context)[0].get(DIDS.get(did), {}).values())
 
-    def get_trusters(self, did: str) -> List[TrustEdge]:
+    def get_trusters(self, did: str, context: Any = None) -> List[TrustEdge]:
         """Get all identities that trust a given identity."""
-        trusters = []
-        for truster_did, edges in self._edges.items():
-            if did in edges:
-                trusters.append(edges[did])
-        return trusters
+        return list(self.adjacency(context)[1].get(DIDS.get(did), {}).values())
 
     def propagated_trust(self, source_did: str, target_did: str,
-                         max_depth: Optional[int] = None) -> float:
+                         max_depth: Optional[int] = None, context: Any = None,
+                         as_of: Optional[float] = None) -> float:
         """Compute trust from source to target via transitive trust propagation.
 
-        Uses BFS with exponential decay: trust at depth d is multiplied by
-        PROPAGATION_DECAY^d. This implements Shapiro's principle that trust
-        weakens with social distance.
+        Trust along a path is the product of its edge scores, decayed by
+        PROPAGATION_DECAY per hop; this implements Shapiro's principle that
+        trust weakens with social distance.  See ``propagated_trust_from``.
+        """
+        return self.trust_path(source_did, target_did, max_depth, context, as_of)[0]
+
+    def trust_path(self, source_did: str, target_did: str, max_depth: Optional[int] = None,
+                   context: Any = None, as_of: Optional[float] = None) -> Tuple[float, List[str]]:
+        """Propagated trust from source to target and the path witnessing
+        it, or ``(0.0, [])`` if the target is out of reach."""
+        if as_of is None and self.half_life:
+            as_of = time.time()
+        direct = self.get_direct_trust_score(source_did, target_did, context, as_of)
+        if direct != 0.0:
+            return direct, [source_did, target_did]
+        reachable = self.propagated_trust_from(source_did, max_depth, context, as_of)
+        return reachable.get(target_did, (0.0, []))
+
+    def propagated_trust_from(self, source_did: str, max_depth: Optional[int] = None,
+                              context: Any = None,
+                              as_of: Optional[float] = None) -> Dict[str, Tuple[float, List[str]]]:
+        """Propagated trust from *source_did* to every identity reachable
+        within *max_depth* hops, with the path witnessing each score.
+
+        Direct trust takes priority.  Otherwise a target's score is that of
+        its strongest path, by absolute value: intermediate hops follow only
+        positive edges, while the last edge may be negative (distrust of the
+        target).  Paths are explored best-first by accumulated trust, which
+        only decreases along a path, so each identity is expanded at most
+        once per depth at which it can still be reached more strongly.
+        Only the edges *context* sees are followed, with their effective
+        scores as of *as_of*.
         """
         if max_depth is None:
             max_depth = self.MAX_PROPAGATION_DEPTH
-
-        # Direct trust takes priority
-        direct = self.get_direct_trust_score(source_did, target_did)
-        if direct != 0.0:
-            return direct
-
-        # BFS propagation
-        visited = {source_did}
-        # Queue: (current_did, accumulated_trust, depth)
-        queue: List[Tuple[str, float, int]] = [(source_did, 1.0, 0)]
-        max_trust = 0.0
-
-        while queue:
-            current, accumulated, depth = queue.pop(0)
+        decay = self.PROPAGATION_DECAY
+        out = self.adjacency(context)[0]
+        weigh = self.scorer(as_of)
+        source = DIDS.get(source_did)
+        # Labels: (trust, depth, id, parent label); the heap pops the
+        # strongest first.  A label is dropped when one at the same
+        # identity is at least as strong and no deeper.
+        labels: List[Tuple[float, int, int, int]] = [(1.0, 0, source, -1)]
+        heap: List[Tuple[float, int, int]] = [(-1.0, 0, 0)]
+        kept: Dict[int, List[Tuple[float, int]]] = {}
+        best: Dict[int, Tuple[float, int]] = {}  # target -> (score, predecessor label)
+        while heap:
+            _, depth, label = heapq.heappop(heap)
             if depth >= max_depth:
                 continue
-
-            for edge in self.get_trustees(current):
-                if edge.trustee_did == target_did:
-                    path_trust = accumulated * edge.score * self.PROPAGATION_DECAY
-                    if abs(path_trust) > abs(max_trust):
-                        max_trust = path_trust
-                elif edge.trustee_did not in visited and edge.score > 0:
-                    visited.add(edge.trustee_did)
-                    next_trust = accumulated * edge.score * self.PROPAGATION_DECAY
-                    queue.append((edge.trustee_did, next_trust, depth + 1))
-
-        return max(min(max_trust, 1.0), -1.0)
-
-    def compute_reputation(self) -> Dict[str, float]:
+            accumulated, _, node, _ = labels[label]
+            for target, edge in out.get(node, {}).items():
+                score = weigh(edge)
+                if target == source or score is None:
+                    continue
+                value = accumulated * score * decay
+                current = best.get(target)
+                if current is None or abs(value) > abs(current[0]):
+                    best[target] = (value, label)
+                if score <= 0:
+                    continue
+                if any(t >= value and d <= depth + 1 for t, d in kept.get(target, ())):
+                    continue
+                kept.setdefault(target, []).append((value, depth + 1))
+                labels.append((value, depth + 1, target, label))
+                heapq.heappush(heap, (-value, depth + 1, len(labels) - 1))
+
+        did = DIDS.did
+
+        def path_to(label: int) -> List[str]:
+            path = []
+            while label >= 0:
+                path.append(did(labels[label][2]))
+                label = labels[label][3]
+            return path[::-1]
+
+        result = {
+            did(target): (max(min(value, 1.0), -1.0), path_to(label) + [did(target)])
+            for target, (value, label) in best.items()
+        }
+        for target, edge in out.get(source, {}).items():
+            score = weigh(edge)
+            if score and target != source:
+                result[did(target)] = (score, [source_did, did(target)])
+        return result
+
+    def compute_reputation(self, backend: Optional[str] = None, context: Any = None,
+                           as_of: Optional[float] = None) -> Dict[str, float]:
         """Compute global reputation scores using iterative convergence.
 
         Similar to PageRank, each node's reputation is determined by the
         trust-weighted sum of its trusters' reputations. Implements Shapiro's
-        vision of mathematically-grounded social standing.
+        vision of mathematically-grounded social standing.  Runs as sparse
+        mat-vec products (see ``ReputationEngine``) until the normalised
+        scores move less than REPUTATION_TOLERANCE.
+
+        The result is maintained per context: it is only recomputed after
+        the edges *context* sees changed (or, with decay, time moved on or
+        a different *as_of* was asked for), warm-started from the previous
+        scores.
         """
-        nodes = list(self._nodes)
-        if not nodes:
-            return {}
-
-        n = len(nodes)
-        # Initialize all reputations equally
-        reputation: Dict[str, float] = {did: 1.0 / n for did in nodes}
-
-        for _ in range(self.REPUTATION_ITERATIONS):
-            new_rep: Dict[str, float] = {}
-            for did in nodes:
-                # Sum of trust-weighted reputations from trusters
-                incoming_trust = 0.0
-                trusters = self.get_trusters(did)
-                for edge in trusters:
-                    if edge.score > 0:
-                        incoming_trust += edge.score * reputation[edge.truster_did]
-
-                new_rep[did] = (
-                    (1 - self.REPUTATION_DAMPING) / n
-                    + self.REPUTATION_DAMPING * incoming_trust
-                )
-            reputation = new_rep
-
-        # Normalize to [0, 1]
-        max_rep = max(reputation.values()) if reputation else 1.0
-        if max_rep > 0:
-            reputation = {did: r / max_rep for did, r in reputation.items()}
-
-        return reputation
+        key = self._context_key(context)
+        stamp = self._reputation_stamp(key, as_of)
+        cached = self._reputation.get(key)
+        if cached is None or cached[0] != stamp:
+            engine = ReputationEngine(
+                damping=self.REPUTATION_DAMPING,
+                max_iterations=self.REPUTATION_ITERATIONS,
+                tolerance=self.REPUTATION_TOLERANCE,
+                backend=backend,
+            )
+            scores = engine.compute(self, initial=cached[2] if cached else None,
+                                    context=key, as_of=as_of)
+            cached = (stamp, scores, engine.raw)
+            self._remember(self._reputation, key, cached)
+            self.reputation_iterations = engine.iterations
+        return dict(cached[1])
+
+    def _reputation_stamp(self, key: Any, as_of: Optional[float]) -> tuple:
+        moment = as_of if as_of is not None else self.decay_bucket()
+        return self._stamp(key), self.half_life, moment
+
+    def reputation_stale(self, context: Any = None, as_of: Optional[float] = None) -> bool:
+        """True if reputation for *context* (as of *as_of*) would be
+        recomputed rather than served from the cache."""
+        key = self._context_key(context)
+        cached = self._reputation.get(key)
+        return cached is None or cached[0] != self._reputation_stamp(key, as_of)
+
+    @property
+    def reputation_dirty(self) -> bool:
+        """True if the graph changed since reputation was last computed."""
+        return self.reputation_stale()
 
     def get_node_count(self) -> int:
         return len(self._nodes)
 
-    def get_edge_count(self) -> int:
-        return sum(len(edges) for edges in self._edges.values())
+    def has_node(self, did: str) -> bool:
+        return DIDS.get(did) in self._nodes
+
+    def get_edge_count(self, context: Any = None) -> int:
+        """Number of stored edges in every context, or of the edges
+        *context* sees."""
+        if context is None:
+            return sum(len(edges) for layer in self._layers.values() for edges in layer.values())
+        return sum(len(edges) for edges in self.adjacency(context)[0].values())
+
+    def list_nodes(self) -> List[str]:
+        return [DIDS.did(did_id) for did_id in self._nodes]
+
+    def node_ids(self) -> List[int]:
+        """Interned ids of every identity (see ``adjacency``)."""
+        return list(self._nodes)
+
+    def iter_edges(self, context: Any = None) -> Iterator[TrustEdge]:
+        """Yield every stored edge of every context, or the edges *context*
+        sees, without building a full list first (each truster's edges are
+        copied, so the graph may change meanwhile)."""
+        if context is None:
+            adjacencies = list(self._layers.values())
+        else:
+            adjacencies = [self.adjacency(context)[0]]
+        for adjacency in adjacencies:
+            for truster_edges in list(adjacency.values()):
+                yield from list(truster_edges.values())
 
     def to_dict(self) -> dict:
         """Serialize the trust graph for API responses."""
-        edges = []
-        for truster_edges in self._edges.values():
-            for edge in truster_edges.values():
-                edges.append(edge.to_dict())
+        edges = [edge.to_dict() for edge in self.iter_edges()]
         return {
-            "nodes": list(self._nodes),
+            "nodes": self.list_nodes(),
             "edges": edges,
+            "contexts": self.list_contexts(),
+            "half_life": self.half_life,
             "node_count": self.get_node_count(),
             "edge_count": self.get_edge_count(),
         }
+
+    @classmethod
+    def from_dict(cls, d: dict) -> "TrustGraph":
+        graph = cls(half_life=d.get("half_life"))
+        for did in d.get("nodes", []):
+            graph.add_node(did)
+        graph.add_edges(TrustEdge.from_dict(edge_data) for edge_data in d.get("edges", []))
+        return graph
@@ -1,5 +1,30 @@
 import pytest
 from socialchain.api.app import create_app, AppState
+from socialchain.blockchain import Blockchain, Transaction
+
+
+class EasyChain(Blockchain):
+    """A chain whose proof-of-work takes a handful of hashes."""
+    DIFFICULTY = 1
+
+
+def make_tx(kind=None, sender="did:sc:alice", recipient="NETWORK", timestamp=None, **data):
+    """A transaction carrying *data*, tagged ``"type": kind`` when given."""
+    if kind is not None:
+        data = {"type": kind, **data}
+    return Transaction(sender, recipient, data, timestamp=timestamp)
+
+
+def mine_blocks(bc, count, miner="did:sc:miner", **tx_fields):
+    """Mine *count* blocks on *bc*, each holding one ``make_tx`` transaction."""
+    for i in range(count):
+        bc.add_transaction(make_tx(n=i, **tx_fields))
+        bc.mine_block(miner)
+
+
+@pytest.fixture
+def chain():
+    return EasyChain()
 
 
 @pytest.fixture
@@ -40,13 +40,23 @@ def test_mine_block(client):
     # Add a transaction first
     payload = {"sender": "did:sc:alice", "recipient": "did:sc:bob", "data": {"amount": 5}}
     client.post("/api/transactions", json=payload)
-    # Mine
-    response = client.post("/api/mine", json={"miner_did": "did:sc:miner"})
+    # Mine synchronously
+    response = client.post("/api/mine", json={"miner_did": "did:sc:miner", "wait": True})
     assert response.status_code == 200
     data = response.get_json()
     assert "block" in data
 
 
+def test_mine_returns_job(client):
+    payload = {"sender": "did:sc:alice", "recipient": "did:sc:bob", "data": {"amount": 5}}
+    client.post("/api/transactions", json=payload)
+    response = client.post("/api/mine", json={"miner_did": "did:sc:miner"})
+    assert response.status_code == 202
+    job_id = response.get_json()["job_id"]
+    assert client.get(f"/api/mine/jobs/{job_id}/progress").status_code == 200
+    assert client.get("/api/mine/jobs/missing").status_code == 404
+
+
 def test_mine_no_transactions(client):
     response = client.post("/api/mine", json={})
     assert response.status_code == 400
@@ -280,3 +290,16 @@ def test_login_page_has_download_link(client):
     assert resp.status_code == 200
     html = resp.data.decode()
     assert "releases" in html or "Download" in html
+
+
+def test_list_peers_includes_stats(client):
+    client.post("/api/network/peers", json={"did": "did:sc:p1", "address": "127.0.0.1:5001"})
+    data = client.get("/api/network/peers").get_json()
+    assert data["peers"] == {"did:sc:p1": "127.0.0.1:5001"}
+    assert data["stats"]["did:sc:p1"]["successes"] == 0
+
+
+def test_chain_tip(client):
+    data = client.get("/api/chain/tip").get_json()
+    assert data["height"] == 0
+    assert data["length"] == 1
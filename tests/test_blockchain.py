@@ -100,3 +100,46 @@ def test_identity_did_format():
     assert parts[0] == "did"
     assert parts[1] == "socialchain"
     assert len(parts[2]) > 0
+
+
+def _status(did, status, kind="status_update"):
+    return Transaction(sender=did, recipient="NETWORK", data={"type": kind, "status": status})
+
+
+def test_status_updates_coalesce_latest_wins(chain):
+    chain.add_transaction(_status("did:sc:a", "online"))
+    chain.add_transaction(Transaction("did:sc:a", "did:sc:b", {"amount": 1}))
+    chain.add_transaction(_status("did:sc:b", "online"))
+    latest = _status("did:sc:a", "active")
+    chain.add_transaction(latest)
+    statuses = [tx for tx in chain.pending_transactions if tx.data.get("type") == "status_update"]
+    assert [tx.sender for tx in statuses] == ["did:sc:b", "did:sc:a"]
+    assert latest in chain.pending_transactions
+    assert len(chain.pending_transactions) == 3
+    assert chain.coalesced == 1
+    block = chain.mine_block("did:sc:miner")
+    assert len(block.transactions) == 4  # three distinct changes + reward
+
+
+def test_coalescing_rules_are_per_type(chain):
+    for status in ("online", "busy"):
+        chain.add_transaction(Transaction("did:sc:agent", "NETWORK", {
+            "type": "agent_status", "agent_did": "did:sc:agent", "status": status,
+        }))
+    chain.add_transaction(Transaction("did:sc:a", "did:sc:b", {"amount": 1}))
+    chain.add_transaction(Transaction("did:sc:a", "did:sc:b", {"amount": 1}))
+    assert len(chain.pending_transactions) == 3
+    assert chain.pending_transactions[0].data["status"] == "busy"
+
+    chain.coalescing_rules.pop("agent_status")
+    chain.add_transaction(Transaction("did:sc:agent", "NETWORK", {
+        "type": "agent_status", "agent_did": "did:sc:agent", "status": "idle",
+    }))
+    assert len(chain.pending_transactions) == 4
+
+
+def test_new_status_after_mining_is_kept(chain):
+    chain.add_transaction(_status("did:sc:a", "online"))
+    chain.mine_block("did:sc:miner")
+    chain.add_transaction(_status("did:sc:a", "offline"))
+    assert [tx.data["status"] for tx in chain.pending_transactions] == ["offline"]
@@ -0,0 +1,102 @@
+"""Tests for bulk trust graph import and export."""
+import gzip
+import io
+import json
+
+import pytest
+from socialchain.social import bulk
+from socialchain.social.sybil import SybilResistance
+from socialchain.social.trust import TrustGraph
+
+
+def _graph():
+    tg = TrustGraph()
+    sybil = SybilResistance(tg)
+    tg.set_trust("did:a", "did:b", 0.5, context="trade")
+    tg.set_trust("did:a", "did:b", -0.25)
+    tg.add_node("did:lonely")
+    vouch = sybil.create_vouch("did:a", "did:c", message="met in person")
+    sybil.accept_vouch(vouch.vouch_id)
+    return tg, sybil
+
+
+@pytest.mark.parametrize("fmt", bulk.FORMATS)
+def test_round_trip(fmt):
+    tg, sybil = _graph()
+    buf = io.BytesIO()
+    bulk.dump(tg, buf, fmt, sybil)
+    buf.seek(0)
+    copy = TrustGraph()
+    copy_sybil = SybilResistance(copy)
+    counts = bulk.load(copy, buf, sybil=copy_sybil)  # format detected
+    assert counts == {"nodes": 1, "edges": 3, "vouches": 1}
+    assert copy.to_dict()["edges"] == tg.to_dict()["edges"]
+    assert sorted(copy.list_nodes()) == sorted(tg.list_nodes())
+    assert copy_sybil.to_dict() == sybil.to_dict()
+    assert copy.get_direct_trust_score("did:a", "did:b") == -0.25
+
+
+def test_invalid_record_stops_at_its_batch(monkeypatch):
+    monkeypatch.setattr(bulk, "BATCH_SIZE", 2)
+    lines = [{"type": "edge", "truster_did": f"did:{i}", "trustee_did": "did:x", "score": 0.5}
+             for i in range(5)]
+    lines[3]["score"] = 2.0
+    data = "\n".join(json.dumps(line) for line in lines).encode()
+    tg = TrustGraph()
+    with pytest.raises(ValueError, match="Line 4"):
+        bulk.load(tg, io.BytesIO(data))
+    assert tg.get_edge_count() == 2  # the first batch only
+
+    with pytest.raises(ValueError, match="Truncated"):
+        bulk.load(TrustGraph(), io.BytesIO(b"".join(bulk.export_chunks(_graph()[0], "binary"))[:-9]))
+
+
+@pytest.mark.parametrize("fmt", bulk.FORMATS)
+def test_vouch_levels_are_recomputed_once_per_load(monkeypatch, fmt):
+    tg = TrustGraph()
+    sybil = SybilResistance(tg)
+    for i in range(6):
+        vouch = sybil.create_vouch("did:a", f"did:v{i}")
+        sybil.accept_vouch(vouch.vouch_id)
+    buf = io.BytesIO()
+    bulk.dump(tg, buf, fmt, sybil)
+    buf.seek(0)
+
+    monkeypatch.setattr(bulk, "BATCH_SIZE", 2)
+    copy_sybil = SybilResistance(TrustGraph())
+    calls = []
+    recompute = copy_sybil.recompute_levels
+    monkeypatch.setattr(copy_sybil, "recompute_levels", lambda: calls.append(1) or recompute())
+    assert bulk.load(copy_sybil.trust_graph, buf, sybil=copy_sybil)["vouches"] == 6
+    assert len(calls) == 1
+    assert copy_sybil.to_dict() == sybil.to_dict()
+
+
+def test_bulk_endpoints(client):
+    tg, sybil = _graph()
+    body = b"".join(bulk.export_chunks(tg, "binary", sybil))
+    resp = client.post("/api/governance/trust/bulk", data=body,
+                       content_type=bulk.MEDIA_TYPES["binary"])
+    assert resp.status_code == 200
+    assert resp.get_json()["edges"] == 3
+    resp = client.get("/api/governance/trust/bulk")
+    assert resp.mimetype == "application/x-ndjson"
+    records = [json.loads(line) for line in resp.data.splitlines()]
+    assert sum(r["type"] == "vouch" for r in records) == 1
+    assert client.get("/api/governance/trust/bulk?format=xml").status_code == 400
+    resp = client.post("/api/governance/trust/bulk", data=b'{"type": "bogus"}\n')
+    assert resp.status_code == 400
+
+
+def test_cli_converts_a_snapshot(tmp_path):
+    tg, sybil = _graph()
+    snapshot = tmp_path / "snapshot.json.gz"
+    with gzip.open(snapshot, "wt") as f:
+        json.dump({"trust_graph": tg.to_dict(), "vouches": sybil.to_dict()}, f)
+    output = tmp_path / "trust.bin"
+    assert bulk.main(["convert", str(snapshot), str(output)]) == 0
+    assert output.read_bytes().startswith(bulk.MAGIC)
+    assert bulk.main(["convert", str(output), str(tmp_path / "trust.ndjson")]) == 0
+    copy = TrustGraph()
+    with open(tmp_path / "trust.ndjson", "rb") as f:
+        assert bulk.load(copy, f)["edges"] == 3
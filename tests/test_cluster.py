@@ -0,0 +1,80 @@
+"""Tests for the local multi-node cluster harness."""
+import pytest
+import requests
+from socialchain.network.cluster import LocalCluster, percentile
+from socialchain.network.node import PEER_HEADER
+
+
+@pytest.fixture
+def cluster():
+    c = LocalCluster(4, topology="ring", difficulty=1, seed=7).start()
+    yield c
+    c.stop()
+
+
+def test_percentile_nearest_rank():
+    assert percentile([], 50) is None
+    assert percentile([3, 1, 2, 4], 50) == 2
+    assert percentile([3, 1, 2, 4], 99) == 4
+
+
+def test_unknown_topology_rejected():
+    with pytest.raises(ValueError):
+        LocalCluster(3, topology="mesh")
+
+
+def test_topology_edges():
+    assert len(LocalCluster(4, topology="full").edges()) == 12
+    assert len(LocalCluster(4, topology="star").edges()) == 6
+    assert len(LocalCluster(4, topology="line").edges()) == 6
+
+
+def test_blocks_propagate_through_relay(cluster):
+    records = cluster.run_workload(blocks=3, txs_per_block=2)
+    assert cluster.converged()
+    assert all(r["coverage"] == 1.0 for r in records)
+    report = cluster.report()
+    assert report["propagation"]["samples"] == 9
+    assert report["propagation"]["p50"] > 0
+    assert report["bandwidth"]["bytes"] > 0
+
+
+def test_partitioned_node_catches_up_by_sync(cluster):
+    cluster.partition([0, 1, 2], [3])
+    cluster.mine_and_announce(0)
+    assert cluster.nodes[3].state.blockchain.last_block.index == 0
+    assert cluster.nodes[2].state.blockchain.last_block.index == 1
+    cluster.heal()
+    assert not cluster.converged()
+    cluster.sync(3)
+    assert cluster.converged()
+    assert cluster.nodes[3].state.blockchain.last_block.index == 1
+
+
+def test_crashed_node_recovers_after_restart(cluster):
+    cluster.crash(2)
+    cluster.mine_and_announce(0)
+    cluster.restart(2)
+    assert not cluster.converged()
+    cluster.sync(2)
+    assert cluster.converged()
+    assert cluster.nodes[2].state.blockchain.last_block.index == 1
+    assert cluster.report()["sync"]["runs"] == 1
+
+
+def test_latency_injection_slows_propagation(cluster):
+    cluster.set_latency(0.05)
+    record = cluster.mine_and_announce(0)
+    assert min(record["latencies"]) >= 0.05
+
+
+def test_streamed_responses_are_metered(cluster):
+    cluster.run_workload(blocks=3, txs_per_block=2)
+    assert cluster.drain_relays()
+    node = cluster.nodes[0]
+    before = node.bytes_out
+    response = requests.get(
+        f"http://{node.address}/api/chain", headers={PEER_HEADER: cluster.nodes[1].did}, timeout=5,
+    )
+    assert response.ok
+    assert node.bytes_out - before == len(response.content)
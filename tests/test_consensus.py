@@ -0,0 +1,97 @@
+"""Tests for pluggable consensus and proof-of-authority."""
+import pytest
+from socialchain.blockchain import (
+    Block, Blockchain, Identity, ProofOfAuthority, ProofOfWork, Transaction,
+)
+from socialchain.network import wire
+
+
+@pytest.fixture
+def authorities():
+    return [Identity() for _ in range(3)]
+
+
+def _poa_chain(authorities, signer):
+    return Blockchain(consensus=ProofOfAuthority([a.did for a in authorities], identity=signer))
+
+
+def _mine(bc, signer, n=1):
+    bc.consensus.identity = signer
+    bc.add_transaction(Transaction("did:sc:a", "did:sc:b", {"n": n}))
+    return bc.mine_block(signer.did)
+
+
+def test_default_engine_is_proof_of_work():
+    bc = Blockchain()
+    assert isinstance(bc.consensus, ProofOfWork)
+    assert bc.chain[0].signer is None
+
+
+def test_poa_blocks_are_signed_and_validate(authorities):
+    bc = _poa_chain(authorities, authorities[1])
+    block = _mine(bc, authorities[1])
+    assert block.signer == authorities[1].did
+    assert block.nonce == 0
+    assert bc.last_block.hash == block.hash
+    _mine(bc, authorities[2], 2)
+    assert bc.validate_chain() is True
+
+    # Another node with the same authority list accepts the blocks
+    other = _poa_chain(authorities, None)
+    assert other.chain[0].hash == bc.chain[0].hash
+    for b in bc.chain[1:]:
+        assert other.add_block(Block.from_dict(b.to_dict())) is True
+
+
+def test_poa_rejects_unknown_or_forged_signer(authorities):
+    bc = _poa_chain(authorities, authorities[0])
+    outsider = Identity()
+    block = bc.create_block_template(outsider.did)
+    block.signer = outsider.did
+    block.hash = block.compute_hash()
+    block.signature = outsider.sign(block.hash.encode())
+    assert bc.add_block(block) is False
+
+    block.signer = authorities[0].did
+    block.hash = block.compute_hash()  # signature no longer matches
+    assert bc.add_block(block) is False
+
+
+def test_poa_authority_cannot_seal_twice_in_a_row(authorities):
+    bc = _poa_chain(authorities, authorities[1])
+    _mine(bc, authorities[1])
+    with pytest.raises(ValueError):
+        _mine(bc, authorities[1], 2)
+
+
+def test_poa_prefers_in_turn_branch(authorities):
+    bc = _poa_chain(authorities, authorities[2])
+    out_of_turn = _mine(bc, authorities[2])  # height 1 belongs to authorities[1]
+    rival = Blockchain(consensus=ProofOfAuthority([a.did for a in authorities], identity=authorities[1]))
+    in_turn = _mine(rival, authorities[1])
+    assert bc.add_block(Block.from_dict(in_turn.to_dict())) is True
+    assert bc.last_block.hash == in_turn.hash
+    assert bc.has_block(out_of_turn.hash)
+
+
+def test_signed_blocks_round_trip_through_wire(authorities):
+    bc = _poa_chain(authorities, authorities[1])
+    block = _mine(bc, authorities[1])
+    kind, blocks = wire.decode(wire.encode_blocks([block]))
+    assert blocks[0].signer == block.signer
+    assert blocks[0].signature == block.signature
+    assert bc.verify_block(blocks[0])
+
+
+def test_identity_pem_round_trip():
+    identity = Identity()
+    restored = Identity.from_pem(identity.to_pem())
+    assert restored.did == identity.did
+    assert Identity.verify_did_signature(identity.did, b"msg", restored.sign(b"msg"))
+    assert not Identity.verify_did_signature("did:other:abc", b"msg", restored.sign(b"msg"))
+
+
+def test_consensus_endpoint(client):
+    data = client.get("/api/chain/consensus").get_json()
+    assert data["consensus"]["name"] == "pow"
+    assert client.get("/api/chain/tip").get_json()["consensus"] == "pow"
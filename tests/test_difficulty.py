@@ -0,0 +1,143 @@
+"""Tests for numeric proof-of-work targets and difficulty retargeting."""
+import pytest
+from socialchain.blockchain import (
+    Block, ProofOfWork, difficulty_to_target,
+    hash_meets_difficulty, hash_meets_target, target_to_difficulty, target_work,
+)
+from socialchain.network import wire
+from tests.conftest import EasyChain, make_tx
+
+
+def _retargeting_chain(interval, every=4, max_adjustment=4.0):
+    return EasyChain(consensus=ProofOfWork(block_interval=interval, retarget_every=every,
+                                           max_adjustment=max_adjustment))
+
+
+def _append(bc, timestamp):
+    """Seal a block with a chosen timestamp on top of the tip."""
+    block = Block(bc.last_block.index + 1, [], bc.last_block.hash, timestamp=timestamp)
+    assert bc.seal_block(block)
+    assert bc.add_block(block)
+    return block
+
+
+def test_integer_difficulty_matches_leading_zero_rule():
+    target = difficulty_to_target(2)
+    assert target_work(target) == 16 ** 2
+    assert target_to_difficulty(target) == 2
+    for hash_hex in ("00" + "f" * 62, "0" + "f" * 63, "00" + "0" * 62):
+        assert hash_meets_target(hash_hex, target) == hash_meets_difficulty(hash_hex, 2)
+
+
+def test_fractional_difficulty_lies_between_integers():
+    assert difficulty_to_target(2) < difficulty_to_target(1.5) < difficulty_to_target(1)
+    assert abs(target_to_difficulty(difficulty_to_target(1.5)) - 1.5) < 1e-9
+
+
+def test_blocks_carry_target_and_validate(chain):
+    chain.add_transaction(make_tx(n=1))
+    block = chain.mine_block("did:sc:miner")
+    assert block.target == difficulty_to_target(1)
+    assert Block.from_dict(block.to_dict()).hash == block.hash
+    assert chain._block_work(block) == 16
+    assert chain.validate_chain() is True
+
+
+def test_wrong_target_is_rejected(chain):
+    block = Block(1, [], chain.last_block.hash)
+    block.target = difficulty_to_target(0.5)  # easier than the schedule allows
+    block.nonce, block.hash = chain._proof_of_work(block)
+    assert chain.verify_block(block) is False
+    assert chain.add_block(block) is False
+
+
+def test_garbage_target_is_a_malformed_block(client):
+    block = EasyChain().mine_block("did:sc:miner").to_dict()
+    block["target"] = "zz"
+    with pytest.raises(ValueError, match="target"):
+        Block.from_dict(block)
+    resp = client.post("/api/blocks", json={"block": block})
+    assert resp.status_code == 400
+    assert "target" in resp.get_json()["error"]
+
+
+def test_slow_blocks_lower_difficulty():
+    bc = _retargeting_chain(interval=10)
+    start = bc.last_block.timestamp + 1
+    for i in range(4):
+        _append(bc, start + i * 40)  # four times slower than the target
+    initial = difficulty_to_target(1)
+    assert bc.last_block.target == initial  # height 4 does not retarget yet
+    for i in range(4, 8):
+        _append(bc, start + i * 40)
+    assert bc.last_block.index == 8
+    assert bc.last_block.target > initial
+    assert target_to_difficulty(bc.last_block.target) < 1
+    assert bc.validate_chain() is True
+
+
+def test_fast_blocks_raise_difficulty_within_clamp():
+    bc = _retargeting_chain(interval=100, max_adjustment=2.0)
+    start = bc.last_block.timestamp + 1
+    for i in range(8):
+        _append(bc, start + i)  # far faster than the target
+    initial = difficulty_to_target(1)
+    assert bc.last_block.target == initial // 2
+
+
+def test_timestamp_going_backwards_is_rejected():
+    bc = _retargeting_chain(interval=10)
+    start = bc.last_block.timestamp + 100
+    _append(bc, start)
+    block = Block(2, [], bc.last_block.hash, timestamp=start - 50)
+    assert bc.seal_block(block)
+    assert bc.add_block(block) is False
+
+
+def test_wire_round_trip_keeps_target(chain):
+    chain.add_transaction(make_tx(n=1))
+    chain.mine_block("did:sc:miner")
+    kind, blocks = wire.decode(wire.encode_blocks(chain.chain))
+    assert [b.target for b in blocks] == [b.target for b in chain.chain]
+    assert [b.compute_hash() for b in blocks] == [b.hash for b in chain.chain]
+
+
+def test_restored_snapshot_keeps_the_retarget_window():
+    source = _retargeting_chain(interval=10)
+    source.MAX_FORK_DEPTH = 1
+    start = source.last_block.timestamp + 1
+    for i in range(6):
+        _append(source, start + i * 40)
+    snapshot = source.snapshot()
+    assert [b["index"] for b in snapshot["blocks"]] == [2, 3, 4, 5, 6]
+
+    restored = _retargeting_chain(interval=10)
+    restored.MAX_FORK_DEPTH = 1
+    restored.restore(snapshot)
+    for i in range(6, 8):
+        _append(source, start + i * 40)
+    for block in source.blocks_since(7):
+        assert restored.can_verify(block)
+        assert restored.add_block(block)
+    assert restored.last_block.index == 8
+    assert restored.last_block.target == source.last_block.target > difficulty_to_target(1)
+    assert restored.validate_chain() is True
+
+
+def test_block_without_known_window_is_unverifiable_not_invalid():
+    from socialchain.network.node import NetworkNode
+
+    source = _retargeting_chain(interval=10)
+    start = source.last_block.timestamp + 1
+    for i in range(8):
+        _append(source, start + i * 40)
+    bc = _retargeting_chain(interval=10)
+    orphan = source.chain[8]
+    assert bc.consensus.expected_target(bc, orphan) is None
+    assert bc.can_verify(orphan) is False
+    assert bc.verify_block(orphan) is False
+
+    node = NetworkNode()
+    node.register_peer("did:sc:peer", "127.0.0.1:1")
+    assert node._add_blocks(bc, "did:sc:peer", [orphan]) is False
+    assert not node.registry.is_banned("did:sc:peer")
@@ -242,6 +242,26 @@ def test_propagated_trust(client):
     assert resp.status_code == 200
     data = resp.get_json()
     assert data["propagated_trust"] > 0
+    assert data["path"] == ["did:a", "did:b", "did:c"]
+
+
+def test_propagated_trust_batch(client):
+    client.post("/api/governance/trust", json={
+        "truster_did": "did:a", "trustee_did": "did:b", "score": 0.9,
+    })
+    client.post("/api/governance/trust", json={
+        "truster_did": "did:b", "trustee_did": "did:c", "score": 0.8,
+    })
+    resp = client.post("/api/governance/trust/propagated", json={
+        "source": "did:a", "targets": ["did:b", "did:c", "did:z"],
+    })
+    trust = resp.get_json()["trust"]
+    assert trust["did:b"]["propagated_trust"] == 0.9
+    assert trust["did:c"]["path"] == ["did:a", "did:b", "did:c"]
+    assert trust["did:z"] == {"propagated_trust": 0.0, "trust_level": "unknown", "path": []}
+    everything = client.post("/api/governance/trust/propagated", json={"source": "did:a"}).get_json()
+    assert set(everything["trust"]) == {"did:b", "did:c"}
+    assert client.post("/api/governance/trust/propagated", json={}).status_code == 400
 
 
 def test_propagated_trust_missing_params(client):
@@ -258,6 +278,22 @@ def test_reputation(client):
     assert "reputation" in resp.get_json()
 
 
+def test_reputation_etag_revalidation(client):
+    client.post("/api/governance/trust", json={
+        "truster_did": "did:x", "trustee_did": "did:y", "score": 0.9,
+    })
+    resp = client.get("/api/governance/reputation")
+    etag = resp.headers["ETag"]
+    cached = client.get("/api/governance/reputation", headers={"If-None-Match": etag})
+    assert cached.status_code == 304
+    client.post("/api/governance/trust", json={
+        "truster_did": "did:y", "trustee_did": "did:x", "score": 0.5,
+    })
+    fresh = client.get("/api/governance/reputation", headers={"If-None-Match": etag})
+    assert fresh.status_code == 200
+    assert fresh.get_json()["version"] > resp.get_json()["version"]
+
+
 # ── Vouch / Sybil API Tests ─────────────────────────────────────────────────
 
 def test_create_vouch(client):
@@ -305,3 +341,40 @@ def test_sybil_analysis(client):
     resp = client.get("/api/governance/sybil-analysis/did:socialchain:suspect")
     assert resp.status_code == 200
     assert "analysis" in resp.get_json()
+
+
+def test_trust_contexts(client):
+    for context, score in (("governance", 0.9), ("trade", 0.2)):
+        client.post("/api/governance/trust", json={
+            "truster_did": "did:a", "trustee_did": "did:b", "score": score, "context": context,
+        })
+    data = client.get("/api/governance/trust/did:a?context=governance").get_json()
+    assert [e["score"] for e in data["trustees"]] == [0.9]
+    data = client.get(
+        "/api/governance/trust/propagated?source=did:a&target=did:b&context=governance:0.5,trade:0.5"
+    ).get_json()
+    assert data["propagated_trust"] == pytest.approx(0.55)
+    resp = client.get("/api/governance/reputation?context=trade")
+    assert resp.status_code == 200 and resp.headers["ETag"] != client.get(
+        "/api/governance/reputation").headers["ETag"]
+    assert client.get("/api/governance/reputation?context=trade:x").status_code == 400
+
+    resp = client.delete("/api/governance/trust", json={
+        "truster_did": "did:a", "trustee_did": "did:b", "context": "trade",
+    })
+    assert resp.status_code == 200
+    data = client.get("/api/governance/trust/did:a").get_json()
+    assert [e["context"] for e in data["trustees"]] == ["governance"]
+
+
+def test_trust_as_of(client):
+    client.post("/api/governance/trust", json={
+        "truster_did": "did:a", "trustee_did": "did:b", "score": 0.9,
+    })
+    data = client.get("/api/governance/trust/propagated?source=did:a&target=did:b&as_of=0").get_json()
+    assert data["propagated_trust"] == 0.0  # the edge did not exist yet
+    resp = client.post("/api/governance/trust/propagated", json={"source": "did:a", "as_of": 0})
+    assert resp.get_json()["count"] == 0
+    resp = client.get("/api/governance/reputation?as_of=0")
+    assert resp.status_code == 200 and resp.headers["ETag"].endswith('-0.0"')
+    assert client.get("/api/governance/reputation?as_of=soon").status_code == 400
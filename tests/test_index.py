@@ -0,0 +1,124 @@
+"""Tests for the secondary transaction indexes and the query endpoint."""
+import pytest
+from socialchain.api.app import AppState, create_app
+from socialchain.blockchain import Block
+from socialchain.blockchain.index import TransactionIndex
+from tests.conftest import EasyChain, make_tx
+
+
+class ShallowChain(EasyChain):
+    MAX_FORK_DEPTH = 2
+
+
+def _chain_with_contracts():
+    bc = ShallowChain()
+    for i in range(5):
+        bc.add_transaction(make_tx("contract_create", contract_id=f"c{i % 2}", timestamp=100.0 + i))
+        bc.add_transaction(make_tx("governance_vote", proposal_id="p1", timestamp=200.0 + i))
+        bc.mine_block("did:sc:miner")
+    return bc
+
+
+def test_query_filters_and_cursor_pages():
+    bc = _chain_with_contracts()
+    entries, cursor = bc.index.query({"contract_id": "c0"}, limit=2)
+    assert [(tx.data["contract_id"], h) for tx, h in entries] == [("c0", 1), ("c0", 3)]
+    entries, cursor = bc.index.query({"contract_id": "c0"}, cursor=cursor, limit=2)
+    assert [h for _, h in entries] == [5] and cursor is None
+    entries, _ = bc.index.query({"kind": "governance_vote", "proposal_id": "p1"}, since=201, until=203)
+    assert [tx.timestamp for tx, _ in entries] == [201.0, 202.0, 203.0]
+    entries, _ = bc.index.query(since=103.5, until=200.5)
+    assert [tx.timestamp for tx, _ in entries] == [200.0, 104.0]
+    assert bc.index.count("tx_type", "mining_reward") == 5
+    with pytest.raises(ValueError):
+        bc.index.query({"colour": "red"})
+
+
+def test_time_range_pages_match_a_full_scan():
+    index = TransactionIndex()
+    for i in range(200):
+        # Timestamps out of chain order, so range and position order differ
+        index.add(make_tx("transfer", timestamp=float((i * 37) % 200)), i // 4)
+    for since, until in ((10.0, 20.0), (0.0, 190.0), (None, 50.0)):
+        expected = [tx.tx_id for tx, _, ts in index._log if (since or 0) <= ts <= until]
+        got, cursor = [], None
+        while True:
+            entries, cursor = index.query(since=since, until=until, cursor=cursor, limit=7)
+            got.extend(tx.tx_id for tx, _ in entries)
+            if cursor is None:
+                break
+        assert got == expected
+
+
+def test_pruning_compacts_the_time_list():
+    index = TransactionIndex()
+    for i in range(100):
+        index.add(make_tx("transfer", timestamp=float(100 - i)), i)
+    for height in range(0, 80, 5):
+        index.prune_through(height)
+        live = [tx.tx_id for tx, _ in index.query(since=0.0, limit=None)[0]]
+        assert live == [tx.tx_id for tx, _, _ in index._log]
+    assert len(index._times) < 2 * len(index)
+
+
+def test_index_follows_reorgs_and_pruning():
+    bc = _chain_with_contracts()
+    fork_parent = bc.chain[-2]
+    branch, parent = [], fork_parent
+    for i in range(2):
+        block = Block(parent.index + 1, [make_tx("contract_create", contract_id="c9")], parent.hash)
+        block.nonce, block.hash = bc._proof_of_work(block)
+        branch.append(block)
+        parent = block
+    for block in branch:
+        bc.add_block(block)
+    assert bc.last_block.hash == branch[-1].hash
+    assert [h for _, h in bc.index.query({"contract_id": "c9"})[0]] == [5, 6]
+    assert [h for _, h in bc.index.query({"contract_id": "c0"})[0]] == [1, 3]
+
+    pruned = ShallowChain(retention=2)
+    for i in range(5):
+        pruned.add_transaction(make_tx("contract_create", contract_id="c1"))
+        pruned.mine_block("did:sc:miner")
+    assert [h for _, h in pruned.index.query({"contract_id": "c1"})[0]] == [4, 5]
+    assert len(pruned.index) == 4
+
+
+def test_index_is_rebuilt_on_restore():
+    bc = _chain_with_contracts()
+    restored = EasyChain()
+    restored.restore(bc.snapshot())
+    # Transactions below the kept blocks are not carried by the snapshot;
+    # they count as pruned, as after ``prune_bodies``
+    base = restored.base_index
+    expected = [(tx.tx_id, h) for tx, h in bc.index.query({"sender": "did:sc:alice"}, limit=None)[0]
+                if h >= base]
+    got = [(tx.tx_id, h) for tx, h in restored.index.query({"sender": "did:sc:alice"}, limit=None)[0]]
+    assert got == expected
+    assert len(restored.get_transactions_for("did:sc:alice")) == len(expected)
+    assert restored.pruned_count("did:sc:alice") == 2 * (base - 1)  # two per block after genesis
+
+
+def test_query_and_audit_endpoints():
+    state = AppState()
+    state.blockchain = _chain_with_contracts()
+    app = create_app(state=state)
+    app.config["TESTING"] = True
+    client = app.test_client()
+
+    page = client.get("/api/transactions?contract_id=c1&limit=1").get_json()
+    assert page["count"] == 1 and page["cursor"] is not None
+    rest = client.get(f"/api/transactions?contract_id=c1&cursor={page['cursor']}").get_json()
+    assert [t["block_index"] for t in rest["transactions"]] == [4] and rest["cursor"] is None
+    assert client.get("/api/transactions?colour=red").status_code == 400
+    assert client.get("/api/transactions?limit=0").status_code == 400
+    for bad in ("start=soon", "end=nan", "cursor=x", "limit=ten"):
+        assert client.get(f"/api/transactions?{bad}").status_code == 400
+
+    resp = client.post("/api/governance/communities", json={"name": "Club", "founder_did": "did:sc:f"})
+    community_id = resp.get_json()["community"]["community_id"]
+    state.blockchain.mine_block("did:sc:miner")
+    audit = client.get(f"/api/governance/communities/{community_id}/audit").get_json()
+    assert [t["data"]["type"] for t in audit["transactions"]] == ["community_create"]
+    assert client.get("/api/governance/communities/nope/audit").status_code == 404
+    assert client.get("/api/governance/proposals/p1/audit").status_code == 404
@@ -0,0 +1,157 @@
+"""Tests for transaction lanes mined into parallel sub-chains."""
+import pytest
+from socialchain.api.app import AppState, create_app
+from socialchain.api.snapshot import build_snapshot, restore_snapshot
+from socialchain.blockchain import LaneSet, MiningJobManager
+from tests.conftest import EasyChain, make_tx
+
+
+def test_transactions_are_routed_by_kind(chain):
+    lanes = LaneSet(chain)
+    assert chain.add_transaction(make_tx("governance_vote")) == 1
+    chain.add_transaction(make_tx("agent_status", agent_did="did:sc:a1"))
+    chain.add_transaction(make_tx("transfer", amount=3))
+    assert [t.data["type"] for t in lanes.get("governance").pending_transactions] == ["governance_vote"]
+    assert [t.data["type"] for t in lanes.get("agents").pending_transactions] == ["agent_status"]
+    assert [t.data["type"] for t in chain.pending_transactions] == ["transfer"]
+    with pytest.raises(ValueError):
+        LaneSet(chain)
+    with pytest.raises(ValueError):
+        LaneSet(EasyChain(), lanes={"a": {"x"}, "b": {"x"}})
+
+
+def test_telemetry_flood_does_not_hold_back_governance(chain):
+    lanes = LaneSet(chain)
+    for i in range(200):
+        chain.add_transaction(make_tx("agent_task", sender=f"did:sc:agent{i}", n=i))
+    vote = make_tx("governance_vote", proposal_id="p1")
+    chain.add_transaction(vote)
+    blocks = lanes.seal(MiningJobManager(), "did:sc:miner", names=["governance"])
+    assert [tx.tx_id for tx in blocks["governance"].transactions] == [vote.tx_id]
+    assert len(lanes.get("agents").pending_transactions) == 200
+    assert chain.get_transactions_for("did:sc:alice")[0]["tx_id"] == vote.tx_id
+
+
+def test_lanes_seal_in_parallel_and_root_commits_tips(chain):
+    lanes = LaneSet(chain)
+    mining = MiningJobManager()
+    chain.add_transaction(make_tx("governance_vote"))
+    chain.add_transaction(make_tx("contract_create", contract_id="c1"))
+    chain.add_transaction(make_tx("status_update", status="online"))
+    blocks = lanes.seal(mining, "did:sc:miner")
+    assert set(blocks) == {"governance", "contracts", "agents"}
+    # Lane blocks carry no reward; one coalesced commitment waits on the root
+    assert all(len(b.transactions) == 1 for b in blocks.values())
+    assert [tx.tx_type for tx in chain.pending_transactions] == ["lane_commit"]
+    root = lanes.commit(mining, "did:sc:miner")
+    committed = lanes.last_commit()
+    assert committed["root_height"] == root.index == 1
+    for name, block in blocks.items():
+        assert committed["lanes"][name] == {"height": 1, "hash": block.hash}
+    assert committed["lanes"]["social"]["height"] == 0
+    assert chain.get_balance("did:sc:miner") == 1
+    assert lanes.commit(mining, "did:sc:miner") is None
+
+
+def test_lane_endpoints():
+    state = AppState()
+    state.blockchain = EasyChain()
+    app = create_app(state=state)
+    app.config["TESTING"] = True
+    client = app.test_client()
+    assert client.get("/api/chain/lanes").status_code == 400
+
+    state.lanes = LaneSet(state.blockchain)
+    client.post("/api/transactions", json={
+        "sender": "did:sc:alice", "recipient": "NETWORK",
+        "data": {"type": "contract_create", "contract_id": "c1"},
+    })
+    assert client.post("/api/chain/lanes/mine", json={"lanes": ["nope"]}).status_code == 400
+    resp = client.post("/api/chain/lanes/mine", json={"miner_did": "did:sc:miner"})
+    assert resp.status_code == 200
+    body = resp.get_json()
+    assert list(body["blocks"]) == ["contracts"]
+    assert body["root"]["index"] == 1
+    status = client.get("/api/chain/lanes").get_json()
+    contracts = next(lane for lane in status["lanes"] if lane["name"] == "contracts")
+    assert (contracts["height"], contracts["pending"]) == (1, 0)
+    assert status["committed"]["lanes"]["contracts"]["hash"] == contracts["tip"]
+    lane = client.get("/api/chain/lanes/contracts").get_json()
+    assert lane["length"] == 2 and lane["chain"][1]["transactions"][0]["data"]["contract_id"] == "c1"
+    assert client.get("/api/chain/lanes/nope").status_code == 404
+    assert client.post("/api/chain/lanes/mine").status_code == 400
+
+
+def _lane_state():
+    state = AppState()
+    state.blockchain = EasyChain()
+    state.lanes = LaneSet(state.blockchain)
+    app = create_app(state=state)
+    app.config["TESTING"] = True
+    return state, app.test_client()
+
+
+def _seal_registration(state):
+    state.blockchain.add_transaction(make_tx("registration", sender="did:sc:bob"))
+    mining = MiningJobManager()
+    blocks = state.lanes.seal(mining, "did:sc:miner")
+    state.lanes.commit(mining, "did:sc:miner")
+    return blocks["social"]
+
+
+def test_lanes_round_trip_through_snapshots():
+    state, _ = _lane_state()
+    block = _seal_registration(state)
+    snapshot = build_snapshot(state)
+
+    restored, _ = _lane_state()
+    restore_snapshot(restored, snapshot)
+    social = restored.lanes.get("social")
+    assert (social.last_block.index, social.last_block.hash) == (1, block.hash)
+    assert restored.blockchain.get_transactions_for("did:sc:bob")[0]["data"]["type"] == "registration"
+    assert restored.lanes.last_commit()["lanes"]["social"]["hash"] == block.hash
+
+    with pytest.raises(ValueError, match="does not enable"):
+        restore_snapshot(AppState(), snapshot)
+    snapshot["lanes"]["social"] = restored.lanes.get("agents").snapshot()
+    with pytest.raises(ValueError, match="committed tip"):
+        restore_snapshot(_lane_state()[0], snapshot)
+
+
+def test_lane_blocks_are_announced_and_synced(monkeypatch):
+    from tests.test_network import _InProcessTransport
+    import socialchain.network.node as node_module
+    transport = _InProcessTransport()
+    monkeypatch.setattr(node_module, "requests", transport)
+
+    peer, peer_client = _lane_state()
+    transport.clients["peer:1"] = peer_client
+    block = _seal_registration(peer)
+
+    node, client = _lane_state()
+    resp = client.post("/api/blocks?lane=social", json={"block": block.to_dict()})
+    assert resp.get_json()["accepted"] == 1
+    assert node.lanes.get("social").last_block.hash == block.hash
+    assert client.post("/api/blocks?lane=nope", json={"block": block.to_dict()}).status_code == 404
+
+    fresh, _ = _lane_state()
+    fresh.network_node.register_peer("did:socialchain:peer1", "peer:1")
+    assert fresh.network_node.sync_chain(fresh.blockchain) is True
+    assert fresh.lanes.get("social").last_block.hash == block.hash
+    assert fresh.blockchain.get_transactions_for("did:sc:bob")
+
+
+def test_lane_blocks_are_rejected_outside_their_lane():
+    state, client = _lane_state()
+    geneses = {lane.chain[0].hash for lane in state.lanes.chains()}
+    assert len(geneses | {state.blockchain.chain[0].hash}) == len(state.lanes.lanes) + 1
+    block = _seal_registration(state)
+
+    node, client = _lane_state()
+    root_tip = node.blockchain.last_block.hash
+    for query in ("", "?lane=agents"):
+        resp = client.post(f"/api/blocks{query}", json={"block": block.to_dict()})
+        assert resp.get_json()["accepted"] == 0
+    assert node.blockchain.last_block.hash == root_tip
+    assert node.blockchain.add_block(block) is False
+    assert node.lanes.get("agents").last_block.index == 0
@@ -0,0 +1,83 @@
+"""Tests for background mining jobs."""
+import time
+from socialchain.blockchain import JobStatus, MiningJobManager
+from tests.conftest import EasyChain, make_tx
+
+
+def _hard_chain():
+    """A chain whose mining jobs effectively never finish, but which accepts
+    any well-linked block from elsewhere."""
+    class HardChain(EasyChain):
+        def verify_block(self, block):
+            return True
+
+    bc = HardChain()
+    bc.DIFFICULTY = 7
+    return bc
+
+
+def test_job_mines_block_and_keeps_new_transactions(chain):
+    chain.add_transaction(make_tx(n=1))
+    manager = MiningJobManager()
+    job = manager.submit(chain, "did:sc:miner")
+    late = make_tx(n=2)
+    chain.add_transaction(late)
+    assert job.wait(10)
+    assert job.status == JobStatus.COMPLETED
+    assert chain.last_block.hash == job.block.hash
+    # Transactions submitted after the template snapshot stay pending
+    assert [tx.tx_id for tx in chain.pending_transactions] == [late.tx_id]
+    assert job.to_dict()["on_main_chain"] is True
+
+
+def test_rejected_block_fails_job():
+    class RejectingChain(EasyChain):
+        def add_block(self, block):
+            return False
+
+    bc = RejectingChain()
+    bc.add_transaction(make_tx(n=1))
+    job = MiningJobManager().submit(bc, "did:sc:miner")
+    assert job.wait(10)
+    assert job.status == JobStatus.FAILED
+    assert job.block is None
+    assert "rejected" in job.error
+    assert len(bc.chain) == 1
+
+
+def test_cancel_running_job():
+    bc = _hard_chain()
+    bc.add_transaction(make_tx(n=1))
+    manager = MiningJobManager()
+    job = manager.submit(bc, "did:sc:miner")
+    assert manager.cancel(job.job_id) is True
+    assert job.wait(10)
+    assert job.status == JobStatus.CANCELLED
+    assert len(bc.chain) == 1
+    assert manager.cancel(job.job_id) is False
+
+
+def test_competing_block_cancels_stale_job():
+    bc = _hard_chain()
+    bc.add_transaction(make_tx(n=1))
+    manager = MiningJobManager()
+    job = manager.submit(bc, "did:sc:miner")
+    time.sleep(0.05)
+
+    competitor = bc.create_block_template("did:sc:rival")
+    assert bc.add_block(competitor) is True
+    assert job.wait(10)
+    assert job.status == JobStatus.CANCELLED
+    assert "stale" in job.cancel_reason
+
+
+def test_cancel_endpoint(client, app_state):
+    app_state.blockchain.DIFFICULTY = 7
+    client.post("/api/transactions", json={"sender": "a", "recipient": "b", "data": {}})
+    job_id = client.post("/api/mine", json={}).get_json()["job_id"]
+    response = client.post(f"/api/mine/jobs/{job_id}/cancel")
+    assert response.status_code == 200
+    assert response.get_json()["job"]["status"] == "CANCELLED"
+    assert client.post(f"/api/mine/jobs/{job_id}/cancel").status_code == 400
+    jobs = client.get("/api/mine/jobs").get_json()
+    assert jobs["active"] == 0 and len(jobs["jobs"]) == 1
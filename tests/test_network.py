@@ -53,3 +53,295 @@ def test_network_node_remove_peer():
     result = node.remove_peer("did:socialchain:peer1")
     assert result is True
     assert "did:socialchain:peer1" not in node.get_peers()
+
+
+# ---------------------------------------------------------------------------
+# Peer health tracking
+# ---------------------------------------------------------------------------
+
+def test_peer_stats_rtt_ewma_and_height():
+    registry = PeerRegistry()
+    registry.add("did:socialchain:abc", "127.0.0.1:5001")
+    registry.record_success("did:socialchain:abc", 0.1, height=7)
+    registry.record_success("did:socialchain:abc", 0.2)
+    stats = registry.get_stats("did:socialchain:abc")
+    assert stats.successes == 2
+    assert stats.reported_height == 7
+    assert stats.rtt_ewma == pytest.approx(0.1 * 0.8 + 0.2 * 0.2)
+    assert stats.last_seen is not None
+
+
+def test_peer_backoff_is_exponential_and_reset_on_success():
+    registry = PeerRegistry()
+    registry.add("did:socialchain:abc", "127.0.0.1:5001")
+    registry.record_failure("did:socialchain:abc")
+    first = registry.get_stats("did:socialchain:abc").backoff_until
+    registry.record_failure("did:socialchain:abc")
+    second = registry.get_stats("did:socialchain:abc").backoff_until
+    assert second - first > 0.9  # 1s then 2s
+    assert not registry.is_available("did:socialchain:abc")
+    assert registry.available() == {}
+    registry.record_success("did:socialchain:abc", 0.05)
+    assert registry.is_available("did:socialchain:abc")
+
+
+def test_peer_ban():
+    registry = PeerRegistry()
+    registry.add("did:socialchain:abc", "127.0.0.1:5001")
+    registry.ban("did:socialchain:abc", "invalid block")
+    assert registry.is_banned("did:socialchain:abc")
+    assert registry.stats()["did:socialchain:abc"]["ban_reason"] == "invalid block"
+
+
+def test_select_for_sync_prefers_low_latency():
+    registry = PeerRegistry()
+    registry.add("did:socialchain:slow", "127.0.0.1:5001")
+    registry.add("did:socialchain:fast", "127.0.0.1:5002")
+    registry.add("did:socialchain:new", "127.0.0.1:5003")
+    registry.record_success("did:socialchain:slow", 2.0)
+    registry.record_success("did:socialchain:fast", 0.01)
+    order = [did for did, _ in registry.select_for_sync()]
+    assert order == ["did:socialchain:fast", "did:socialchain:new", "did:socialchain:slow"]
+    assert registry.timeout_for("did:socialchain:fast") == PeerRegistry.MIN_TIMEOUT
+
+
+def test_broadcast_backs_off_unreachable_peer():
+    node = NetworkNode()
+    node.register_peer("did:socialchain:dead", "127.0.0.1:1")
+    first = node.broadcast("/api/blocks", {})
+    assert first[0]["status"] is None and "error" in first[0]
+    second = node.broadcast("/api/blocks", {})
+    assert second[0].get("skipped") is True
+    assert node.registry.get_stats("did:socialchain:dead").failures == 1
+
+
+class _InProcessTransport:
+    """Routes ``requests`` calls made by NetworkNode to Flask test clients."""
+
+    class _Response:
+        def __init__(self, resp):
+            self.status_code = resp.status_code
+            self.headers = resp.headers
+            self.content = resp.data
+            self._resp = resp
+
+        def json(self):
+            return self._resp.get_json()
+
+        def raise_for_status(self):
+            if self.status_code >= 400:
+                raise RuntimeError(f"HTTP {self.status_code}")
+
+    def __init__(self):
+        self.clients = {}
+
+    def _client(self, url):
+        address, _, path = url[len("http://"):].partition("/")
+        if address not in self.clients:
+            raise ConnectionError(f"connection refused: {address}")
+        return self.clients[address], "/" + path
+
+    def get(self, url, timeout=None, headers=None, **kwargs):
+        client, path = self._client(url)
+        return self._Response(client.get(path, headers=headers))
+
+    def post(self, url, json=None, data=None, headers=None, timeout=None, **kwargs):
+        client, path = self._client(url)
+        if json is not None:
+            return self._Response(client.post(path, json=json, headers=headers))
+        return self._Response(client.post(path, data=data, headers=headers))
+
+
+@pytest.fixture
+def transport(monkeypatch):
+    import socialchain.network.node as node_module
+    t = _InProcessTransport()
+    monkeypatch.setattr(node_module, "requests", t)
+    return t
+
+
+def _peer_app(transport, address):
+    from socialchain.api.app import create_app, AppState
+    state = AppState()
+    app = create_app(state=state)
+    app.config["TESTING"] = True
+    transport.clients[address] = app.test_client()
+    return state
+
+
+def test_sync_chain_pulls_longer_chain(transport):
+    from socialchain.blockchain import Blockchain, Transaction
+    peer = _peer_app(transport, "peer:1")
+    peer.blockchain.add_transaction(Transaction("did:sc:a", "did:sc:b", {"n": 1}))
+    peer.blockchain.mine_block("did:sc:miner")
+
+    local = Blockchain()
+    node = NetworkNode()
+    node.register_peer("did:socialchain:peer1", "peer:1")
+    assert node.sync_chain(local) is True
+    assert local.last_block.hash == peer.blockchain.last_block.hash
+    stats = node.registry.get_stats("did:socialchain:peer1")
+    assert stats.reported_height == 1
+    assert stats.rtt_ewma is not None
+
+
+def test_sync_chain_fetches_only_the_tail(transport, monkeypatch):
+    from tests.conftest import EasyChain, mine_blocks
+    peer = _peer_app(transport, "peer:1")
+    peer.blockchain = EasyChain()
+    mine_blocks(peer.blockchain, 8)
+    local = EasyChain()
+    local.MAX_FORK_DEPTH = 2
+    for block in peer.blockchain.chain[1:6]:
+        assert local.add_block(block)
+
+    node = NetworkNode()
+    node.register_peer("did:socialchain:peer1", "peer:1")
+    fetched = []
+    fetch = node._fetch_chain
+    monkeypatch.setattr(node, "_fetch_chain", lambda *a, **kw: fetched.append(fetch(*a, **kw)) or fetched[-1])
+    assert node.sync_chain(local) is True
+    assert local.last_block.hash == peer.blockchain.last_block.hash
+    assert [b.index for b in fetched[0]] == [3, 4, 5, 6, 7, 8]
+
+
+def test_sync_chain_bans_peer_serving_invalid_block(transport):
+    from socialchain.blockchain import Blockchain, Transaction
+    peer = _peer_app(transport, "peer:1")
+    peer.blockchain.add_transaction(Transaction("did:sc:a", "did:sc:b", {"n": 1}))
+    peer.blockchain.mine_block("did:sc:miner")
+    peer.blockchain.chain[1].transactions[0].data = {"n": 999}
+
+    local = Blockchain()
+    node = NetworkNode()
+    node.register_peer("did:socialchain:peer1", "peer:1")
+    assert node.sync_chain(local) is False
+    assert len(local.chain) == 1
+    assert node.registry.is_banned("did:socialchain:peer1")
+
+
+# ---------------------------------------------------------------------------
+# Peer exchange and overlay maintenance
+# ---------------------------------------------------------------------------
+
+def test_exchange_endpoint_returns_sample_and_remembers_caller(transport):
+    peer = _peer_app(transport, "peer:1")
+    for i in range(30):
+        peer.network_node.register_peer(f"did:socialchain:p{i}", f"10.0.0.{i}:5000")
+    client = transport.clients["peer:1"]
+    data = client.post("/api/network/peers/exchange",
+                       json={"did": "did:socialchain:me", "address": "me:1"}).get_json()
+    assert len(data["peers"]) == NetworkNode.EXCHANGE_SAMPLE + 1
+    assert {"did": peer.network_node.node_id, "address": peer.network_node.address} in data["peers"]
+    assert peer.network_node.registry.get("did:socialchain:me") == "me:1"
+    assert not peer.network_node.registry.is_outbound("did:socialchain:me")
+
+
+def test_exchange_cannot_rewrite_a_known_peer_address(transport):
+    peer = _peer_app(transport, "peer:1")
+    registry = peer.network_node.registry
+    peer.network_node.register_peer("did:sc:good", "10.0.0.1:5000")
+    client = transport.clients["peer:1"]
+    client.post("/api/network/peers/exchange", json={"did": "did:sc:good", "address": "6.6.6.6:80"})
+    assert registry.get("did:sc:good") == "10.0.0.1:5000"
+    assert registry.is_outbound("did:sc:good")
+
+
+def test_overlay_trims_to_target_keeping_fastest():
+    from socialchain.network import OverlayMaintainer
+    node = NetworkNode()
+    for i in range(5):
+        did = f"did:socialchain:p{i}"
+        node.register_peer(did, f"10.0.0.{i}:5000")
+        node.registry.record_success(did, 0.01 * (i + 1))
+    overlay = OverlayMaintainer(node, target_outbound=2)
+    summary = overlay.maintain()
+    assert set(node.registry.outbound()) == {"did:socialchain:p0", "did:socialchain:p1"}
+    assert len(summary["dropped"]) == 3
+    # Demoted peers stay in the address book as candidates
+    assert len(node.registry) == 5
+
+
+def test_overlay_does_not_rotate_in_a_round_that_dropped_peers():
+    import random
+    from socialchain.network import OverlayMaintainer
+
+    class AlwaysRotate(random.Random):
+        def random(self):
+            return 0.0
+
+    node = NetworkNode()
+    for i in range(4):
+        did = f"did:socialchain:p{i}"
+        node.register_peer(did, f"10.0.0.{i}:5000", outbound=i < 3)
+        node.registry.record_success(did, 0.01 * (i + 1))
+    overlay = OverlayMaintainer(node, target_outbound=2, rng=AlwaysRotate(1))
+    summary = overlay.maintain()
+    assert summary["dropped"] == ["did:socialchain:p2"]
+    assert summary["rotated"] is None
+    assert set(node.registry.outbound()) == {"did:socialchain:p0", "did:socialchain:p1"}
+    # A later round on the now-stable overlay is free to rotate
+    assert overlay.maintain()["rotated"] is not None
+
+
+def test_overlay_fills_slots_via_peer_exchange(transport):
+    from socialchain.network import OverlayMaintainer
+    seed = _peer_app(transport, "seed:1")
+    for i in range(3):
+        address = f"node:{i}"
+        state = _peer_app(transport, address)
+        seed.network_node.register_peer(state.network_node.node_id, address)
+
+    node = NetworkNode()
+    node.register_peer(seed.network_node.node_id, "seed:1")
+    overlay = OverlayMaintainer(node, target_outbound=3)
+    summary = overlay.maintain()
+    assert len(summary["added"]) == 2
+    assert len(node.registry.outbound()) == 3
+    assert len(node.registry) == 4
+
+
+def test_broadcast_only_reaches_outbound_peers():
+    node = NetworkNode()
+    node.register_peer("did:socialchain:out", "127.0.0.1:1")
+    node.register_peer("did:socialchain:cand", "127.0.0.1:2", outbound=False)
+    results = node.broadcast("/api/blocks", {})
+    assert [r["did"] for r in results] == ["did:socialchain:out"]
+
+
+def test_address_book_is_bounded():
+    registry = PeerRegistry()
+    registry.MAX_KNOWN_PEERS = 3
+    registry.add("did:socialchain:out", "a:1")
+    for i in range(5):
+        registry.add(f"did:socialchain:c{i}", f"c:{i}", outbound=False)
+    assert len(registry) == 3
+    assert registry.is_outbound("did:socialchain:out")
+
+
+def test_sync_and_announce_use_wire_format(transport):
+    from socialchain.blockchain import Blockchain, Transaction
+    peer = _peer_app(transport, "peer:1")
+    node = NetworkNode()
+    node.register_peer("did:socialchain:peer1", "peer:1")
+    node.probe_tip("did:socialchain:peer1", "peer:1")
+    assert node.registry.get_stats("did:socialchain:peer1").wire_encodings
+
+    local = Blockchain()
+    local.add_transaction(Transaction("did:sc:a", "did:sc:b", {"n": 1}))
+    block = local.mine_block("did:sc:miner")
+    results = node.broadcast_block(block)
+    assert results[0]["data"]["accepted"] == 1
+    assert peer.blockchain.last_block.hash == block.hash
+
+
+def test_broadcast_block_falls_back_to_json_for_legacy_peers(transport):
+    from socialchain.blockchain import Blockchain, Transaction
+    peer = _peer_app(transport, "peer:1")
+    node = NetworkNode()
+    node.register_peer("did:socialchain:peer1", "peer:1")  # never probed
+    local = Blockchain()
+    local.add_transaction(Transaction("did:sc:a", "did:sc:b", {"n": 1}))
+    block = local.mine_block("did:sc:miner")
+    assert node.broadcast_block(block)[0]["data"]["accepted"] == 1
+    assert peer.blockchain.last_block.hash == block.hash
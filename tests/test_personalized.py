@@ -0,0 +1,142 @@
+"""Tests for personalized trust ranking from the random-walk bank."""
+import time
+import pytest
+from socialchain.social import trust
+from socialchain.social.personalized import WalkBank
+from socialchain.social.trust import TrustEdge, TrustGraph
+
+
+def _exact_ppr(tg, viewer, reset):
+    """Personalized PageRank by power iteration over score-proportional
+    transitions, stopping at identities with no positive out-edges."""
+    nodes = tg.list_nodes()
+    visits = {did: 0.0 for did in nodes}
+    mass = {did: 0.0 for did in nodes}
+    mass[viewer] = 1.0
+    for _ in range(200):
+        nxt = {did: 0.0 for did in nodes}
+        for did, m in mass.items():
+            if not m:
+                continue
+            visits[did] += m
+            edges = [e for e in tg.get_trustees(did) if e.score > 0]
+            total = sum(e.score for e in edges)
+            for e in edges:
+                nxt[e.trustee_did] += m * (1 - reset) * e.score / total
+        mass = nxt
+    total = sum(visits.values())
+    return {did: v / total for did, v in visits.items()}
+
+
+def _graph():
+    tg = TrustGraph()
+    tg.set_trust("did:v", "did:a", 0.9)
+    tg.set_trust("did:v", "did:b", 0.3)
+    tg.set_trust("did:a", "did:c", 0.8)
+    tg.set_trust("did:c", "did:v", 0.5)
+    tg.set_trust("did:v", "did:x", -0.9)  # distrust is never walked
+    tg.set_trust("did:y", "did:z", 0.9)
+    return tg
+
+
+def test_ranking_follows_the_viewers_trust():
+    bank = WalkBank(_graph(), walks_per_node=400, seed=1)
+    ranking = [did for did, _ in bank.top_k("did:v", k=10)]
+    assert ranking[0] == "did:a"
+    assert "did:x" not in ranking and "did:z" not in ranking
+    assert bank.score("did:v", "did:z") == 0.0
+    assert sum(bank.scores("did:v").values()) == pytest.approx(1.0)
+
+
+def test_estimates_match_exact_personalized_pagerank():
+    tg = _graph()
+    bank = WalkBank(tg, walks_per_node=4000, seed=2)
+    exact = _exact_ppr(tg, "did:v", bank.reset_probability)
+    estimate = bank.scores("did:v")
+    for did, value in exact.items():
+        assert estimate.get(did, 0.0) == pytest.approx(value, abs=0.02)
+
+
+def test_edge_changes_resample_only_affected_walks():
+    tg = _graph()
+    bank = WalkBank(tg, walks_per_node=50, seed=3)
+    bank.build()
+    untouched = [list(w) for w in bank._walks["did:y"]]
+    affected = len(bank._through["did:a"])
+    tg.set_trust("did:a", "did:b", 0.9)
+    assert bank.resampled == affected
+    assert bank._walks["did:y"] == untouched
+
+    tg.remove_trust("did:v", "did:a")
+    tg.remove_trust("did:c", "did:v")
+    assert bank.score("did:v", "did:a") == 0.0
+    assert bank.score("did:v", "did:b") > 0.0
+    bank.close()
+    tg.set_trust("did:v", "did:a", 0.9)
+    assert bank.score("did:v", "did:a") == 0.0  # no longer following the graph
+
+
+def test_personalized_trust_endpoint(client):
+    for truster, trustee in (("did:v", "did:a"), ("did:a", "did:c")):
+        client.post("/api/governance/trust", json={
+            "truster_did": truster, "trustee_did": trustee, "score": 0.9,
+        })
+    data = client.get("/api/governance/trust/personalized?viewer=did:v&k=5").get_json()
+    assert [r["did"] for r in data["ranking"]] == ["did:a", "did:c"]
+    data = client.get("/api/governance/trust/personalized?viewer=did:v&target=did:c").get_json()
+    assert 0.0 < data["score"] < 1.0
+    assert client.get("/api/governance/trust/personalized").status_code == 400
+    assert client.get("/api/governance/trust/personalized?viewer=did:v&k=0").status_code == 400
+
+
+def test_walks_follow_effective_scores_and_refresh_as_trust_decays(monkeypatch):
+    now = time.time()
+    monkeypatch.setattr(trust.time, "time", lambda: now)
+    tg = TrustGraph(half_life=100.0)
+    tg._put_edge(TrustEdge("did:v", "did:old", 0.9, timestamp=now - 1000.0))
+    tg._put_edge(TrustEdge("did:v", "did:new", 0.3, timestamp=now))
+    bank = WalkBank(tg, walks_per_node=200, seed=5)
+    assert bank.top_k("did:v", k=1)[0][0] == "did:new"
+    assert bank.score("did:v", "did:old") < 0.01
+
+    # Within a decay bucket the segments are reused; past it they regrow
+    bank.scores("did:v")
+    assert bank.refreshed == 0
+    now += tg.half_life * tg.DECAY_RESOLUTION
+    assert bank.scores("did:v") and bank.refreshed == 1
+
+
+def test_walks_stay_within_the_banks_context(client):
+    tg = TrustGraph()
+    tg.set_trust("did:v", "did:a", 0.9, context="trade")
+    tg.set_trust("did:v", "did:b", 0.9, context="governance")
+    bank = WalkBank(tg, walks_per_node=50, seed=6, context="trade")
+    assert [did for did, _ in bank.top_k("did:v")] == ["did:a"]
+    with pytest.raises(ValueError):
+        WalkBank(tg, context={"trade": -1})
+
+    for trustee, context in (("did:a", "trade"), ("did:b", "governance")):
+        client.post("/api/governance/trust", json={
+            "truster_did": "did:v", "trustee_did": trustee, "score": 0.9, "context": context,
+        })
+    data = client.get("/api/governance/trust/personalized?viewer=did:v&context=governance").get_json()
+    assert data["context"] == "governance"
+    assert [r["did"] for r in data["ranking"]] == ["did:b"]
+    resp = client.get("/api/governance/trust/personalized?viewer=did:v&context=trade:-1")
+    assert resp.status_code == 400
+
+
+def test_unknown_viewers_get_nothing_and_viewers_are_bounded():
+    tg = _graph()
+    bank = WalkBank(tg, walks_per_node=5, seed=4, max_viewers=2)
+    assert bank.scores("did:nobody") == {} and bank.top_k("did:nobody") == []
+    assert "did:nobody" not in bank._walks
+    for viewer in ("did:v", "did:a", "did:c"):
+        bank.scores(viewer)
+    assert list(bank._walks) == ["did:a", "did:c"] and bank.evicted == 1
+    # The evicted viewer's segments no longer take part in resampling
+    assert all(owner != "did:v" for keys in bank._through.values() for owner, _ in keys)
+    bank.scores("did:a")
+    bank.scores("did:v")
+    assert list(bank._walks) == ["did:a", "did:v"]
+    assert bank.build() == 0
@@ -0,0 +1,96 @@
+"""Tests for Merkle-committed headers and block body pruning."""
+import pytest
+from socialchain.api.app import create_app
+from socialchain.blockchain import Block
+from socialchain.network import wire
+from tests.conftest import EasyChain, make_tx, mine_blocks
+
+
+class PruningChain(EasyChain):
+    MAX_FORK_DEPTH = 2
+
+
+def _mine(bc, n):
+    mine_blocks(bc, n, kind="agent_status", recipient="did:sc:bob")
+
+
+def test_header_commits_to_merkle_root():
+    bc = PruningChain()
+    _mine(bc, 1)
+    block = bc.last_block
+    assert bc.get_merkle_root(1) == block.merkle_root
+    block.transactions[0].timestamp += 1  # not covered by Transaction.compute_hash
+    assert block.compute_hash() != block.hash
+    assert bc.verify_block(block) is False
+
+
+def test_retention_must_cover_fork_depth():
+    with pytest.raises(ValueError):
+        PruningChain(retention=1)
+
+
+def test_old_bodies_are_pruned_and_headers_kept():
+    bc = PruningChain(retention=2)
+    _mine(bc, 3)
+    roots = {b.index: (b.hash, b.merkle_root) for b in bc.chain}
+    _mine(bc, 3)
+    pruned = [b.index for b in bc.chain if b.pruned]
+    assert pruned == [1, 2, 3, 4]
+    for block in bc.chain[1:4]:
+        assert block.transactions == []
+        assert block.tx_count == 2
+        assert (block.hash, block.merkle_root) == roots[block.index]
+    assert bc.validate_chain() is True
+    assert bc.get_balance("did:sc:miner") == 6
+    assert len(bc.get_transactions_for("did:sc:alice")) == 2
+    assert bc.pruned_count("did:sc:alice") == 4
+    assert bc.pruned_count("did:sc:miner") == 4
+
+
+def test_reorg_within_retention_window():
+    bc = PruningChain(retention=2)
+    _mine(bc, 4)
+    fork_parent = bc.chain[-2]
+    rival = PruningChain()
+    branch = []
+    parent = fork_parent
+    for i in range(2):
+        block = Block(parent.index + 1, [make_tx(sender="did:sc:x", recipient="did:sc:y", n=i)], parent.hash)
+        block.nonce, block.hash = bc._proof_of_work(block)
+        branch.append(block)
+        parent = block
+    for block in branch:
+        assert bc.add_block(block)
+    assert bc.last_block.hash == branch[-1].hash
+    assert bc.validate_chain() is True
+    assert rival.add_block(bc.chain[1]) is False  # pruned bodies cannot be replayed
+
+
+def test_pruned_blocks_round_trip_on_the_wire():
+    bc = PruningChain(retention=2)
+    _mine(bc, 4)
+    kind, blocks = wire.decode(wire.encode_blocks(bc.chain))
+    assert [b.pruned for b in blocks] == [b.pruned for b in bc.chain]
+    assert all(b.compute_hash() == b.hash for b in blocks)
+    assert Block.from_dict(bc.chain[1].to_dict()).compute_hash() == bc.chain[1].hash
+
+
+def test_block_endpoint_reports_pruned_bodies():
+    from socialchain.api.app import AppState
+    state = AppState()
+    state.blockchain = PruningChain(retention=2)
+    _mine(state.blockchain, 4)
+    app = create_app(state=state)
+    app.config["TESTING"] = True
+    client = app.test_client()
+
+    resp = client.get("/api/chain/blocks/1")
+    assert resp.status_code == 410
+    assert resp.get_json()["pruned"] is True
+    assert resp.get_json()["block"]["tx_count"] == 2
+    resp = client.get("/api/chain/blocks/4")
+    assert resp.status_code == 200
+    assert len(resp.get_json()["block"]["transactions"]) == 2
+    assert client.get("/api/chain/blocks/9").status_code == 404
+    data = client.get("/api/transactions/did:sc:alice").get_json()
+    assert (data["count"], data["pruned"]) == (2, 2)
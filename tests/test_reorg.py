@@ -0,0 +1,118 @@
+"""Tests for fork-tree block acceptance and chain reorganisation."""
+import pytest
+from socialchain.blockchain import Block, Transaction
+from tests.conftest import EasyChain, make_tx
+
+
+def _seal(bc, block):
+    block.nonce, block.hash = bc._proof_of_work(block)
+    return block
+
+
+def _make_block(bc, parent, txs, miner="did:sc:other", timestamp=None):
+    reward = Transaction(sender="NETWORK", recipient=miner, data={"reward": 1, "type": "mining_reward"})
+    block = Block(
+        index=parent.index + 1,
+        transactions=list(txs) + [reward],
+        previous_hash=parent.hash,
+        timestamp=timestamp,
+    )
+    return _seal(bc, block)
+
+
+def test_independent_nodes_share_genesis():
+    assert EasyChain().chain[0].hash == EasyChain().chain[0].hash
+
+
+def test_add_block_extends_tip(chain):
+    block = _make_block(chain, chain.last_block, [])
+    assert chain.add_block(block) is True
+    assert chain.last_block.hash == block.hash
+    assert chain.add_block(block) is False  # duplicate
+
+
+def test_orphan_block_rejected(chain):
+    orphan = Block(index=5, transactions=[], previous_hash="ab" * 32)
+    _seal(chain, orphan)
+    assert chain.add_block(orphan) is False
+
+
+def test_side_branch_kept_without_reorg(chain):
+    chain.add_transaction(make_tx(n=1))
+    chain.mine_block("did:sc:miner")
+    genesis = chain.chain[0]
+    side = _make_block(chain, genesis, [], timestamp=genesis.timestamp + 1)
+    assert chain.add_block(side) is True
+    # Equal work does not displace the current tip
+    assert chain.last_block.index == 1
+    assert chain.last_block.hash != side.hash
+    assert chain.has_block(side.hash)
+
+
+def test_reorg_to_heavier_branch_returns_transactions(chain):
+    tx_a = make_tx(n=1)
+    chain.add_transaction(tx_a)
+    chain.mine_block("did:sc:miner")
+    assert chain.get_balance("did:sc:miner") == 1
+
+    genesis = chain.chain[0]
+    tx_shared = Transaction("did:sc:c", "did:sc:d", {"n": 2})
+    b1 = _make_block(chain, genesis, [tx_shared], timestamp=genesis.timestamp + 1)
+    b2 = _make_block(chain, b1, [], timestamp=genesis.timestamp + 2)
+    chain.add_transaction(tx_shared)
+    assert chain.add_block(b1) is True
+    assert chain.add_block(b2) is True
+
+    assert chain.last_block.hash == b2.hash
+    assert len(chain.chain) == 3
+    pending_ids = [tx.tx_id for tx in chain.pending_transactions]
+    # tx_a came back from the disconnected block, the old reward did not,
+    # and tx_shared was mined by the new branch
+    assert pending_ids == [tx_a.tx_id]
+    assert chain.get_balance("did:sc:miner") == 0
+    assert chain.get_balance("did:sc:other") == 2
+    assert chain.get_transactions_for("did:sc:a") == []
+    assert [t["tx_id"] for t in chain.get_transactions_for("did:sc:c")] == [tx_shared.tx_id]
+    assert chain.validate_chain() is True
+
+
+def test_fork_deeper_than_limit_rejected(chain):
+    chain.MAX_FORK_DEPTH = 2
+    for i in range(3):
+        chain.add_transaction(make_tx(n=i))
+        chain.mine_block("did:sc:miner")
+    genesis = chain.chain[0]
+    side = _make_block(chain, genesis, [], timestamp=genesis.timestamp + 1)
+    assert chain.add_block(side) is False
+
+
+def test_side_branch_is_pruned_whole_once_its_fork_is_too_deep(chain):
+    chain.MAX_FORK_DEPTH = 3
+
+    def mine_main():
+        chain.add_transaction(make_tx(n=chain.last_block.index))
+        chain.mine_block("did:sc:miner")
+
+    for _ in range(3):
+        mine_main()
+    genesis = chain.chain[0]
+    side = [genesis]
+    for i in range(3):
+        side.append(_make_block(chain, side[-1], [], timestamp=genesis.timestamp + 1 + i))
+        assert chain.add_block(side[-1]) is True
+    mine_main()
+    # The branch forks at genesis, now 4 blocks below the tip: all of it
+    # goes, not just its blocks at or below the cutoff height
+    assert not any(chain.has_block(b.hash) for b in side[1:])
+    for i in range(2):
+        side.append(_make_block(chain, side[-1], [], timestamp=genesis.timestamp + 10 + i))
+        assert chain.add_block(side[-1]) is False
+    assert chain.last_block.index == 4 and chain.is_on_main_chain(chain.last_block)
+
+
+def test_block_round_trips_through_dict(chain):
+    chain.add_transaction(make_tx(n=1))
+    block = chain.mine_block("did:sc:miner")
+    restored = Block.from_dict(block.to_dict())
+    assert restored.hash == block.hash
+    assert restored.compute_hash() == block.hash
@@ -0,0 +1,116 @@
+"""Tests for the automatic block production scheduler."""
+import time
+import pytest
+from socialchain.blockchain import (
+    BlockScheduler, Blockchain, Identity, JobStatus, MiningJobManager, ProofOfAuthority,
+    Transaction,
+)
+from tests.conftest import EasyChain, make_tx
+
+
+def _scheduler(**kwargs):
+    bc = EasyChain()
+    return bc, BlockScheduler(bc, MiningJobManager(), "did:sc:miner", **kwargs)
+
+
+def _wait_for(predicate, timeout=5.0):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.01)
+    return False
+
+
+def test_count_trigger_produces_block():
+    bc, scheduler = _scheduler(max_pending=3)
+    scheduler.start()
+    try:
+        for i in range(3):
+            bc.add_transaction(make_tx(n=i))
+        assert _wait_for(lambda: scheduler.blocks_produced == 1)
+        assert scheduler.triggers["count"] == 1
+        assert _wait_for(lambda: scheduler.confirmed == 3)
+        assert scheduler.latency_stats()["p50"] is not None
+    finally:
+        scheduler.stop()
+
+
+def test_interval_trigger_and_idle_when_empty():
+    bc, scheduler = _scheduler(interval=0.1)
+    scheduler.start()
+    try:
+        time.sleep(0.25)
+        assert len(bc.chain) == 1  # nothing pending, nothing mined
+        bc.add_transaction(make_tx(n=1))
+        assert _wait_for(lambda: scheduler.blocks_produced == 1)
+        assert scheduler.last_trigger == "interval"
+        assert scheduler.latency_stats()["max"] >= 0.1
+    finally:
+        scheduler.stop()
+    assert not scheduler.running
+
+
+def test_poa_scheduler_waits_for_other_authorities():
+    us, them = Identity(), Identity()
+    dids = [us.did, them.did]
+    bc = Blockchain(consensus=ProofOfAuthority(dids, identity=us))
+    other = Blockchain(consensus=ProofOfAuthority(dids, identity=them))
+    mining = MiningJobManager()
+    scheduler = BlockScheduler(bc, mining, us.did, interval=0.05)
+    scheduler.start()
+    try:
+        bc.add_transaction(make_tx(n=1))
+        assert _wait_for(lambda: len(bc.chain) == 2)
+        # We sealed the last block: nothing is mined, and no job is started,
+        # until the other authority extends the chain
+        bc.add_transaction(make_tx(n=2))
+        time.sleep(0.3)
+        assert len(bc.chain) == 2
+        assert len(mining.list()) == 1
+        assert other.add_block(bc.last_block)
+        assert bc.add_block(other.mine_block(them.did))
+        assert _wait_for(lambda: scheduler.blocks_produced == 2)
+        assert len(bc.chain) == 4
+        assert all(job.status == JobStatus.COMPLETED for job in mining.list())
+    finally:
+        scheduler.stop()
+
+
+def test_failed_job_backs_off(monkeypatch):
+    bc, scheduler = _scheduler(interval=0.01)
+    monkeypatch.setattr(bc, "seal_block", lambda block, should_stop=None: 1 / 0)
+    scheduler.start()
+    try:
+        bc.add_transaction(make_tx(n=1))
+        assert _wait_for(lambda: scheduler.failures == 1)
+        time.sleep(0.2)
+        assert scheduler.failures == 1  # next attempt waits RETRY_DELAY
+    finally:
+        scheduler.stop()
+    assert [job.status for job in scheduler.mining.list()] == [JobStatus.FAILED]
+
+
+def test_bytes_trigger():
+    bc, scheduler = _scheduler(max_pending_bytes=500, interval=60)
+    bc.add_transaction(Transaction("did:sc:a", "did:sc:b", {"blob": "x" * 600}))
+    assert scheduler.due() == "bytes"
+
+
+def test_invalid_configuration():
+    bc, scheduler = _scheduler()
+    with pytest.raises(ValueError):
+        scheduler.start()  # no trigger configured
+    with pytest.raises(ValueError):
+        scheduler.configure(interval=0)
+
+
+def test_scheduler_endpoint(client):
+    assert client.get("/api/chain/scheduler").get_json()["scheduler"]["running"] is False
+    response = client.post("/api/chain/scheduler", json={"max_pending": 5})
+    assert response.get_json()["scheduler"]["max_pending"] == 5
+    assert client.post("/api/chain/scheduler", json={"interval": -1}).status_code == 400
+    response = client.post("/api/chain/scheduler", json={"running": True})
+    assert response.get_json()["scheduler"]["running"] is True
+    response = client.post("/api/chain/scheduler", json={"running": False})
+    assert response.get_json()["scheduler"]["running"] is False
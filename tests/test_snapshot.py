@@ -0,0 +1,166 @@
+"""Tests for state snapshots and snapshot bootstrap."""
+import os
+
+import pytest
+from socialchain.api.app import AppState, create_app
+from socialchain.api.snapshot import (
+    PeriodicSnapshots, SnapshotStore, bootstrap_from_peer, build_snapshot, restore_snapshot,
+)
+from socialchain.blockchain import SmartContract, Transaction
+from socialchain.governance.community import Community
+
+
+def _state():
+    state = AppState()
+    state.blockchain.DIFFICULTY = 1
+    return state
+
+
+def _mine(state, n, miner="did:sc:miner"):
+    for i in range(n):
+        state.blockchain.add_transaction(Transaction("did:sc:alice", "did:sc:bob", {"n": i}))
+        state.blockchain.mine_block(miner)
+
+
+def _populated_state():
+    state = _state()
+    _mine(state, 3)
+    state.trust_graph.set_trust("did:sc:alice", "did:sc:bob", 0.6)
+    vouch = state.sybil_resistance.create_vouch("did:sc:alice", "did:sc:carol")
+    state.sybil_resistance.accept_vouch(vouch.vouch_id)
+    contract = SmartContract("did:sc:alice", "Deal", participants=["did:sc:bob"])
+    state.contracts[contract.contract_id] = contract
+    community = Community("Makers", "did:sc:alice")
+    community.add_member("did:sc:bob")
+    proposal = community.create_proposal("did:sc:bob", "Meetups")
+    community.activate_proposal(proposal.proposal_id, "did:sc:alice")
+    community.vote_on_proposal(proposal.proposal_id, "did:sc:bob", "for")
+    state.communities[community.community_id] = community
+    return state
+
+
+def test_restore_reproduces_derived_state(tmp_path):
+    source = _populated_state()
+    store = SnapshotStore(str(tmp_path))
+    store.save(build_snapshot(source))
+
+    restored = _state()
+    restore_snapshot(restored, store.latest())
+    bc = restored.blockchain
+    assert bc.last_block.hash == source.blockchain.last_block.hash
+    assert bc.snapshot_height == 3
+    assert bc.get_balance("did:sc:miner") == 3
+    assert bc.get_transactions_for("did:sc:alice") == source.blockchain.get_transactions_for("did:sc:alice")
+    assert restored.trust_graph.get_direct_trust_score("did:sc:alice", "did:sc:bob") == 0.6
+    assert restored.sybil_resistance.get_accepted_vouches_for("did:sc:carol")
+    assert list(restored.contracts) == list(source.contracts)
+    community = next(iter(restored.communities.values()))
+    assert community.is_member("did:sc:bob")
+    proposal = community.list_proposals()[0]
+    assert community.voting_system.has_voted("did:sc:bob", proposal.proposal_id)
+    assert community.resolve_proposal(proposal.proposal_id)["tally"]["passed"] is True
+
+
+def test_restored_chain_accepts_later_blocks():
+    source = _state()
+    _mine(source, 3)
+    snapshot = build_snapshot(source)
+    _mine(source, 2)
+
+    restored = _state()
+    restore_snapshot(restored, snapshot)
+    for block in source.blockchain.blocks_since(restored.blockchain.last_block.index + 1):
+        assert restored.blockchain.add_block(block)
+    assert restored.blockchain.last_block.hash == source.blockchain.last_block.hash
+    assert restored.blockchain.get_balance("did:sc:miner") == 5
+    assert restored.blockchain.validate_chain() is True
+    _mine(restored, 1)
+    assert restored.blockchain.last_block.index == 6
+
+
+def test_snapshot_keeps_bounded_block_tail():
+    source = _state()
+    source.blockchain.MAX_FORK_DEPTH = 2
+    _mine(source, 5)
+    snapshot = build_snapshot(source)
+    assert [b["index"] for b in snapshot["chain"]["blocks"]] == [3, 4, 5]
+
+    restored = _state()
+    restore_snapshot(restored, snapshot)
+    assert restored.blockchain.base_index == 3
+    assert restored.blockchain.to_dict()["length"] == 6
+
+
+def test_tampered_snapshot_is_rejected():
+    source = _state()
+    _mine(source, 2)
+    snapshot = build_snapshot(source)
+    snapshot["chain"]["blocks"][1]["transactions"][0]["data"] = {"n": 999}
+    with pytest.raises(ValueError):
+        restore_snapshot(_state(), snapshot)
+
+
+def test_store_writes_atomically_and_prunes(tmp_path):
+    state = _state()
+    store = SnapshotStore(str(tmp_path), keep=2)
+    for _ in range(3):
+        _mine(state, 1)
+        store.save(build_snapshot(state))
+    names = sorted(os.listdir(tmp_path))
+    assert len(names) == 2
+    assert all(name.startswith("snapshot-") for name in names)  # no temp files left
+    assert store.latest()["height"] == 3
+
+
+def test_periodic_snapshots_follow_the_tip(tmp_path):
+    state = _state()
+    snapshots = PeriodicSnapshots(state, SnapshotStore(str(tmp_path)), every=2)
+    snapshots.start()
+    _mine(state, 3)
+    assert snapshots.last_height == 2
+    snapshots.stop()
+    _mine(state, 1)
+    assert snapshots.last_height == 2
+
+
+def test_snapshot_endpoint_and_peer_bootstrap(monkeypatch):
+    from tests.test_network import _InProcessTransport
+    import socialchain.network.node as node_module
+    transport = _InProcessTransport()
+    monkeypatch.setattr(node_module, "requests", transport)
+
+    peer = _populated_state()
+    app = create_app(state=peer)
+    app.config["TESTING"] = True
+    client = app.test_client()
+    transport.clients["peer:1"] = client
+    data = client.get("/api/snapshot").get_json()
+    assert (data["height"], data["hash"]) == (3, peer.blockchain.last_block.hash)
+    assert [b["index"] for b in client.get("/api/chain?since=2").get_json()["chain"]] == [2, 3]
+
+    node = _state()
+    node.network_node.register_peer("did:socialchain:peer1", "peer:1")
+    snapshot = node.network_node.fetch_snapshot("did:socialchain:peer1", "peer:1")
+    assert snapshot["height"] == 3
+    _mine(peer, 1)  # bootstrap must sync the block after the snapshot
+    monkeypatch.setattr(node.network_node, "fetch_snapshot", lambda did, address: snapshot)
+    assert bootstrap_from_peer(node, "did:socialchain:peer1", "peer:1") is True
+    assert node.blockchain.last_block.hash == peer.blockchain.last_block.hash
+    assert node.trust_graph.get_edge_count() == peer.trust_graph.get_edge_count()
+
+
+def test_snapshot_does_not_carry_the_full_transaction_history():
+    source = _state()
+    source.blockchain.MAX_FORK_DEPTH = 2
+    _mine(source, 6)
+    snapshot = build_snapshot(source)["chain"]
+    assert "transactions" not in snapshot and "did_transactions" not in snapshot
+    assert snapshot["pruned_tx_counts"] == {"did:sc:alice": 3, "did:sc:bob": 3, "did:sc:miner": 3, "NETWORK": 3}
+
+    restored = _state()
+    restored.blockchain.MAX_FORK_DEPTH = 2
+    restore_snapshot(restored, build_snapshot(source))
+    bc = restored.blockchain
+    assert bc.get_balance("did:sc:miner") == 6
+    assert bc.get_transactions_for("did:sc:alice") == source.blockchain.get_transactions_for("did:sc:alice")[3:]
+    assert bc.pruned_count("did:sc:alice") == 3
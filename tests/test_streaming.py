@@ -0,0 +1,44 @@
+"""Tests for streamed JSON responses."""
+import json
+
+from socialchain.api.streaming import iter_json
+from socialchain.blockchain import Transaction
+
+
+def test_iter_json_matches_json_dumps():
+    value = {"a": (x for x in [{"n": 1}, [2, 3], "é"]), "b": None, "c": {"d": (x for x in [])}}
+    text = "".join(iter_json(value))
+    assert json.loads(text) == {"a": [{"n": 1}, [2, 3], "é"], "b": None, "c": {"d": []}}
+
+
+def test_chain_is_streamed(client, app_state):
+    app_state.blockchain.DIFFICULTY = 1
+    app_state.blockchain.add_transaction(Transaction("did:sc:a", "did:sc:b", {"n": 1}))
+    app_state.blockchain.mine_block("did:sc:miner")
+    resp = client.get("/api/chain")
+    assert resp.is_streamed
+    assert resp.mimetype == "application/json"
+    data = resp.get_json()
+    assert data["length"] == 2
+    assert [b["hash"] for b in data["chain"]] == [b.hash for b in app_state.blockchain.chain]
+
+
+def test_trust_graph_dump(client, app_state):
+    app_state.trust_graph.set_trust("did:sc:a", "did:sc:b", 0.5)
+    app_state.trust_graph.set_trust("did:sc:b", "did:sc:c", 0.25)
+    resp = client.get("/api/governance/trust/graph")
+    assert resp.status_code == 200
+    data = resp.get_json()
+    assert data["edge_count"] == 2
+    assert sorted(data["nodes"]) == ["did:sc:a", "did:sc:b", "did:sc:c"]
+    assert {(e["truster_did"], e["score"]) for e in data["edges"]} == {("did:sc:a", 0.5), ("did:sc:b", 0.25)}
+
+
+def test_profile_and_contract_lists_stream(client):
+    client.post("/api/social/profiles", json={"did": "did:sc:a", "display_name": "A"})
+    client.post("/api/contracts", json={"creator_did": "did:sc:a", "title": "Deal"})
+    profiles = client.get("/api/social/profiles")
+    contracts = client.get("/api/contracts")
+    assert profiles.is_streamed and contracts.is_streamed
+    assert [p["did"] for p in profiles.get_json()["profiles"]] == ["did:sc:a"]
+    assert contracts.get_json()["count"] == 1
@@ -1,6 +1,7 @@
 """Tests for Sybil Resistance module."""
 import pytest
 from socialchain.social.trust import TrustGraph
+from socialchain.social import sybil
 from socialchain.social.sybil import (
     SybilResistance, Vouch, VouchStatus, VerificationLevel,
 )
@@ -68,19 +69,65 @@ def test_verification_basic(sybil_system):
     assert level == VerificationLevel.BASIC
 
 
+def _accept(sybil_system, voucher, vouchee):
+    vouch = sybil_system.create_vouch(voucher, vouchee)
+    return sybil_system.accept_vouch(vouch.vouch_id)
+
+
 def test_verification_standard(sybil_system):
     # Need 3 vouches with 2 from verified users
-    # First, create verified vouchers
-    for i, voucher in enumerate(["did:v1", "did:v2", "did:v3"]):
-        # Pre-set vouchers as BASIC verified
-        sybil_system._verification_cache[voucher] = VerificationLevel.BASIC
-        vouch = sybil_system.create_vouch(voucher, "did:target")
-        sybil_system.accept_vouch(vouch.vouch_id)
+    # First, make the vouchers BASIC verified with vouches of their own
+    for voucher in ["did:v1", "did:v2", "did:v3"]:
+        _accept(sybil_system, "did:root", voucher)
+        _accept(sybil_system, voucher, "did:target")
 
     level = sybil_system.compute_verification_level("did:target")
     assert level == VerificationLevel.STANDARD
 
 
+def test_verification_does_not_depend_on_query_order(sybil_system):
+    # Vouches land before the vouchers are verified themselves
+    for voucher in ["did:v1", "did:v2", "did:v3"]:
+        _accept(sybil_system, voucher, "did:target")
+    assert sybil_system.compute_verification_level("did:target") == VerificationLevel.BASIC
+    for voucher in ["did:v1", "did:v2"]:
+        _accept(sybil_system, "did:root", voucher)
+    assert sybil_system.compute_verification_level("did:target") == VerificationLevel.STANDARD
+
+    restored = SybilResistance.from_dict(sybil_system.to_dict(), sybil_system.trust_graph)
+    assert restored.compute_verification_level("did:target") == VerificationLevel.STANDARD
+
+
+def test_revocation_propagates_downstream(sybil_system):
+    root_vouches = [_accept(sybil_system, "did:root", v) for v in ["did:v1", "did:v2"]]
+    for voucher in ["did:v1", "did:v2", "did:v3"]:
+        _accept(sybil_system, voucher, "did:target")
+    assert sybil_system.compute_verification_level("did:target") == VerificationLevel.STANDARD
+
+    sybil_system.revoke_vouch(root_vouches[0].vouch_id)
+    assert sybil_system.compute_verification_level("did:v1") == VerificationLevel.UNVERIFIED
+    assert sybil_system.compute_verification_level("did:target") == VerificationLevel.BASIC
+
+
+def test_vouching_cycle_cannot_keep_itself_verified(sybil_system, monkeypatch):
+    # With BASIC needing a verified voucher, verification must trace back
+    # to an identity verified by vouch count alone
+    monkeypatch.setitem(sybil.VERIFICATION_REQUIREMENTS, VerificationLevel.BASIC,
+                        {"min_vouches": 1, "min_verified_vouches": 1})
+    monkeypatch.setitem(sybil.VERIFICATION_REQUIREMENTS, VerificationLevel.STANDARD,
+                        {"min_vouches": 3, "min_verified_vouches": 0})
+    for voucher in ["did:s1", "did:s2", "did:s3"]:
+        _accept(sybil_system, voucher, "did:seed")
+    grounding = _accept(sybil_system, "did:seed", "did:a")
+    _accept(sybil_system, "did:a", "did:b")
+    _accept(sybil_system, "did:b", "did:a")
+    assert sybil_system.compute_verification_level("did:b") == VerificationLevel.BASIC
+
+    sybil_system.revoke_vouch(grounding.vouch_id)
+    assert sybil_system.compute_verification_level("did:a") == VerificationLevel.UNVERIFIED
+    assert sybil_system.compute_verification_level("did:b") == VerificationLevel.UNVERIFIED
+
+
 def test_vouch_serialization():
     vouch = Vouch("did:alice", "did:bob", message="trusted friend")
     d = vouch.to_dict()
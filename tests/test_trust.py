@@ -1,5 +1,9 @@
 """Tests for Trust & Reputation system."""
+import random
+
 import pytest
+from socialchain.blockchain.interner import DIDInterner, DIDS
+from socialchain.social.reputation import BACKENDS, ReputationEngine
 from socialchain.social.trust import (
     TrustGraph, TrustEdge, TrustLevel, score_to_trust_level,
 )
@@ -81,6 +85,21 @@ def test_trust_graph_trustees_and_trusters():
     assert len(trusters) == 2
 
 
+def test_trust_graph_remove_trust():
+    tg = TrustGraph()
+    tg.set_trust("did:alice", "did:carol", 0.6)
+    tg.set_trust("did:bob", "did:carol", 0.9)
+    tg.set_trust("did:bob", "did:carol", 0.4)  # update keeps one in-edge
+    assert sorted(e.score for e in tg.get_trusters("did:carol")) == [0.4, 0.6]
+
+    assert tg.remove_trust("did:alice", "did:carol") is True
+    assert tg.remove_trust("did:alice", "did:carol") is False
+    assert [e.truster_did for e in tg.get_trusters("did:carol")] == ["did:bob"]
+    assert tg.get_trustees("did:alice") == []
+    assert tg.get_edge_count() == 1
+    assert tg.get_node_count() == 3
+
+
 def test_trust_propagation_direct():
     tg = TrustGraph()
     tg.set_trust("did:alice", "did:bob", 0.8)
@@ -107,6 +126,27 @@ def test_trust_propagation_no_path():
     assert score == 0.0
 
 
+def test_trust_propagation_picks_strongest_path():
+    tg = TrustGraph()
+    # The BFS-first route alice -> bob -> dave is weaker than the longer one
+    tg.set_trust("did:alice", "did:bob", 0.2)
+    tg.set_trust("did:bob", "did:dave", 0.2)
+    tg.set_trust("did:alice", "did:carol", 1.0)
+    tg.set_trust("did:carol", "did:erin", 1.0)
+    tg.set_trust("did:erin", "did:dave", 1.0)
+    tg.set_trust("did:bob", "did:mallory", -1.0)
+    score, path = tg.trust_path("did:alice", "did:dave")
+    assert path == ["did:alice", "did:carol", "did:erin", "did:dave"]
+    assert score == pytest.approx(0.125)
+
+    reachable = tg.propagated_trust_from("did:alice")
+    assert reachable["did:bob"] == (0.2, ["did:alice", "did:bob"])  # direct
+    assert reachable["did:mallory"][0] == pytest.approx(-0.05)
+    assert reachable["did:dave"] == (score, path)
+    assert tg.trust_path("did:alice", "did:dave", max_depth=2)[1] == ["did:alice", "did:bob", "did:dave"]
+    assert tg.trust_path("did:dave", "did:alice") == (0.0, [])
+
+
 def test_reputation_computation():
     tg = TrustGraph()
     tg.set_trust("did:alice", "did:bob", 0.9)
@@ -137,3 +177,172 @@ def test_trust_graph_serialization():
     assert d["edge_count"] == 2
     assert len(d["edges"]) == 2
     assert len(d["nodes"]) == 3
+
+
+def _reference_reputation(tg, iterations=20, damping=0.85):
+    """The original dict-based power iteration."""
+    nodes = tg.list_nodes()
+    n = len(nodes)
+    rep = {did: 1.0 / n for did in nodes}
+    for _ in range(iterations):
+        rep = {
+            did: (1 - damping) / n + damping * sum(
+                e.score * rep[e.truster_did] for e in tg.get_trusters(did) if e.score > 0
+            )
+            for did in nodes
+        }
+    peak = max(rep.values())
+    return {did: r / peak for did, r in rep.items()}
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_reputation_backends_match_reference(backend):
+    rng = random.Random(3)
+    tg = TrustGraph()
+    dids = [f"did:n{i}" for i in range(60)]
+    for did in dids:
+        for trustee in rng.sample(dids, 4):
+            if trustee != did:
+                tg.set_trust(did, trustee, round(rng.uniform(-0.5, 1.0), 2))
+    tg.add_node("did:dangling")
+    tg.set_trust("did:n0", "did:dangling", 0.9)  # trusts nobody itself
+
+    expected = _reference_reputation(tg)
+    rep = tg.compute_reputation(backend=backend)
+    assert rep.keys() == expected.keys()
+    assert max(abs(rep[d] - expected[d]) for d in rep) < 1e-6
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_reputation_stops_early_once_converged(backend):
+    tg = TrustGraph()
+    tg.set_trust("did:a", "did:b", 0.5)
+    tg.set_trust("did:b", "did:c", 0.5)
+    engine = ReputationEngine(max_iterations=100, tolerance=1e-9, backend=backend)
+    rep = engine.compute(tg)
+    assert engine.iterations < 10
+    assert rep == pytest.approx(_reference_reputation(tg), abs=1e-9)
+    with pytest.raises(ValueError):
+        ReputationEngine(backend="fortran")
+
+
+def test_reputation_is_maintained_and_warm_started():
+    rng = random.Random(5)
+    tg = TrustGraph()
+    dids = [f"did:n{i}" for i in range(200)]
+    for did in dids:
+        for trustee in rng.sample(dids, 3):
+            if trustee != did:
+                tg.set_trust(did, trustee, round(rng.uniform(0.05, 0.3), 2))
+    tg.REPUTATION_ITERATIONS = 200
+    first = tg.compute_reputation()
+    cold_iterations = tg.reputation_iterations
+    assert not tg.reputation_dirty
+    version = tg.version
+    assert tg.compute_reputation() == first  # cached, no recomputation
+
+    tg.set_trust("did:n1", "did:n2", 0.3)
+    assert tg.version == version + 1 and tg.reputation_dirty
+    warm = tg.compute_reputation()
+    assert tg.reputation_iterations < cold_iterations
+
+    cold = TrustGraph.from_dict(tg.to_dict())
+    cold.REPUTATION_ITERATIONS = 200
+    expected = cold.compute_reputation()
+    assert max(abs(warm[d] - expected[d]) for d in warm) < 1e-6
+
+    tg.remove_trust("did:n1", "did:n2")
+    assert tg.reputation_dirty
+
+
+def test_contexts_are_separate_layers():
+    tg = TrustGraph()
+    tg.set_trust("did:a", "did:b", 0.9, context="governance")
+    tg.set_trust("did:a", "did:b", -0.4, context="trade")
+    assert tg.list_contexts() == ["governance", "trade"]
+    assert tg.get_direct_trust_score("did:a", "did:b", context="governance") == 0.9
+    assert tg.get_direct_trust_score("did:a", "did:b", context="trade") == -0.4
+    assert tg.get_direct_trust_score("did:a", "did:b") == -0.4  # most recent
+    assert tg.get_edge_count() == 2
+
+    assert tg.remove_trust("did:a", "did:b", context="trade")
+    assert tg.get_direct_trust_score("did:a", "did:b") == 0.9
+    assert not tg.remove_trust("did:a", "did:b", context="trade")
+
+    copy = TrustGraph.from_dict(tg.to_dict())
+    assert copy.get_trust("did:a", "did:b", context="governance").score == 0.9
+
+
+def test_weighted_context_combination():
+    tg = TrustGraph()
+    tg.set_trust("did:a", "did:b", 0.8, context="governance")
+    tg.set_trust("did:a", "did:b", 0.4, context="trade")
+    tg.set_trust("did:b", "did:c", 1.0, context="trade")
+    mix = {"governance": 0.5, "trade": 0.5}
+    assert tg.get_direct_trust_score("did:a", "did:b", context=mix) == pytest.approx(0.6)
+    assert tg.propagated_trust("did:a", "did:c", context=mix) == pytest.approx(0.6 * 0.5 * 0.5 * 0.5)
+    assert tg.propagated_trust("did:a", "did:c", context="governance") == 0.0
+    assert tg.get_trust("did:a", "did:b", context={"trade": 1}).context == "trade"
+    with pytest.raises(ValueError):
+        tg.get_trustees("did:a", context={"trade": -1})
+
+
+def test_reputation_is_cached_per_context():
+    tg = TrustGraph()
+    tg.set_trust("did:a", "did:b", 0.9, context="governance")
+    tg.set_trust("did:c", "did:a", 0.9, context="trade")
+    governance = tg.compute_reputation(context="governance")
+    trade = tg.compute_reputation(context="trade")
+    assert max(governance, key=governance.get) == "did:b"
+    assert max(trade, key=trade.get) == "did:a"
+
+    tg.set_trust("did:c", "did:b", 0.5, context="trade")
+    assert tg.reputation_stale(context="trade")
+    assert not tg.reputation_stale(context="governance")
+    assert tg.compute_reputation(context="governance") == governance
+
+
+def test_trust_decays_lazily_with_age():
+    tg = TrustGraph(half_life=100.0)
+    tg._put_edge(TrustEdge("did:a", "did:b", 0.8, timestamp=1000.0))
+    tg._put_edge(TrustEdge("did:b", "did:c", 0.8, timestamp=1100.0))
+    assert tg.get_trust("did:a", "did:b").score == 0.8  # stored raw
+    assert tg.get_direct_trust_score("did:a", "did:b", as_of=1100.0) == pytest.approx(0.4)
+    assert tg.propagated_trust("did:a", "did:c", as_of=1100.0) == pytest.approx(0.4 * 0.5 * 0.8 * 0.5)
+    assert tg.propagated_trust("did:a", "did:c", as_of=1050.0) == 0.0  # b -> c not set yet
+    assert tg.get_direct_trust_score("did:a", "did:b") < 1e-6  # now: long decayed
+
+    rep_before = tg.compute_reputation(as_of=1050.0)
+    assert rep_before == tg.compute_reputation(as_of=1050.0)
+    assert tg.reputation_stale(as_of=1100.0)
+    assert max(rep_before, key=rep_before.get) == "did:b"
+    assert TrustGraph(half_life=None).half_life is None
+    assert TrustGraph.from_dict(tg.to_dict()).half_life == 100.0
+    with pytest.raises(ValueError):
+        TrustGraph(half_life=0)
+
+
+def test_interner_assigns_stable_ids_without_growing_on_lookup():
+    interner = DIDInterner()
+    a = interner.intern("did:a")
+    assert interner.intern("did:b") == a + 1
+    assert interner.intern("did:a") == a
+    assert interner.did(a) == "did:a"
+    assert interner.get("did:unknown") is None
+    assert "did:unknown" not in interner and len(interner) == 2
+
+
+def test_graph_structures_hold_interned_ids():
+    tg = TrustGraph()
+    tg.set_trust("did:interned-a", "did:interned-b", 0.7)
+    edge = tg.get_trust("did:interned-a", "did:interned-b")
+    assert edge.truster_id == DIDS.get("did:interned-a")
+    assert edge.trustee_did == "did:interned-b"
+    assert not hasattr(edge, "__dict__")
+    # fresh, equal strings resolve to the same stored id
+    assert tg.get_trust("did:interned-" + "a", "did:interned-b") is edge
+    assert set(tg.list_nodes()) == {"did:interned-a", "did:interned-b"}
+    assert tg.to_dict()["nodes"] == tg.list_nodes()
+    # lookups of unknown identities do not intern them
+    assert tg.get_trustees("did:never-seen") == []
+    assert "did:never-seen" not in DIDS
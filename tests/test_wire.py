@@ -0,0 +1,120 @@
+"""Tests for the binary node-to-node wire format."""
+import json
+import pytest
+from socialchain.blockchain import Block, Blockchain, Identity, Transaction
+from socialchain.network import wire
+from tests.conftest import EasyChain, make_tx
+
+
+def _signed_tx(identity, data):
+    tx = Transaction(sender=identity.did, recipient="NETWORK", data=data)
+    tx.signature = identity.sign(json.dumps(tx.to_dict(), sort_keys=True).encode())
+    return tx
+
+
+def _chain_with_blocks(n=3):
+    bc = EasyChain()
+    identity = Identity()
+    for i in range(n):
+        bc.add_transaction(_signed_tx(identity, {"type": "status_update", "i": i, "f": 0.1 * i}))
+        bc.add_transaction(Transaction("Alice", "BOB", {"nested": [1, {"x": None}]}, tx_id="custom-id"))
+        bc.mine_block(identity.did)
+    return bc
+
+
+@pytest.mark.parametrize("value", [
+    None, "", "did:socialchain:02" + "ab" * 32, "did:socialchain:ABCD", "deadbeef",
+    "DEADBEEF", "abc", "0f", "12345678-1234-5678-1234-567812345678",
+    "12345678-1234-5678-1234-56781234567X", "NETWORK", "ünïcode",
+])
+def test_strings_round_trip_exactly(value):
+    out = bytearray()
+    wire._put_str(out, value)
+    assert wire._Reader(bytes(out)).str_() == value
+
+
+def test_blocks_round_trip():
+    bc = _chain_with_blocks()
+    kind, blocks = wire.decode(wire.encode_blocks(bc.chain))
+    assert kind == wire.MSG_BLOCKS
+    assert [b.to_dict() for b in blocks] == [b.to_dict() for b in bc.chain]
+    for block in blocks[1:]:
+        assert bc.verify_block(block)
+
+
+def test_chain_message_is_smaller_than_json():
+    bc = _chain_with_blocks(5)
+    message = wire.encode_chain(bc.chain, bc.pending_transactions)
+    assert len(message) < len(json.dumps(bc.to_dict()))
+    for encoding in wire.SUPPORTED_ENCODINGS:
+        body, headers = wire.pack(message, encoding)
+        kind, value = wire.unpack(body, headers)
+        assert kind == wire.MSG_CHAIN
+        assert value["length"] == len(bc.chain)
+
+
+def test_choose_encoding():
+    assert wire.choose_encoding("br, zlib") == "zlib"
+    assert wire.choose_encoding(None) == "identity"
+    assert wire.choose_encoding("br") == "identity"
+
+
+def test_decode_rejects_garbage():
+    with pytest.raises(wire.WireError):
+        wire.decode(b"not a message")
+    with pytest.raises(wire.WireError):
+        wire.decode(wire.encode_blocks(_chain_with_blocks(1).chain)[:-5])
+
+
+def test_chain_endpoint_negotiates_wire(client):
+    resp = client.get("/api/chain", headers=wire.request_headers(["zlib"]))
+    assert resp.headers["Content-Type"] == wire.WIRE_MEDIA_TYPE
+    assert resp.headers[wire.ENCODING_HEADER] == "zlib"
+    kind, value = wire.unpack(resp.data, resp.headers)
+    assert value["length"] == 1
+
+
+def test_chain_endpoint_defaults_to_json(client):
+    resp = client.get("/api/chain")
+    assert resp.is_json
+    assert resp.get_json()["length"] == 1
+
+
+def test_receive_blocks_endpoint(client, app_state):
+    other = Blockchain()
+    other.add_transaction(make_tx(n=1))
+    block = other.mine_block("did:sc:miner")
+    body, headers = wire.pack(wire.encode_blocks([block]), "zlib")
+    resp = client.post("/api/blocks", data=body, headers=headers)
+    assert resp.get_json()["accepted"] == 1
+    assert app_state.blockchain.last_block.hash == block.hash
+
+    resp = client.post("/api/blocks", json={"block": block.to_dict()})
+    assert resp.get_json()["accepted"] == 0  # already known
+    resp = client.post("/api/blocks", data=b"junk", headers={"Content-Type": wire.WIRE_MEDIA_TYPE})
+    assert resp.status_code == 400
+
+
+@pytest.mark.parametrize("body", [[1, 2], "block", {"blocks": "x"}, {"blocks": [1]}, {"block": None}])
+def test_receive_blocks_rejects_malformed_json(client, body):
+    assert client.post("/api/blocks", json=body).status_code == 400
+
+
+@pytest.mark.parametrize("encoding", [e for e in wire.SUPPORTED_ENCODINGS if e != "identity"])
+def test_corrupt_compressed_body_is_rejected(client, encoding):
+    headers = {"Content-Type": wire.WIRE_MEDIA_TYPE, wire.ENCODING_HEADER: encoding}
+    resp = client.post("/api/blocks", data=b"\x78\x9cgarbage", headers=headers)
+    assert resp.status_code == 400
+    with pytest.raises(wire.WireError):
+        wire.decompress(wire.compress(b"x" * 100, encoding)[:-4], encoding)
+
+
+@pytest.mark.parametrize("encoding", [e for e in wire.SUPPORTED_ENCODINGS if e != "identity"])
+def test_decompression_is_bounded(client, monkeypatch, encoding):
+    monkeypatch.setattr(wire, "MAX_MESSAGE", 1024)
+    bomb = wire.compress(b"\0" * 10000, encoding)
+    with pytest.raises(wire.WireError, match="exceeds"):
+        wire.decompress(bomb, encoding)
+    headers = {"Content-Type": wire.WIRE_MEDIA_TYPE, wire.ENCODING_HEADER: encoding}
+    assert client.post("/api/blocks", data=bomb, headers=headers).status_code == 400
+    assert wire.decompress(wire.compress(b"\0" * 1024, encoding), encoding) == b"\0" * 1024